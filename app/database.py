@@ -1,25 +1,218 @@
-from sqlmodel import SQLModel
+import itertools
+import logging
+import time
+from contextvars import ContextVar
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config.settings import settings
+from .instrumentation import instrument_engine, request_stats
+from .migrations import apply_migrations
 
-DATABASE_URL = f"mysql+aiomysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}/{settings.DB_NAME}"
-engine = create_async_engine(DATABASE_URL, echo=True)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = (
+    settings.DATABASE_URL
+    or f"mysql+aiomysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}/{settings.DB_NAME}"
+)
+
+
+class PoolWaitStats:
+    """
+    Accumulates how long requests wait to check a connection out of the pool.
+
+    Attributes:
+        checkouts (int): The number of connections checked out.
+        total_wait (float): The total time spent waiting for a connection, in seconds.
+        max_wait (float): The longest single wait for a connection, in seconds.
+        timeouts (int): The number of checkouts that gave up after `DB_POOL_TIMEOUT_S`.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, wait: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    An `AsyncAdaptedQueuePool` that records checkout wait times in `pool_wait_stats`
+    and in the current request's stats.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self._record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._record_wait(time.perf_counter() - started)
+        return connection
+
+    def _record_wait(self, wait: float, timed_out: bool = False):
+        pool_wait_stats.record(wait, timed_out)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.pool_wait += wait
+
+
+def worker_pool_limits() -> tuple[int, int]:
+    """
+    Size this worker's pools so that all `WEB_WORKERS` together stay within `DB_MAX_CONNECTIONS`.
+
+    Returns:
+        tuple: The pool size and max overflow for each of this worker's engines.
+
+    Raises:
+        ValueError: If `DB_MAX_CONNECTIONS` is less than `WEB_WORKERS`, since every
+                    worker needs at least one connection.
+    """
+    if not settings.DB_MAX_CONNECTIONS:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    workers = max(settings.WEB_WORKERS, 1)
+    if settings.DB_MAX_CONNECTIONS < workers:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} cannot give each of "
+            f"{workers} workers a connection"
+        )
+    share = settings.DB_MAX_CONNECTIONS // workers
+    pool_size = min(settings.DB_POOL_SIZE, share)
+    return pool_size, min(settings.DB_MAX_OVERFLOW, share - pool_size)
+
+
+POOL_SIZE, MAX_OVERFLOW = worker_pool_limits()
+
+
+def _create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+engine = _create_engine(DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_engines = [_create_engine(url) for url in settings.DB_REPLICA_URLS]
+
+# Set for the duration of a request that must read from the primary, e.g. one
+# from a client that wrote within the last `DB_READ_YOUR_WRITES_S` seconds.
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+class SessionRouter:
+    """
+    Hands out sessions for read-only work, spread round-robin over the replicas.
+
+    Writes always use `AsyncSessionLocal`. Reads fall back to the primary when no
+    replica is configured or when `primary_pinned` is set for the current context.
+
+    Attributes:
+        primary (sessionmaker): The session factory bound to the primary.
+        replicas (list[sessionmaker]): The session factories bound to the replicas.
+    """
+
+    def __init__(self, primary: sessionmaker, replicas: list[sessionmaker]):
+        self.primary = primary
+        self.replicas = replicas
+        self._replicas = itertools.cycle(replicas)
+
+    def read(self) -> AsyncSession:
+        """
+        Return a new session on the next replica, or on the primary if reads are pinned to it.
+        """
+        if not self.replicas or primary_pinned.get():
+            return self.primary()
+        return next(self._replicas)()
+
+
+session_router = SessionRouter(
+    AsyncSessionLocal,
+    [
+        sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+        for replica in replica_engines
+    ],
+)
+
+# Used like AsyncSessionLocal, by service functions that never write.
+ReadSessionLocal = session_router.read
+
 
 async def init_db():
     """
-    Initialize the database by creating all tables defined in SQLModel models.
+    Bring the database schema up to date by applying pending migrations.
 
     This function should be called at the start of the application to ensure that
-    the database schema is correctly set up before handling any operations. It uses
-    the `run_sync` method to run synchronous SQLModel metadata creation in an asynchronous
-    context provided by `engine.begin()`.
+    the database schema is correctly set up before handling any operations. The
+    versioned migrations in `app.migrations` run through `run_sync`, in the
+    transaction provided by `engine.begin()`.
+
+    Returns:
+        list[int]: The migration versions applied, oldest first.
 
     Raises:
-        Exception: If there is an issue creating the tables in the database.
+        Exception: If there is an issue applying a migration.
     """
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        applied = await conn.run_sync(apply_migrations)
+    if applied:
+        logger.info("Applied schema migrations %s", ", ".join(map(str, applied)))
+    return applied
+
+
+async def close_db():
+    """
+    Close every pooled connection to the primary and the replicas.
+
+    Called when the application stops, so drivers that keep a thread per
+    connection (such as aiosqlite) do not keep the process alive.
+    """
+    for pooled_engine in (engine, *replica_engines):
+        await pooled_engine.dispose()
+
+
+def get_pool_stats() -> dict:
+    """
+    Report the state of the connection pool and how long checkouts have waited.
+
+    Returns:
+        dict: The configured size and overflow, the number of checked-out, idle and
+              overflow connections, and checkout wait statistics in seconds.
+    """
+    pool = engine.sync_engine.pool
+    checkouts = pool_wait_stats.checkouts
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "checkout_timeouts": pool_wait_stats.timeouts,
+        "wait_total_s": round(pool_wait_stats.total_wait, 6),
+        "wait_avg_s": round(pool_wait_stats.total_wait / checkouts, 6) if checkouts else 0.0,
+        "wait_max_s": round(pool_wait_stats.max_wait, 6),
+    }
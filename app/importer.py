@@ -0,0 +1,71 @@
+"""
+Imports events or users from a CSV or NDJSON file straight into the database:
+
+    python -m app.importer events events.csv
+    python -m app.importer users users.ndjson --batch-size 10000
+
+Applies pending schema migrations, then streams the file through the same
+pipeline as POST /import/events and /import/users: parsed in chunks, validated
+row by row and inserted `--batch-size` rows per transaction. Files ending in
+`.csv` are read as CSV with a header row, anything else as NDJSON. Prints
+progress after each batch and the rows per second at the end; exits with
+status 1 if the import stopped early or rejected any row.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator
+
+from config.settings import settings
+from .database import close_db, init_db
+from .services.import_service import import_rows
+
+READ_CHUNK_BYTES = 1 << 20
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(READ_CHUNK_BYTES):
+            yield chunk
+
+
+async def run(kind: str, path: str, batch_size: int) -> int:
+    def progress(report):
+        print(
+            f"{report.rows} rows: {report.imported} imported, {report.rejected} rejected, "
+            f"{report.rows_per_s:.0f} rows/s",
+            flush=True,
+        )
+
+    await init_db()
+    try:
+        report = await import_rows(
+            kind, read_chunks(path), "csv" if path.lower().endswith(".csv") else "ndjson",
+            batch_size, progress,
+        )
+    finally:
+        await close_db()
+
+    for error in report.errors:
+        print(f"line {error.line}: {error.message}", file=sys.stderr)
+    print(
+        f"{report.message}: {report.rows} rows in {report.batches} batches, "
+        f"{report.elapsed_s:.1f}s, {report.rows_per_s:.0f} rows/s"
+    )
+    return 0 if report.completed and not report.rejected else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import events or users from a file.")
+    parser.add_argument("kind", choices=("events", "users"))
+    parser.add_argument("path", help="a .csv file, or an NDJSON file")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    sys.exit(asyncio.run(run(args.kind, args.path, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import bisect
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Request latency buckets in seconds, Prometheus' defaults.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """
+    Accumulates the database work done on behalf of one request.
+
+    Attributes:
+        db_time (float): The total time spent executing SQL, in seconds.
+        queries (int): The number of SQL statements executed.
+        pool_wait (float): The total time spent waiting for a pooled connection, in seconds.
+        statements (list): The slowest `SLOW_REQUEST_MAX_STATEMENTS` statements as
+            (duration, SQL) pairs, for the slow-request log.
+    """
+
+    __slots__ = ("db_time", "queries", "pool_wait", "statements")
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.queries = 0
+        self.pool_wait = 0.0
+        self.statements = []
+
+    def record_query(self, duration: float, statement: str):
+        self.db_time += duration
+        self.queries += 1
+        if not settings.SLOW_REQUEST_THRESHOLD_S:
+            return
+        # Keep only the slowest few, so a request issuing thousands of queries stays cheap.
+        self.statements.append((duration, statement))
+        if len(self.statements) > settings.SLOW_REQUEST_MAX_STATEMENTS:
+            self.statements.remove(min(self.statements))
+
+
+# The stats of the request being handled in the current context, if any.
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class RouteMetrics:
+    """
+    Cumulative latency histogram and database totals for one route.
+    """
+
+    __slots__ = ("buckets", "count", "latency", "db_time", "queries", "pool_wait")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency = 0.0
+        self.db_time = 0.0
+        self.queries = 0
+        self.pool_wait = 0.0
+
+    def observe(self, latency: float, stats: RequestStats):
+        index = bisect.bisect_left(LATENCY_BUCKETS, latency)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+        self.count += 1
+        self.latency += latency
+        self.db_time += stats.db_time
+        self.queries += stats.queries
+        self.pool_wait += stats.pool_wait
+
+
+class MetricsRegistry:
+    """
+    Per-route request metrics, keyed by method, route template and status code.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str, int], RouteMetrics] = {}
+
+    def observe(
+        self, method: str, route: str, status_code: int, latency: float, stats: RequestStats
+    ):
+        key = (method, route, status_code)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics()
+        metrics.observe(latency, stats)
+
+    def render(self, gauges: dict[str, float]) -> str:
+        """
+        Render the request metrics and the given gauges in the Prometheus text format.
+
+        Parameters:
+            gauges (dict): Extra gauge values by metric name.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status_code), metrics in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{route}",status="{status_code}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}'
+            )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {metrics.latency}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {metrics.count}")
+
+        for name, attribute, help_text in (
+            ("http_request_db_seconds_total", "db_time", "Time spent executing SQL by route."),
+            ("http_request_db_queries_total", "queries", "SQL statements executed by route."),
+            ("http_request_pool_wait_seconds_total", "pool_wait", "Time spent waiting for a pooled connection by route."),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route, status_code), metrics in sorted(self.routes.items()):
+                labels = f'method="{method}",route="{route}",status="{status_code}"'
+                lines.append(f"{name}{{{labels}}} {getattr(metrics, attribute)}")
+
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def instrument_engine(engine):
+    """
+    Attach SQL timing hooks to an async engine, feeding the current request's `RequestStats`.
+
+    Parameters:
+        engine (AsyncEngine): The engine to instrument.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record_query(conn, statement)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute; pop its start here
+        # so the connection's stack does not grow with every error.
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            _record_query(conn, exception_context.statement)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware that times every HTTP request and records it per route.
+
+    The route is the matched path template (e.g. `/reservations/{reservation_id}`),
+    so the number of series stays bounded. Requests slower than
+    `SLOW_REQUEST_THRESHOLD_S` are logged with their database totals and their
+    slowest SQL statements.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency = time.perf_counter() - started
+            request_stats.reset(token)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            metrics_registry.observe(scope["method"], path, status_code, latency, stats)
+
+            threshold = settings.SLOW_REQUEST_THRESHOLD_S
+            if threshold and latency >= threshold:
+                logger.warning(
+                    "Slow request %s %s: %.3fs, status %d, %d queries, db %.3fs, pool wait %.3fs%s",
+                    scope["method"],
+                    scope["path"],
+                    latency,
+                    status_code,
+                    stats.queries,
+                    stats.db_time,
+                    stats.pool_wait,
+                    "".join(
+                        f"\n  {duration:.3f}s {' '.join(statement.split())}"
+                        for duration, statement in sorted(stats.statements, reverse=True)
+                    ),
+                )
+
+
+def _record_query(conn, statement: Optional[str]):
+    duration = time.perf_counter() - conn.info["query_started"].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.record_query(duration, statement or "")
@@ -1,17 +1,43 @@
-from fastapi import FastAPI
-from .routers import events, reservations, users
-from .database import init_db
-
-# Initialize FastAPI app instance
-app = FastAPI()
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from config.settings import settings
+from .routers import (
+    availability,
+    events,
+    exports,
+    holds,
+    imports,
+    metrics,
+    reservations,
+    stats,
+    users,
+    waiting_room,
+)
+from .database import close_db, init_db, primary_pinned
+from .instrumentation import RequestMetricsMiddleware
+from .services.admission import reservation_batcher
+from .services.event_service import availability_feed
+from .services.hold_service import run_hold_sweeper
+from .services.idempotency import run_idempotency_purger
+from .services.ledger import run_ledger_compactor
+from .services.sales_rollups import run_sales_rollup_refresher
 
 
+@asynccontextmanager
 async def app_lifespan(app: FastAPI):
     """
     Defines the lifespan of the FastAPI application.
 
     This asynchronous context manager is responsible for running startup and
-    shutdown events. It ensures that the database is initialized when the app starts.
+    shutdown events. It ensures that the database is initialized (unless
+    `DB_INIT_ON_STARTUP` is off, as in `app.server` workers) and the expired-hold
+    sweeper, ledger compactor, sales rollup refresher, availability feed and
+    idempotency record purger are running when the app starts. On shutdown,
+    which the server begins once in-flight requests have finished, the
+    background tasks are stopped, open reservation batches are settled and
+    database connections closed.
 
     Parameters:
         app (FastAPI): The FastAPI application instance.
@@ -20,15 +46,91 @@ async def app_lifespan(app: FastAPI):
         None: This function yields control back to the event loop until the app is
               terminated, at which point it can run shutdown tasks if necessary.
     """
-    await init_db()
+    if settings.DB_INIT_ON_STARTUP:
+        await init_db()
+    hold_sweeper = asyncio.create_task(
+        run_hold_sweeper(settings.HOLD_SWEEP_INTERVAL_S, settings.HOLD_SWEEP_BATCH_SIZE)
+    )
+    ledger_compactor = asyncio.create_task(
+        run_ledger_compactor(
+            settings.LEDGER_COMPACT_INTERVAL_S, settings.LEDGER_COMPACT_MIN_ENTRIES
+        )
+    )
+    rollup_refresher = asyncio.create_task(
+        run_sales_rollup_refresher(
+            settings.SALES_ROLLUP_REFRESH_INTERVAL_S, settings.SALES_ROLLUP_BATCH_SIZE
+        )
+    )
+    feed_publisher = asyncio.create_task(availability_feed.run())
+    idempotency_purger = asyncio.create_task(
+        run_idempotency_purger(
+            settings.IDEMPOTENCY_PURGE_INTERVAL_S, settings.CASCADE_DELETE_CHUNK_SIZE
+        )
+    )
     yield
+    background_tasks = (
+        hold_sweeper,
+        ledger_compactor,
+        rollup_refresher,
+        feed_publisher,
+        idempotency_purger,
+    )
+    for task in background_tasks:
+        task.cancel()
+    # Let a sweep or compaction that was mid-transaction roll back before the pools close.
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await reservation_batcher.drain()
+    await close_db()
+
+
+# Initialize FastAPI app instance
+app = FastAPI(lifespan=app_lifespan)
+
+# Cookie holding the time of a client's last successful write, for read-your-writes.
+LAST_WRITE_COOKIE = "last_write"
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """
+    Pins a client's reads to the primary for `DB_READ_YOUR_WRITES_S` seconds after it writes.
+
+    Successful writes stamp the response with a `last_write` cookie. Requests that
+    carry a recent enough stamp read from the primary instead of a replica, so a
+    client always sees its own changes despite replication lag.
+    """
+    window = settings.DB_READ_YOUR_WRITES_S
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        last_write = 0
+    token = primary_pinned.set(time.time() - last_write < window)
+    try:
+        response = await call_next(request)
+    finally:
+        primary_pinned.reset(token)
+
+    if window > 0 and request.method not in READ_ONLY_METHODS and response.status_code < 400:
+        response.set_cookie(
+            LAST_WRITE_COOKIE, f"{time.time():.3f}", max_age=int(window) + 1, httponly=True
+        )
+    return response
 
 
-app.lifespan = app_lifespan
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
 
+app.include_router(availability.router)
 app.include_router(events.router)
+app.include_router(exports.router)
+app.include_router(holds.router)
+app.include_router(imports.router)
+app.include_router(metrics.router)
 app.include_router(reservations.router)
+app.include_router(stats.router)
 app.include_router(users.router)
+app.include_router(waiting_room.router)
 
 
 @app.get("/")
@@ -0,0 +1,108 @@
+"""
+Versioned schema migrations, applied by `app.database.init_db`.
+
+Each migration is a module of this package with a `VERSION`, a one-line
+`DESCRIPTION` and an `upgrade(connection)` function that changes the schema
+through a synchronous SQLAlchemy connection. Migrations are frozen once
+released: a schema change is a new module appended to `MIGRATIONS`, never an
+edit of an old one, and the table models are updated to match.
+
+The versions applied to a database are recorded in its `schema_version` table.
+A database created before migrations existed (by `create_all` or
+`sql_scripts/01_create_tables.sql`) is adopted as being at version 1, the
+original events, users and reservations schema, and upgraded from there. The
+helpers in `operations` skip tables, columns and indexes that are already
+there, so a database built by `create_all` in a later release before migrations
+existed upgrades the same way.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.engine import Connection
+from . import (
+    v001_initial_schema,
+    v002_inventory_slots,
+    v003_checkout_holds,
+    v004_listing_indexes,
+    v005_reservation_ledger,
+    v006_idempotency_records,
+    v007_sales_rollups,
+    v008_query_indexes,
+    v009_event_deletion,
+)
+
+MIGRATIONS = (
+    v001_initial_schema,
+    v002_inventory_slots,
+    v003_checkout_holds,
+    v004_listing_indexes,
+    v005_reservation_ledger,
+    v006_idempotency_records,
+    v007_sales_rollups,
+    v008_query_indexes,
+    v009_event_deletion,
+)
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def current_version(connection: Connection) -> int:
+    """
+    Read the version of the latest migration applied to the database.
+
+    Parameters:
+        connection (Connection): The connection to read with.
+
+    Returns:
+        int: The version, or 0 if no migration has been applied.
+    """
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def apply_migrations(connection: Connection) -> list[int]:
+    """
+    Apply every migration newer than the database's version, in order.
+
+    Each migration is recorded in `schema_version` right after it runs. MySQL
+    commits DDL statements implicitly, so a migration that fails halfway is not
+    rolled back; fix the cause and run the remaining statements by hand.
+
+    Parameters:
+        connection (Connection): The connection to migrate through.
+
+    Returns:
+        list[int]: The versions applied, oldest first.
+    """
+    existing_tables = inspect(connection).get_table_names()
+    schema_version.create(connection, checkfirst=True)
+
+    version = current_version(connection)
+    if version == 0 and "event" in existing_tables:
+        _record(connection, MIGRATIONS[0])
+        version = MIGRATIONS[0].VERSION
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.VERSION > version:
+            migration.upgrade(connection)
+            _record(connection, migration)
+            applied.append(migration.VERSION)
+    return applied
+
+
+def _record(connection: Connection, migration):
+    connection.execute(
+        schema_version.insert().values(
+            version=migration.VERSION,
+            description=migration.DESCRIPTION,
+            applied_at=datetime.utcnow(),
+        )
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Index, MetaData, Table, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+
+def create_tables(connection: Connection, metadata: MetaData, *references: str):
+    """
+    Create the tables of `metadata` that do not exist yet, for use in `upgrade` functions.
+
+    The `references` tables are reflected first so foreign keys to them resolve.
+    Tables that already exist are left alone, which lets a database built by
+    `create_all` in a release before migrations existed pass through the
+    migration that introduced them.
+    """
+    if references:
+        metadata.reflect(connection, only=references)
+    metadata.create_all(connection)
+
+
+def add_column(connection: Connection, table: str, column: Column):
+    """
+    Add a column to an existing table unless it is already there, for use in `upgrade` functions.
+    """
+    if column.name in {existing["name"] for existing in inspect(connection).get_columns(table)}:
+        return
+    Table(table, MetaData(), column)
+    preparer = connection.dialect.identifier_preparer
+    connection.execute(text(
+        f"ALTER TABLE {preparer.quote(table)} "
+        f"ADD COLUMN {CreateColumn(column).compile(dialect=connection.dialect)}"
+    ))
+
+
+def create_index(connection: Connection, table: str, name: str, *columns: str):
+    """
+    Create an index on existing columns of a table unless an index of that name is
+    already there, for use in `upgrade` functions.
+    """
+    reflected = Table(table, MetaData(), autoload_with=connection)
+    if any(index.name == name for index in reflected.indexes):
+        return
+    Index(name, *(reflected.c[column] for column in columns)).create(connection)
+
+
+def drop_index(connection: Connection, table: str, name: str):
+    """
+    Drop an index of a table unless it is already gone, for use in `upgrade` functions.
+    """
+    reflected = Table(table, MetaData(), autoload_with=connection)
+    index = next((index for index in reflected.indexes if index.name == name), None)
+    if index is None:
+        return
+    index.drop(connection)
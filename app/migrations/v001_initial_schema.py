@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "Initial schema: events, users and reservations"
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    Table(
+        "event",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(255), nullable=False, index=True),
+        Column("description", String(255), nullable=False),
+        Column("date_time", DateTime, nullable=False),
+        Column("tickets_total", Integer, nullable=False),
+        Column("tickets_available", Integer, nullable=False),
+    )
+    Table(
+        "user",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(255), nullable=False),
+    )
+    Table(
+        "reservation",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+        Column("event_id", Integer, ForeignKey("event.id"), nullable=False),
+        Column("tickets_reserved", Integer, nullable=False),
+    )
+    metadata.create_all(connection)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+from .operations import add_column, create_tables
+
+VERSION = 2
+DESCRIPTION = "Sharded inventory counters"
+
+
+def upgrade(connection: Connection):
+    # Existing events keep their single counter.
+    add_column(
+        connection,
+        "event",
+        Column("inventory_slots", Integer, nullable=False, server_default=text("0")),
+    )
+    metadata = MetaData()
+    Table(
+        "inventory_slot",
+        metadata,
+        Column("event_id", Integer, ForeignKey("event.id"), primary_key=True),
+        Column("slot", Integer, primary_key=True, autoincrement=False),
+        Column("tickets_available", Integer, nullable=False),
+    )
+    create_tables(connection, metadata, "event")
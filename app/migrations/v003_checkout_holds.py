@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, Table
+from sqlalchemy.engine import Connection
+from .operations import create_tables
+
+VERSION = 3
+DESCRIPTION = "Checkout holds"
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    Table(
+        "hold",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+        Column("event_id", Integer, ForeignKey("event.id"), nullable=False),
+        Column("tickets_held", Integer, nullable=False),
+        Column("expires_at", DateTime, index=True),
+    )
+    create_tables(connection, metadata, "event", "user")
@@ -0,0 +1,13 @@
+from sqlalchemy.engine import Connection
+from .operations import create_index
+
+VERSION = 4
+DESCRIPTION = "Indexes for filtered and paginated listings"
+
+
+def upgrade(connection: Connection):
+    # create_all always indexed event names; sql_scripts/01_create_tables.sql did not.
+    create_index(connection, "event", "ix_event_name", "name")
+    create_index(connection, "event", "ix_event_date_time", "date_time")
+    create_index(connection, "reservation", "ix_reservation_user_id", "user_id")
+    create_index(connection, "reservation", "ix_reservation_event_id", "event_id")
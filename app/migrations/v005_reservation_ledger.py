@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+from .operations import create_tables
+
+VERSION = 5
+DESCRIPTION = "Reservation ledger and inventory snapshots"
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    Table(
+        "ledger_entry",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", Integer, ForeignKey("event.id"), nullable=False, index=True),
+        Column("kind", String(16), nullable=False),
+        Column("delta", Integer, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    Table(
+        "inventory_snapshot",
+        metadata,
+        Column("event_id", Integer, ForeignKey("event.id"), primary_key=True),
+        Column("ledger_id", Integer, nullable=False),
+        Column("tickets_available", Integer, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    create_tables(connection, metadata, "event")
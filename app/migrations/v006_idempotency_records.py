@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+from .operations import create_tables
+
+VERSION = 6
+DESCRIPTION = "Idempotency key records"
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    Table(
+        "idempotency_record",
+        metadata,
+        Column("key", String(255), primary_key=True),
+        Column("fingerprint", String(64), nullable=False),
+        Column("status_code", Integer),
+        Column("response_body", Text),
+        Column("created_at", DateTime, nullable=False, index=True),
+    )
+    create_tables(connection, metadata)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+from .operations import create_tables
+
+VERSION = 7
+DESCRIPTION = "Sales deltas and rollups"
+
+
+def upgrade(connection: Connection):
+    metadata = MetaData()
+    Table(
+        "sales_delta",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", Integer, nullable=False),
+        Column("user_id", Integer, nullable=False),
+        Column("tickets", Integer, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    Table(
+        "event_sales",
+        metadata,
+        Column("event_id", Integer, primary_key=True, autoincrement=False),
+        Column("tickets_sold", Integer, nullable=False),
+    )
+    Table(
+        "user_sales",
+        metadata,
+        Column("user_id", Integer, primary_key=True, autoincrement=False),
+        Column("tickets_sold", Integer, nullable=False, index=True),
+    )
+    Table(
+        "rollup_state",
+        metadata,
+        Column("name", String(32), primary_key=True),
+        Column("refreshed_at", DateTime),
+    )
+    create_tables(connection, metadata)
@@ -0,0 +1,31 @@
+from sqlalchemy.engine import Connection
+from .operations import create_index, drop_index
+
+VERSION = 8
+DESCRIPTION = "Indexes matching the service queries"
+
+
+def upgrade(connection: Connection):
+    # Holds are looked up by user when a user is deleted and by event when an event is.
+    create_index(connection, "hold", "ix_hold_user_id", "user_id")
+    create_index(connection, "hold", "ix_hold_event_id", "event_id")
+    # Covers the per-user ticket sums taken when an event is deleted.
+    create_index(
+        connection,
+        "reservation",
+        "ix_reservation_event_id_user_id_tickets_reserved",
+        "event_id",
+        "user_id",
+        "tickets_reserved",
+    )
+    # Covers ledger tail replays (event_id = ? AND id > ?, summing delta). It keeps the
+    # (event_id, id) order of the index it replaces, so listings page through it too.
+    create_index(
+        connection, "ledger_entry", "ix_ledger_entry_event_id_id_delta", "event_id", "id", "delta"
+    )
+    drop_index(connection, "ledger_entry", "ix_ledger_entry_event_id")
+    # Covers the date range scans of event listings and sell-through reports.
+    create_index(
+        connection, "event", "ix_event_date_time_tickets_total", "date_time", "tickets_total"
+    )
+    drop_index(connection, "event", "ix_event_date_time")
@@ -0,0 +1,14 @@
+from sqlalchemy import Boolean, Column, text
+from sqlalchemy.engine import Connection
+from .operations import add_column
+
+VERSION = 9
+DESCRIPTION = "Flag for events being deleted"
+
+
+def upgrade(connection: Connection):
+    add_column(
+        connection,
+        "event",
+        Column("deleting", Boolean, nullable=False, server_default=text("0")),
+    )
@@ -0,0 +1,59 @@
+from typing import List, Literal, Optional
+from sqlmodel import SQLModel
+
+
+class BulkReservationItem(SQLModel):
+    """
+    Represents one reservation of a bulk reservation request.
+
+    Attributes:
+        user_id (int): The identifier of the user making the reservation.
+        event_id (int): The identifier of the event to reserve tickets for.
+        tickets_reserved (int): The number of tickets to reserve.
+    """
+    user_id: int
+    event_id: int
+    tickets_reserved: int
+
+
+class BulkReservationRequest(SQLModel):
+    """
+    Represents a request to create many reservations at once.
+
+    Attributes:
+        reservations (List[BulkReservationItem]): The reservations to create, in priority order.
+        mode (str): "atomic" to create all reservations or none of them, or "best_effort"
+            to create every reservation that can be created.
+    """
+    reservations: List[BulkReservationItem]
+    mode: Literal["atomic", "best_effort"] = "atomic"
+
+
+class BulkReservationResult(SQLModel):
+    """
+    Represents the outcome of one reservation of a bulk reservation request.
+
+    Attributes:
+        index (int): The position of the reservation in the request.
+        success (bool): Whether the reservation was created.
+        message (str): A success or error message.
+        reservation_id (Optional[int]): The identifier of the created reservation, if any.
+    """
+    index: int
+    success: bool
+    message: str
+    reservation_id: Optional[int] = None
+
+
+class BulkReservationResponse(SQLModel):
+    """
+    Represents the outcome of a bulk reservation request.
+
+    Attributes:
+        message (str): A summary of the outcome.
+        created (int): The number of reservations created.
+        results (List[BulkReservationResult]): One result per requested reservation, in request order.
+    """
+    message: str
+    created: int
+    results: List[BulkReservationResult]
@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -11,13 +12,25 @@ class Event(SQLModel, table=True):
         id (Optional[int]): The unique identifier of the event. Defaults to None.
         name (str): The name of the event. Indexed for faster searches.
         description (str): A brief description of the event.
-        date_time (datetime): The date and time when the event is scheduled to take place.
+        date_time (datetime): The date and time when the event is scheduled to take place. Indexed
+            together with `tickets_total` for date range filters and sell-through reports.
         tickets_total (int): The total number of tickets available for the event.
-        tickets_available (int): The number of tickets still available for purchase.
+        tickets_available (int): The number of tickets still available for purchase. For events with
+            sharded inventory this is an aggregate of the event's slots that is refreshed lazily.
+        inventory_slots (int): The number of counter slots the event's inventory is split across.
+            0 means the event uses the single `tickets_available` counter.
+        deleting (bool): Set while the event is being deleted, so no reservation, hold or
+            release can change its inventory until it is gone. Not part of the API.
     """
+    __table_args__ = (
+        Index("ix_event_date_time_tickets_total", "date_time", "tickets_total"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     description: str
     date_time: datetime
     tickets_total: int
     tickets_available: int
+    inventory_slots: int = Field(default=0)
+    deleting: bool = Field(default=False, exclude=True)
@@ -0,0 +1,18 @@
+from sqlmodel import Field, SQLModel
+
+
+class EventSales(SQLModel, table=True):
+    """
+    Represents the rolled-up number of tickets sold for an event.
+
+    Maintained by the sales rollup refresher from `SalesDelta` rows, so reading
+    it never touches the reservation table. Events without sales have no row.
+
+    Attributes:
+        event_id (int): The identifier of the event.
+        tickets_sold (int): The tickets currently reserved for the event, as of the last refresh.
+    """
+    __tablename__ = "event_sales"
+
+    event_id: int = Field(primary_key=True)
+    tickets_sold: int
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class Hold(SQLModel, table=True):
+    """
+    Represents tickets temporarily held for a user during checkout.
+
+    The held tickets are taken from the event's inventory when the hold is created
+    and are either turned into a reservation by confirming the hold, or returned
+    to the inventory when the hold is released or expires.
+
+    Attributes:
+        id (Optional[int]): The unique identifier for the hold. Automatically generated if not provided.
+        user_id (int): The identifier of the user holding the tickets. Links to the 'user.id' foreign key.
+            Indexed for deleting a user's holds.
+        event_id (int): The identifier of the event the tickets are held for. Links to the 'event.id' foreign key.
+            Indexed for deleting an event's holds.
+        tickets_held (int): The number of tickets held.
+        expires_at (Optional[datetime]): The UTC time at which the hold lapses. Set by the server and
+            indexed so that expired holds can be found without scanning the table.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    event_id: int = Field(foreign_key="event.id", index=True)
+    tickets_held: int
+    expires_at: Optional[datetime] = Field(default=None, index=True)
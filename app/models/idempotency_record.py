@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """
+    Represents a write request made with an `Idempotency-Key` header, and its outcome.
+
+    The record is claimed before the request runs and completed with the response
+    afterwards, so a retry with the same key is answered from the record instead
+    of running the write again.
+
+    Attributes:
+        key (str): The client-supplied idempotency key.
+        fingerprint (str): A hash of the request's method, path and body, so that a key
+            reused for a different request can be rejected.
+        status_code (Optional[int]): The response status code. None while the request is in progress.
+        response_body (Optional[str]): The JSON response body. None while the request is in progress.
+        created_at (datetime): The UTC time at which the key was claimed. Indexed so that
+            expired records can be purged without scanning the table.
+    """
+    __tablename__ = "idempotency_record"
+
+    key: str = Field(primary_key=True, max_length=255)
+    fingerprint: str = Field(max_length=64)
+    status_code: Optional[int] = None
+    response_body: Optional[str] = Field(default=None, sa_column=Column(Text))
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,41 @@
+from typing import List
+from sqlmodel import SQLModel
+
+
+class ImportRowError(SQLModel):
+    """
+    Represents a row rejected by an import.
+
+    Attributes:
+        line (int): The line of the input the row starts on.
+        message (str): Why the row was rejected.
+    """
+    line: int
+    message: str
+
+
+class ImportReport(SQLModel):
+    """
+    Represents the outcome of an event or user import.
+
+    Attributes:
+        message (str): A summary of the outcome.
+        completed (bool): Whether the whole input was read. An import stopped by malformed
+            input or a database error keeps the batches committed before it stopped.
+        rows (int): The number of rows read.
+        imported (int): The number of rows inserted.
+        rejected (int): The number of rows that failed validation and were skipped.
+        batches (int): The number of transactions the rows were inserted in.
+        elapsed_s (float): The duration of the import in seconds.
+        rows_per_s (float): The rows read per second.
+        errors (List[ImportRowError]): The first `IMPORT_MAX_REPORTED_ERRORS` rejected rows.
+    """
+    message: str
+    completed: bool
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed_s: float = 0.0
+    rows_per_s: float = 0.0
+    errors: List[ImportRowError] = []
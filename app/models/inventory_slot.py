@@ -0,0 +1,21 @@
+from sqlmodel import Field, SQLModel
+
+
+class InventorySlot(SQLModel, table=True):
+    """
+    Represents one counter slot of an event whose inventory is sharded.
+
+    When an event has `inventory_slots > 0`, its remaining tickets are split across
+    that many rows so concurrent purchases update different rows instead of all
+    contending for the single `event.tickets_available` counter.
+
+    Attributes:
+        event_id (int): The identifier of the event the slot belongs to. Links to the 'event.id' foreign key.
+        slot (int): The index of the slot within the event, from 0 to `inventory_slots - 1`.
+        tickets_available (int): The number of tickets still available in this slot.
+    """
+    __tablename__ = "inventory_slot"
+
+    event_id: int = Field(foreign_key="event.id", primary_key=True)
+    slot: int = Field(primary_key=True)
+    tickets_available: int
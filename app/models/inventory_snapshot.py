@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class InventorySnapshot(SQLModel, table=True):
+    """
+    Represents the compacted state of an event's reservation ledger.
+
+    An event's availability is its snapshot's `tickets_available` plus the deltas
+    of the ledger entries appended after `ledger_id`, so replaying it only has to
+    read the ledger tail.
+
+    Attributes:
+        event_id (int): The identifier of the event. Links to the 'event.id' foreign key.
+        ledger_id (int): The ID of the last ledger entry folded into the snapshot.
+        tickets_available (int): The event's available tickets as of `ledger_id`.
+        created_at (datetime): The UTC time at which the snapshot was taken.
+    """
+    __tablename__ = "inventory_snapshot"
+
+    event_id: int = Field(foreign_key="event.id", primary_key=True)
+    ledger_id: int
+    tickets_available: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
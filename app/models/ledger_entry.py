@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class LedgerEntry(SQLModel, table=True):
+    """
+    Represents one change to an event's ticket inventory in the append-only reservation ledger.
+
+    Every reservation, adjustment, cancellation, hold and release appends an entry
+    in the same transaction as the inventory change it records, so an event's
+    availability can be audited and replayed from its last `InventorySnapshot`.
+    The ledger is an audit log only; the inventory counters stay authoritative.
+
+    Attributes:
+        id (Optional[int]): The unique identifier for the entry. Increases with every append.
+        event_id (int): The identifier of the event whose inventory changed. Links to the 'event.id' foreign key.
+            Indexed together with `id` and `delta`, so replaying an event's ledger tail reads only the index.
+        kind (str): What caused the change: 'reserve', 'adjust', 'cancel', 'hold' or 'release'.
+        delta (int): The change to the event's available tickets, negative when tickets were taken.
+        created_at (datetime): The UTC time at which the entry was appended.
+    """
+    __tablename__ = "ledger_entry"
+    __table_args__ = (Index("ix_ledger_entry_event_id_id_delta", "event_id", "id", "delta"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_id: int = Field(foreign_key="event.id")
+    kind: str = Field(max_length=16)
+    delta: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
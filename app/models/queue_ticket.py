@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel
+
+
+class QueueTicket(SQLModel):
+    """
+    Represents a client's place in an event's waiting room.
+
+    Attributes:
+        token (str): The opaque token identifying the client's place in the queue.
+        event_id (int): The identifier of the event the client is queueing for.
+        position (int): The number of clients ahead of this one. Positions below the
+            waiting room's concurrency limit are admitted.
+        admitted (bool): Whether the client may now create a reservation for the event.
+        retry_after (int): The suggested number of seconds to wait before polling again.
+    """
+    token: str
+    event_id: int
+    position: int
+    admitted: bool
+    retry_after: int
@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -9,10 +10,22 @@ class Reservation(SQLModel, table=True):
     Attributes:
         id (Optional[int]): The unique identifier for the reservation. Automatically generated if not provided.
         user_id (int): The identifier of the user who made the reservation. Links to the 'user.id' foreign key.
+            Indexed for per-user listings.
         event_id (int): The identifier of the event for which the reservation is made. Links to the 'event.id' foreign key.
+            Indexed for per-event listings, and together with `user_id` and `tickets_reserved`
+            so that per-user ticket sums for an event are read from the index alone.
         tickets_reserved (int): The number of tickets reserved by the user for the event.
     """
+    __table_args__ = (
+        Index(
+            "ix_reservation_event_id_user_id_tickets_reserved",
+            "event_id",
+            "user_id",
+            "tickets_reserved",
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
-    event_id: int = Field(foreign_key="event.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
+    event_id: int = Field(foreign_key="event.id", index=True)
     tickets_reserved: int
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class RollupState(SQLModel, table=True):
+    """
+    Represents the refresh state of a set of rollup tables.
+
+    Its row is locked for the duration of a refresh, so refreshers running in
+    several workers take turns instead of folding the same deltas twice.
+
+    Attributes:
+        name (str): The name of the rollup, e.g. 'sales'.
+        refreshed_at (Optional[datetime]): The UTC time of the last completed refresh.
+    """
+    __tablename__ = "rollup_state"
+
+    name: str = Field(primary_key=True, max_length=32)
+    refreshed_at: Optional[datetime] = None
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class SalesDelta(SQLModel, table=True):
+    """
+    Represents one change to the tickets a user holds for an event, waiting to be folded into the sales rollups.
+
+    Every path that creates, resizes or removes reservations appends deltas in
+    the same transaction, as plain inserts that never contend on a shared row.
+    The sales rollup refresher folds them into `EventSales` and `UserSales` and
+    deletes them, so the table only holds the last few seconds of sales.
+
+    Attributes:
+        id (Optional[int]): The unique identifier for the delta. Automatically generated if not provided.
+        event_id (int): The identifier of the event whose sales changed. Not a foreign key, so
+            deltas outlive the event they describe until they are folded.
+        user_id (int): The identifier of the user whose reservations changed. Not a foreign key either.
+        tickets (int): The change to the user's reserved tickets for the event, negative when tickets
+            were given back.
+        created_at (datetime): The UTC time at which the delta was appended.
+    """
+    __tablename__ = "sales_delta"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_id: int
+    user_id: int
+    tickets: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from typing import Optional
+from sqlmodel import SQLModel
+
+
+class EventSalesSummary(SQLModel):
+    """
+    Represents the sales of one event, read from the sales rollups.
+
+    Attributes:
+        event_id (int): The identifier of the event.
+        name (str): The name of the event.
+        date_time (datetime): When the event takes place.
+        tickets_total (int): The total number of tickets for the event.
+        tickets_sold (int): The tickets currently reserved for the event.
+        sell_through (float): `tickets_sold` as a fraction of `tickets_total`.
+        refreshed_at (Optional[datetime]): The UTC time of the last rollup refresh; sales made
+            since then are not counted yet.
+    """
+    event_id: int
+    name: str
+    date_time: datetime
+    tickets_total: int
+    tickets_sold: int
+    sell_through: float
+    refreshed_at: Optional[datetime] = None
+
+
+class SellThroughBucket(SQLModel):
+    """
+    Represents the combined sales of the events taking place on one day.
+
+    Attributes:
+        day (date): The day the events take place on.
+        events (int): The number of events on that day.
+        tickets_total (int): The total number of tickets for those events.
+        tickets_sold (int): The tickets currently reserved for those events.
+        sell_through (float): `tickets_sold` as a fraction of `tickets_total`.
+    """
+    day: date
+    events: int
+    tickets_total: int
+    tickets_sold: int
+    sell_through: float
@@ -0,0 +1,19 @@
+from sqlmodel import Field, SQLModel
+
+
+class UserSales(SQLModel, table=True):
+    """
+    Represents the rolled-up number of tickets a user has reserved across all events.
+
+    Maintained by the sales rollup refresher from `SalesDelta` rows. Users without
+    reservations have no row.
+
+    Attributes:
+        user_id (int): The identifier of the user.
+        tickets_sold (int): The tickets currently reserved by the user, as of the last refresh.
+            Indexed so the top buyers are read from the end of the index.
+    """
+    __tablename__ = "user_sales"
+
+    user_id: int = Field(primary_key=True)
+    tickets_sold: int = Field(index=True)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from config.settings import settings
+from ..services.event_service import availability_feed
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def _availability_events(event_id: int) -> AsyncIterator[str]:
+    async with availability_feed.subscribe(event_id) as updates:
+        while True:
+            try:
+                tickets_available = await asyncio.wait_for(
+                    updates.get(), settings.AVAILABILITY_FEED_KEEPALIVE_S
+                )
+            except asyncio.TimeoutError:
+                # A comment line keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+
+            if tickets_available is None:
+                yield "event: deleted\ndata: {}\n\n"
+                return
+            data = json.dumps({"event_id": event_id, "tickets_available": tickets_available})
+            yield f"event: availability\ndata: {data}\n\n"
+
+
+@router.get("/events/{event_id}/availability/stream")
+async def stream_event_availability_endpoint(event_id: int):
+    """
+    Streams an event's available tickets as Server-Sent Events.
+
+    The current value is sent right away, followed by at most one `availability`
+    event per `AVAILABILITY_FEED_INTERVAL_S` while tickets are selling, and a
+    `deleted` event if the event goes away. Use this instead of polling
+    GET /events/{event_id}/availability.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        StreamingResponse: The `text/event-stream` response.
+    """
+    return StreamingResponse(
+        _availability_events(event_id),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/events/{event_id}/availability/ws")
+async def event_availability_websocket(websocket: WebSocket, event_id: int):
+    """
+    Pushes an event's available tickets over a WebSocket.
+
+    Sends the same updates as the Server-Sent Events stream, as JSON messages
+    with `event_id` and `tickets_available`, and closes once the event is deleted.
+    The socket is read while updates are sent, so a client that disconnects is
+    unsubscribed straight away rather than on the next update.
+
+    Parameters:
+        websocket (WebSocket): The client connection.
+        event_id (int): The unique identifier of the event.
+    """
+    await websocket.accept()
+    async with availability_feed.subscribe(event_id) as updates:
+        tasks = {
+            asyncio.create_task(_send_availability(websocket, event_id, updates)),
+            asyncio.create_task(_receive_until_disconnect(websocket)),
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in done:
+            task.result()
+
+
+async def _send_availability(websocket: WebSocket, event_id: int, updates: asyncio.Queue):
+    try:
+        while True:
+            tickets_available = await updates.get()
+            if tickets_available is None:
+                await websocket.close()
+                return
+            await websocket.send_json(
+                {"event_id": event_id, "tickets_available": tickets_available}
+            )
+    except WebSocketDisconnect:
+        pass
+
+
+async def _receive_until_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored.
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
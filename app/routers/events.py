@@ -1,15 +1,47 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from config.settings import settings
 from ..models.event import Event
-from ..services.event_service import get_all_events, create_event, delete_event
+from ..models.ledger_entry import LedgerEntry
+from ..services.ledger import get_ledger_entries, rebuild_inventory
+from ..services.pagination import next_cursor
+from ..services.rows import record_dicts
+from ..services.event_service import (
+    event_cache,
+    get_all_events,
+    get_event_availability,
+    create_event,
+    delete_event,
+    set_inventory_slots,
+)
 
 router = APIRouter()
 
 
 @router.get("/events/", response_model=List[Event])
-async def read_events_endpoint():
+async def read_events_endpoint(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    name_prefix: Optional[str] = None,
+):
     """
-    Retrieves a list of all events.
+    Retrieves a list of events, optionally filtered and paginated.
+
+    Pages are keyed on the event ID: pass the `X-Next-Cursor` header of a full
+    page as `after` to fetch the next one. With `FAST_LIST_RESPONSES` the page is
+    encoded straight from the rows.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of events to return.
+        after (Optional[int]): Only return events with an ID greater than this cursor.
+        date_from (Optional[datetime]): Only return events taking place at or after this time.
+        date_to (Optional[datetime]): Only return events taking place at or before this time.
+        name_prefix (Optional[str]): Only return events whose name starts with this prefix.
 
     Returns:
         List[Event]: A list of event instances.
@@ -17,12 +49,51 @@ async def read_events_endpoint():
     Raises:
         HTTPException: A 404 error if no events are found.
     """
-    events, message = await get_all_events()
+    events, message = await get_all_events(limit, after, date_from, date_to, name_prefix)
     if events is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    cursor = next_cursor(events, limit)
+    if cursor is not None:
+        response.headers["X-Next-Cursor"] = str(cursor)
+    if settings.FAST_LIST_RESPONSES:
+        return ORJSONResponse(record_dicts(events), headers=response.headers)
     return events
 
 
+@router.get("/events/cache-stats")
+async def read_event_cache_stats_endpoint():
+    """
+    Reports the size, bounds and hit/miss/eviction counters of the event cache.
+
+    Returns:
+        dict: The event cache statistics.
+    """
+    return event_cache.stats()
+
+
+@router.get("/events/{event_id}/availability")
+async def read_event_availability_endpoint(event_id: int):
+    """
+    Retrieves the number of tickets still available for an event.
+
+    Served from the event cache when possible, so it is cheap to poll.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        dict: The event ID and its number of available tickets.
+
+    Raises:
+        HTTPException: A 404 error if the event is not found.
+    """
+    tickets_available, message = await get_event_availability(event_id)
+    if tickets_available is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return {"event_id": event_id, "tickets_available": tickets_available}
+
+
 @router.post("/events/", response_model=Event, status_code=status.HTTP_201_CREATED)
 async def create_event_endpoint(event: Event):
     """
@@ -61,3 +132,82 @@ async def delete_event_endpoint(event_id: int):
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
     return {"message": "Event deleted successfully"}
+
+
+@router.put("/events/{event_id}/inventory-slots", response_model=Event)
+async def set_inventory_slots_endpoint(event_id: int, slots: int):
+    """
+    Splits an event's inventory across a number of counter slots.
+
+    Sharding a hot event lets concurrent reservations update different rows
+    instead of contending for the single `tickets_available` counter. Passing
+    `slots=0` folds the slots back into a single counter.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+        slots (int): The number of counter slots to use.
+
+    Returns:
+        Event: The updated event instance.
+
+    Raises:
+        HTTPException: A 400 error if the event is not found or `slots` is invalid.
+    """
+    event, message = await set_inventory_slots(event_id, slots)
+    if not event:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+    return event
+
+
+@router.get("/events/{event_id}/ledger", response_model=List[LedgerEntry])
+async def read_event_ledger_endpoint(
+    event_id: int,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+):
+    """
+    Retrieves the reservation ledger of an event, oldest entry first, optionally paginated.
+
+    Pages are keyed on the entry ID: pass the `X-Next-Cursor` header of a full
+    page as `after` to fetch the next one.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+        limit (Optional[int]): The maximum number of entries to return.
+        after (Optional[int]): Only return entries with an ID greater than this cursor.
+
+    Returns:
+        List[LedgerEntry]: A list of ledger entries.
+
+    Raises:
+        HTTPException: A 404 error if the event has no ledger entries.
+    """
+    entries, message = await get_ledger_entries(event_id, limit, after)
+    if entries is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    cursor = next_cursor(entries, limit)
+    if cursor is not None:
+        response.headers["X-Next-Cursor"] = str(cursor)
+    return entries
+
+
+@router.post("/events/{event_id}/inventory/rebuild")
+async def rebuild_inventory_endpoint(event_id: int):
+    """
+    Resets an event's inventory counter to the availability replayed from its ledger.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        dict: The event ID and its rebuilt number of available tickets.
+
+    Raises:
+        HTTPException: A 404 error if the event is not found or has no ledger snapshot.
+    """
+    tickets_available, message = await rebuild_inventory(event_id)
+    if tickets_available is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return {"event_id": event_id, "tickets_available": tickets_available}
@@ -0,0 +1,44 @@
+from typing import Optional
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from ..services.export_service import export_events, export_reservations, export_users
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@router.get("/export/events")
+async def export_events_endpoint():
+    """
+    Streams every event as newline-delimited JSON, one event per line.
+
+    Returns:
+        StreamingResponse: The NDJSON stream.
+    """
+    return StreamingResponse(export_events(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/export/users")
+async def export_users_endpoint():
+    """
+    Streams every user as newline-delimited JSON, one user per line.
+
+    Returns:
+        StreamingResponse: The NDJSON stream.
+    """
+    return StreamingResponse(export_users(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/export/reservations")
+async def export_reservations_endpoint(event_id: Optional[int] = None):
+    """
+    Streams every reservation as newline-delimited JSON, one reservation per line.
+
+    Parameters:
+        event_id (Optional[int]): Only export reservations for this event.
+
+    Returns:
+        StreamingResponse: The NDJSON stream.
+    """
+    return StreamingResponse(export_reservations(event_id), media_type=NDJSON_MEDIA_TYPE)
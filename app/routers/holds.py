@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, status
+from ..models.hold import Hold
+from ..models.reservation import Reservation
+from ..services.hold_service import create_hold, confirm_hold, release_hold
+
+router = APIRouter()
+
+
+@router.post("/holds/", response_model=Hold, status_code=status.HTTP_201_CREATED)
+async def create_hold_endpoint(hold: Hold):
+    """
+    Hold tickets for a user while they check out.
+
+    The hold expires after the configured TTL unless it is confirmed first.
+
+    Parameters:
+        hold (Hold): The hold data to create.
+
+    Raises:
+        HTTPException: 400 Bad Request if the hold cannot be created.
+
+    Returns:
+        Hold: The created Hold object, including its expiry time.
+    """
+    hold, message = await create_hold(hold)
+    if not hold:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+    return hold
+
+
+@router.post(
+    "/holds/{hold_id}/confirm",
+    response_model=Reservation,
+    status_code=status.HTTP_201_CREATED,
+)
+async def confirm_hold_endpoint(hold_id: int):
+    """
+    Confirm a hold, turning it into a reservation.
+
+    Parameters:
+        hold_id (int): The unique identifier of the hold to confirm.
+
+    Raises:
+        HTTPException: 400 Bad Request if the hold does not exist or has expired.
+
+    Returns:
+        Reservation: The created Reservation object.
+    """
+    reservation, message = await confirm_hold(hold_id)
+    if not reservation:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+    return reservation
+
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold_endpoint(hold_id: int):
+    """
+    Release a hold, returning its tickets to the event.
+
+    Parameters:
+        hold_id (int): The unique identifier of the hold to release.
+
+    Raises:
+        HTTPException: 404 Not Found if the hold does not exist.
+    """
+    success, message = await release_hold(hold_id)
+    if not success:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
@@ -0,0 +1,76 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from ..models.import_report import ImportReport
+from ..services.import_service import IMPORT_FORMATS, import_rows
+
+router = APIRouter()
+
+
+@router.post(
+    "/import/events", response_model=ImportReport, status_code=status.HTTP_201_CREATED
+)
+async def import_events_endpoint(
+    request: Request, content_type: Optional[str] = Header(default=None)
+):
+    """
+    Imports the events in a CSV or NDJSON request body.
+
+    The body is parsed as it arrives and inserted in batches of `IMPORT_BATCH_SIZE`
+    rows, one transaction each, so it can be of any size. Rows that fail
+    validation are skipped and reported.
+
+    Parameters:
+        request (Request): The request, whose body is streamed.
+        content_type (Optional[str]): `text/csv` or `application/x-ndjson`.
+
+    Raises:
+        HTTPException: 415 Unsupported Media Type for any other content type.
+        HTTPException: 400 Bad Request if the body is malformed or an insert fails; the
+                       detail is the report, and batches committed before are kept.
+
+    Returns:
+        ImportReport: The rows read, imported and rejected, and the rows per second.
+    """
+    return await _import(request, content_type, "events")
+
+
+@router.post(
+    "/import/users", response_model=ImportReport, status_code=status.HTTP_201_CREATED
+)
+async def import_users_endpoint(
+    request: Request, content_type: Optional[str] = Header(default=None)
+):
+    """
+    Imports the users in a CSV or NDJSON request body.
+
+    The body is parsed as it arrives and inserted in batches of `IMPORT_BATCH_SIZE`
+    rows, one transaction each, so it can be of any size. Rows that fail
+    validation are skipped and reported.
+
+    Parameters:
+        request (Request): The request, whose body is streamed.
+        content_type (Optional[str]): `text/csv` or `application/x-ndjson`.
+
+    Raises:
+        HTTPException: 415 Unsupported Media Type for any other content type.
+        HTTPException: 400 Bad Request if the body is malformed or an insert fails; the
+                       detail is the report, and batches committed before are kept.
+
+    Returns:
+        ImportReport: The rows read, imported and rejected, and the rows per second.
+    """
+    return await _import(request, content_type, "users")
+
+
+async def _import(request: Request, content_type: Optional[str], kind: str) -> ImportReport:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of {', '.join(IMPORT_FORMATS)}",
+        )
+
+    report = await import_rows(kind, request.stream(), IMPORT_FORMATS[media_type])
+    if not report.completed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=report.model_dump())
+    return report
@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..database import get_pool_stats
+from ..instrumentation import metrics_registry
+from ..services.event_service import availability_feed, event_cache
+from ..services.single_flight import service_reads
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics_endpoint():
+    """
+    Exposes per-route request metrics in the Prometheus text format.
+
+    Includes request latency histograms and the SQL time, query count and pool
+    wait spent per route, along with gauges for the connection pool, the event
+    cache, the availability feed and read coalescing.
+
+    Returns:
+        PlainTextResponse: The Prometheus exposition text.
+    """
+    gauges = {}
+    for prefix, stats in (
+        ("db_pool", get_pool_stats()),
+        ("event_cache", event_cache.stats()),
+        ("availability_feed", availability_feed.stats()),
+        ("single_flight", service_reads.stats()),
+    ):
+        for name, value in stats.items():
+            gauges[f"{prefix}_{name}"] = value
+    return PlainTextResponse(
+        metrics_registry.render(gauges), media_type=PROMETHEUS_MEDIA_TYPE
+    )
+
+
+@router.get("/metrics/pool")
+async def read_pool_metrics_endpoint():
+    """
+    Reports the database connection pool's checked-out, idle and overflow
+    connections and how long checkouts have waited.
+
+    Returns:
+        dict: The connection pool statistics.
+    """
+    return get_pool_stats()
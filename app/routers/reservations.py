@@ -1,8 +1,22 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Request
+import json
+from typing import Awaitable, Callable, List, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from config.settings import settings
+from ..models.bulk_reservation import (
+    BulkReservationRequest,
+    BulkReservationResponse,
+    BulkReservationResult,
+)
 from ..models.reservation import Reservation
+from ..services import waiting_room as waiting_room_service
+from ..services.admission import admit_reservation
+from ..services.idempotency import request_fingerprint, run_idempotent
+from ..services.pagination import next_cursor
+from ..services.rows import record_dicts
 from ..services.booking_service import (
-    create_reservation,
+    create_reservations_bulk,
     update_reservation,
     cancel_reservation,
     get_all_reservations,
@@ -11,10 +25,60 @@ from ..services.booking_service import (
 router = APIRouter()
 
 
+def _encode_json(value) -> str:
+    return json.dumps(jsonable_encoder(value), separators=(",", ":"))
+
+
+async def _run_idempotent(
+    request: Request,
+    idempotency_key: Optional[str],
+    endpoint: Callable[[], Awaitable],
+    status_code: int,
+):
+    """
+    Run an endpoint body at most once per `Idempotency-Key`, replaying its response to retries.
+
+    Without a key the endpoint runs as usual. With one, its result or 4xx error is
+    stored and sent back verbatim for every retry carrying the same key and
+    request. 429 and 5xx errors are not stored, so those retries run again.
+    """
+    if idempotency_key is None:
+        return await endpoint()
+
+    async def handler() -> tuple[int, str]:
+        try:
+            result = await endpoint()
+        except HTTPException as e:
+            if e.status_code == status.HTTP_429_TOO_MANY_REQUESTS or e.status_code >= 500:
+                raise
+            return e.status_code, _encode_json({"detail": e.detail})
+        return status_code, _encode_json(result)
+
+    fingerprint = request_fingerprint(request.method, request.url.path, await request.body())
+    status_code, body = await run_idempotent(idempotency_key, fingerprint, handler)
+    if status_code == status.HTTP_204_NO_CONTENT:
+        return Response(status_code=status_code)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
 @router.get("/reservations/", response_model=List[Reservation])
-async def list_all_reservations():
+async def list_all_reservations(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    event_id: Optional[int] = None,
+):
     """
-    Retrieve a list of all reservations in the system.
+    Retrieve a list of reservations in the system, optionally filtered by event and paginated.
+
+    Pages are keyed on the reservation ID: pass the `X-Next-Cursor` header of a
+    full page as `after` to fetch the next one. With `FAST_LIST_RESPONSES` the
+    page is encoded straight from the rows.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of reservations to return.
+        after (Optional[int]): Only return reservations with an ID greater than this cursor.
+        event_id (Optional[int]): Only return reservations for this event.
 
     Raises:
         HTTPException: 404 Not Found if no reservations exist.
@@ -22,42 +86,169 @@ async def list_all_reservations():
     Returns:
         List[Reservation]: A list of Reservation objects.
     """
-    reservations, message = await get_all_reservations()
+    reservations, message = await get_all_reservations(limit, after, event_id)
     if not reservations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    cursor = next_cursor(reservations, limit)
+    if cursor is not None:
+        response.headers["X-Next-Cursor"] = str(cursor)
+    if settings.FAST_LIST_RESPONSES:
+        return ORJSONResponse(record_dicts(reservations), headers=response.headers)
     return reservations
 
 
 @router.post(
     "/reservations/", response_model=Reservation, status_code=status.HTTP_201_CREATED
 )
-async def create_reservation_endpoint(reservation: Reservation):
+async def create_reservation_endpoint(
+    reservation: Reservation,
+    request: Request,
+    waiting_room_token: Optional[str] = Header(default=None),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+):
     """
     Create a new reservation in the system.
 
+    Concurrent requests for the same event are coalesced into micro-batches by
+    the admission layer and settled together in one transaction. When the waiting
+    room is enabled, the request must carry an admitted `Waiting-Room-Token` for
+    the event; the token is consumed by the attempt.
+
+    Retries that carry the same `Idempotency-Key` get the original response
+    instead of creating another reservation.
+
     Parameters:
         reservation (Reservation): The reservation data to create.
+        request (Request): The request, fingerprinted along with the idempotency key.
+        waiting_room_token (Optional[str]): The waiting room token from the `Waiting-Room-Token` header.
+        idempotency_key (Optional[str]): The client's key from the `Idempotency-Key` header.
+
+    Raises:
+        HTTPException: 400 Bad Request if the reservation cannot be created or the
+                       waiting room token is missing, unknown or for another event.
+        HTTPException: 429 Too Many Requests with a Retry-After header if the token
+                       has not been admitted yet.
+        HTTPException: 409 Conflict if a request with the same idempotency key is still
+                       running on another worker, or 422 if the key was used for a
+                       different request.
+
+    Returns:
+        Reservation: The created Reservation object.
+    """
+    async def create():
+        if not settings.WAITING_ROOM_ENABLED:
+            created, message = await admit_reservation(reservation)
+        else:
+            room = waiting_room_service.waiting_room
+            ticket, message = (
+                await room.status(waiting_room_token)
+                if waiting_room_token
+                else (None, "A Waiting-Room-Token header is required")
+            )
+            if not ticket:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+            if ticket.event_id != reservation.event_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Waiting room token is for event {ticket.event_id}",
+                )
+            if not ticket.admitted:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Waiting room position {ticket.position}, not admitted yet",
+                    headers={"Retry-After": str(ticket.retry_after)},
+                )
+            try:
+                created, message = await admit_reservation(reservation)
+            finally:
+                await room.leave(waiting_room_token)
+
+        if not created:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+        return created
+
+    return await _run_idempotent(
+        request, idempotency_key, create, status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/reservations/bulk",
+    response_model=BulkReservationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_reservations_bulk_endpoint(request: BulkReservationRequest):
+    """
+    Create many reservations, possibly across many events, in one transaction.
+
+    In "atomic" mode either every reservation is created or none is. In
+    "best_effort" mode every reservation that can be created is, and the
+    response reports the outcome of each one.
+
+    Parameters:
+        request (BulkReservationRequest): The reservations to create and the mode.
 
     Raises:
-        HTTPException: 400 Bad Request if the reservation cannot be created.
+        HTTPException: 400 Bad Request if the request holds too many reservations, or
+                       if an atomic request fails; the detail then lists every result.
 
     Returns:
-        dict: A message and the created Reservation object.
+        BulkReservationResponse: The number of reservations created and one result per reservation.
     """
-    reservation, message = await create_reservation(reservation)
-    if not reservation:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
-    return {"message": message, "reservation": reservation}
+    if len(request.reservations) > settings.BULK_RESERVATION_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_RESERVATION_MAX_ITEMS} reservations per request",
+        )
+
+    reservations = [
+        Reservation(
+            user_id=item.user_id,
+            event_id=item.event_id,
+            tickets_reserved=item.tickets_reserved,
+        )
+        for item in request.reservations
+    ]
+    results, message = await create_reservations_bulk(
+        reservations, atomic=request.mode == "atomic"
+    )
+    response = BulkReservationResponse(
+        message=message,
+        created=sum(1 for reservation, _ in results if reservation),
+        results=[
+            BulkReservationResult(
+                index=index,
+                success=reservation is not None,
+                message=result_message,
+                reservation_id=reservation.id if reservation else None,
+            )
+            for index, (reservation, result_message) in enumerate(results)
+        ],
+    )
+    if request.mode == "atomic" and not response.created and results:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=response.model_dump()
+        )
+    return response
 
 
 @router.put("/reservations/{reservation_id}", response_model=Reservation)
-async def update_reservation_endpoint(reservation_id: int, request: Request):
+async def update_reservation_endpoint(
+    reservation_id: int,
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+):
     """
     Update a reservation's details by its ID.
 
+    Retries that carry the same `Idempotency-Key` get the original response
+    instead of applying the update again.
+
     Parameters:
         reservation_id (int): The unique identifier of the reservation to update.
         request (Request): The request object containing the update details.
+        idempotency_key (Optional[str]): The client's key from the `Idempotency-Key` header.
 
     Raises:
         HTTPException: 400 Bad Request if the necessary update details are missing or invalid.
@@ -65,31 +256,43 @@ async def update_reservation_endpoint(reservation_id: int, request: Request):
     Returns:
         Reservation: The updated Reservation object.
     """
-    body = await request.json()
-    user_id = body.get("user_id")
-    tickets_reserved = body.get("tickets_reserved")
+    async def update():
+        body = await request.json()
+        user_id = body.get("user_id")
+        tickets_reserved = body.get("tickets_reserved")
 
-    if user_id is None or tickets_reserved is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Missing user_id or tickets_reserved in request body",
+        if user_id is None or tickets_reserved is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing user_id or tickets_reserved in request body",
+            )
+
+        reservation, message = await update_reservation(
+            reservation_id, user_id, tickets_reserved
         )
+        if not reservation:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+        return reservation
 
-    reservation, message = await update_reservation(
-        reservation_id, user_id, tickets_reserved
-    )
-    if not reservation:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
-    return reservation
+    return await _run_idempotent(request, idempotency_key, update, status.HTTP_200_OK)
 
 
 @router.delete("/reservations/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def cancel_reservation_endpoint(reservation_id: int):
+async def cancel_reservation_endpoint(
+    reservation_id: int,
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+):
     """
     Cancel a reservation by its ID.
 
+    Retries that carry the same `Idempotency-Key` get the original response,
+    so a retried cancellation succeeds instead of reporting a missing reservation.
+
     Parameters:
         reservation_id (int): The unique identifier of the reservation to cancel.
+        request (Request): The request, fingerprinted along with the idempotency key.
+        idempotency_key (Optional[str]): The client's key from the `Idempotency-Key` header.
 
     Raises:
         HTTPException: 404 Not Found if the reservation does not exist.
@@ -97,7 +300,12 @@ async def cancel_reservation_endpoint(reservation_id: int):
     Returns:
         dict: A message indicating successful cancellation.
     """
-    success, message = await cancel_reservation(reservation_id)
-    if not success:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
-    return {"message": "Reservation deleted successfully"}
+    async def cancel():
+        success, message = await cancel_reservation(reservation_id)
+        if not success:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+        return {"message": "Reservation deleted successfully"}
+
+    return await _run_idempotent(
+        request, idempotency_key, cancel, status.HTTP_204_NO_CONTENT
+    )
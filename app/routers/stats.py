@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, HTTPException, Query, status
+from config.settings import settings
+from ..models.sales_report import EventSalesSummary, SellThroughBucket
+from ..models.user_sales import UserSales
+from ..services.sales_rollups import (
+    get_event_sales,
+    get_sell_through,
+    get_top_buyers,
+    rebuild_sales_rollups,
+)
+
+router = APIRouter()
+
+
+@router.get("/stats/events/{event_id}", response_model=EventSalesSummary)
+async def read_event_sales_endpoint(event_id: int):
+    """
+    Retrieves an event's tickets sold and sell-through rate.
+
+    Served from the sales rollups, which trail bookings by up to
+    `SALES_ROLLUP_REFRESH_INTERVAL_S`; `refreshed_at` tells how fresh they are.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        EventSalesSummary: The event's sales summary.
+
+    Raises:
+        HTTPException: A 404 error if the event is not found.
+    """
+    summary, message = await get_event_sales(event_id)
+    if not summary:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return summary
+
+
+@router.get("/stats/users/top", response_model=List[UserSales])
+async def read_top_buyers_endpoint(
+    limit: int = Query(default=10, ge=1, le=settings.MAX_PAGE_SIZE),
+):
+    """
+    Retrieves the users holding the most reserved tickets, most tickets first.
+
+    Parameters:
+        limit (int): The number of users to return.
+
+    Returns:
+        List[UserSales]: The users' IDs and reserved tickets.
+
+    Raises:
+        HTTPException: A 404 error if no sales have been recorded.
+    """
+    buyers, message = await get_top_buyers(limit)
+    if not buyers:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return buyers
+
+
+@router.get("/stats/sell-through", response_model=List[SellThroughBucket])
+async def read_sell_through_endpoint(date_from: datetime, date_to: datetime):
+    """
+    Retrieves the sell-through of the events taking place in a date range, bucketed by day.
+
+    Parameters:
+        date_from (datetime): Only include events taking place at or after this time.
+        date_to (datetime): Only include events taking place at or before this time.
+
+    Returns:
+        List[SellThroughBucket]: One bucket per day with events, in day order.
+
+    Raises:
+        HTTPException: A 404 error if no events take place in the range.
+    """
+    buckets, message = await get_sell_through(date_from, date_to)
+    if not buckets:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return buckets
+
+
+@router.post("/stats/rebuild")
+async def rebuild_sales_rollups_endpoint():
+    """
+    Recomputes the sales rollups from the reservation table.
+
+    Scans every reservation, so run it once to backfill the rollups after
+    upgrading, or to recover from an incident, not from a dashboard.
+
+    Returns:
+        dict: The number of event and user rollup rows written.
+    """
+    counts, _ = await rebuild_sales_rollups()
+    return counts
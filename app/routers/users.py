@@ -1,17 +1,33 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from config.settings import settings
 from ..models.user import User
 from ..models.reservation import Reservation
 from ..services.user_service import create_user, get_user, delete_user, get_all_users
 from ..services.booking_service import get_reservations_by_user
+from ..services.pagination import next_cursor
+from ..services.rows import record_dicts
 
 router = APIRouter()
 
 
 @router.get("/users/", response_model=List[User])
-async def read_users_endpoint():
+async def read_users_endpoint(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+):
     """
-    Retrieve a list of all users in the system.
+    Retrieve a list of users in the system, optionally paginated.
+
+    Pages are keyed on the user ID: pass the `X-Next-Cursor` header of a full
+    page as `after` to fetch the next one. With `FAST_LIST_RESPONSES` the page is
+    encoded straight from the rows.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of users to return.
+        after (Optional[int]): Only return users with an ID greater than this cursor.
 
     Raises:
         HTTPException: 404 Not Found if no users exist.
@@ -19,9 +35,15 @@ async def read_users_endpoint():
     Returns:
         List[User]: A list of User objects.
     """
-    users, message = await get_all_users()
+    users, message = await get_all_users(limit, after)
     if not users:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    cursor = next_cursor(users, limit)
+    if cursor is not None:
+        response.headers["X-Next-Cursor"] = str(cursor)
+    if settings.FAST_LIST_RESPONSES:
+        return ORJSONResponse(record_dicts(users), headers=response.headers)
     return users
 
 
@@ -46,12 +68,19 @@ async def read_user_endpoint(user_id: int):
 
 
 @router.get("/users/{user_id}/reservations", response_model=List[Reservation])
-async def get_user_reservations(user_id: int):
+async def get_user_reservations(
+    user_id: int,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+):
     """
-    Retrieve all reservations made by a specific user.
+    Retrieve reservations made by a specific user, optionally paginated.
 
     Parameters:
         user_id (int): The unique identifier of the user whose reservations are being requested.
+        limit (Optional[int]): The maximum number of reservations to return.
+        after (Optional[int]): Only return reservations with an ID greater than this cursor.
 
     Raises:
         HTTPException: 404 Not Found if the user has no reservations or does not exist.
@@ -59,9 +88,15 @@ async def get_user_reservations(user_id: int):
     Returns:
         List[Reservation]: A list of Reservation objects.
     """
-    reservations, message = await get_reservations_by_user(user_id)
+    reservations, message = await get_reservations_by_user(user_id, limit, after)
     if not reservations:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    cursor = next_cursor(reservations, limit)
+    if cursor is not None:
+        response.headers["X-Next-Cursor"] = str(cursor)
+    if settings.FAST_LIST_RESPONSES:
+        return ORJSONResponse(record_dicts(reservations), headers=response.headers)
     return reservations
 
 
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException, status
+from ..models.queue_ticket import QueueTicket
+from ..services import waiting_room as waiting_room_service
+
+router = APIRouter()
+
+
+@router.post(
+    "/events/{event_id}/waiting-room",
+    response_model=QueueTicket,
+    status_code=status.HTTP_201_CREATED,
+)
+async def join_waiting_room_endpoint(event_id: int):
+    """
+    Joins the waiting room of an event.
+
+    The returned token must be sent in the `Waiting-Room-Token` header of
+    POST /reservations/ once the ticket is admitted.
+
+    Parameters:
+        event_id (int): The unique identifier of the event to queue for.
+
+    Returns:
+        QueueTicket: The client's token and position in the queue.
+
+    Raises:
+        HTTPException: A 429 error with a Retry-After header if the queue is full.
+    """
+    room = waiting_room_service.waiting_room
+    ticket, message = await room.join(event_id)
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=message,
+            headers={
+                "Retry-After": str(room.retry_after(room.concurrency + room.max_queue))
+            },
+        )
+    return ticket
+
+
+@router.get("/waiting-room/{token}", response_model=QueueTicket)
+async def read_waiting_room_endpoint(token: str):
+    """
+    Polls a client's position in a waiting room.
+
+    Polling also keeps the token alive; tokens that are not polled expire.
+
+    Parameters:
+        token (str): The token returned when joining the waiting room.
+
+    Returns:
+        QueueTicket: The client's current position and whether it has been admitted.
+
+    Raises:
+        HTTPException: A 404 error if the token is unknown or has expired.
+    """
+    ticket, message = await waiting_room_service.waiting_room.status(token)
+    if not ticket:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+    return ticket
+
+
+@router.delete("/waiting-room/{token}", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_waiting_room_endpoint(token: str):
+    """
+    Leaves a waiting room, letting the next client in line move up.
+
+    Parameters:
+        token (str): The token returned when joining the waiting room.
+    """
+    await waiting_room_service.waiting_room.leave(token)
@@ -0,0 +1,80 @@
+"""
+Production entry point for the booking API:
+
+    python -m app.server --host 0.0.0.0 --port 8000 --workers 4
+
+Applies pending schema migrations once in this process, then serves `app.main:app` from
+`--workers` uvicorn worker processes on uvloop and httptools, without the
+reloader. Workers skip `init_db` and size their connection pools to their share
+of `DB_MAX_CONNECTIONS`. On SIGTERM or SIGINT each worker stops accepting
+connections, gives in-flight requests up to `SHUTDOWN_GRACE_S` seconds to finish
+and then runs the application's lifespan shutdown.
+
+Workers share only the database. The waiting room is kept in each worker's
+memory, so a token issued by one worker is unknown to the others and every
+worker would admit its own `WAITING_ROOM_CONCURRENCY`; the server refuses to
+start with `WAITING_ROOM_ENABLED` and more than one worker. The reservation
+batcher is per worker as well, which only means that concurrent requests for
+one event are coalesced into up to one batch per worker.
+"""
+
+import argparse
+import asyncio
+import os
+
+import uvicorn
+
+from config.settings import settings
+
+
+async def prepare_database():
+    from .database import close_db, init_db
+
+    await init_db()
+    await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the booking API with multiple workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+    if settings.WAITING_ROOM_ENABLED and args.workers > 1:
+        parser.error(
+            "WAITING_ROOM_ENABLED needs a single worker: the waiting room is kept in "
+            "process memory and would not be shared between workers"
+        )
+    if settings.DB_MAX_CONNECTIONS and settings.DB_MAX_CONNECTIONS < args.workers:
+        parser.error(
+            f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS} is less than --workers, "
+            "and every worker needs at least one connection"
+        )
+
+    # Workers inherit the environment, so every one of them sizes its pools for the
+    # same worker count and leaves the schema alone. With a single worker the app runs
+    # in this process, where the settings are already loaded.
+    os.environ["WEB_WORKERS"] = str(args.workers)
+    os.environ["DB_INIT_ON_STARTUP"] = "false"
+    settings.WEB_WORKERS = args.workers
+    settings.DB_INIT_ON_STARTUP = False
+
+    asyncio.run(prepare_database())
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        log_level=args.log_level,
+        access_log=args.access_log,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_S,
+    )
+
+
+if __name__ == "__main__":
+    main()
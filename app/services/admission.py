@@ -0,0 +1,118 @@
+import asyncio
+from typing import Awaitable, Callable
+from config.settings import settings
+from ..models.reservation import Reservation
+from .booking_service import create_reservation, settle_reservation_batch
+
+SettleBatch = Callable[[int, list[Reservation]], Awaitable[list[tuple[Reservation, str]]]]
+
+
+class ReservationBatcher:
+    """
+    Coalesces concurrent reservation requests for the same event into micro-batches.
+
+    The first request for an event opens a batch window of `max_wait_ms`. Every
+    request for that event arriving within the window joins the batch, and the
+    batch is settled as soon as the window closes or `max_batch_size` requests
+    have joined. Each batch is settled with a single call to `settle`, so N
+    contending transactions on the event row become roughly one per window,
+    while every caller still receives its own result.
+
+    Attributes:
+        max_batch_size (int): The number of requests that closes a batch early.
+        max_wait (float): The length of the batch window in seconds.
+    """
+
+    def __init__(self, settle: SettleBatch, max_batch_size: int, max_wait_ms: float):
+        self._settle = settle
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: dict[int, list[tuple[Reservation, asyncio.Future]]] = {}
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def submit(self, reservation: Reservation) -> tuple[Reservation, str]:
+        """
+        Add a reservation to its event's current batch and wait for the batch to settle.
+
+        Parameters:
+            reservation (Reservation): The reservation to create.
+
+        Returns:
+            tuple: The (Reservation, message) or (None, error message) result for
+                   this reservation.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        event_id = reservation.event_id
+        batch = self._pending.setdefault(event_id, [])
+        batch.append((reservation, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(event_id)
+        elif len(batch) == 1:
+            self._timers[event_id] = loop.call_later(self.max_wait, self._flush, event_id)
+
+        return await future
+
+    async def drain(self):
+        """
+        Settle every open batch immediately and wait for all batches in flight.
+
+        Called on shutdown so no accepted request is left waiting for a window
+        that will never close.
+        """
+        for event_id in list(self._pending):
+            self._flush(event_id)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _flush(self, event_id: int):
+        timer = self._timers.pop(event_id, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(event_id, None)
+        if batch:
+            task = asyncio.create_task(self._settle_batch(event_id, batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _settle_batch(
+        self, event_id: int, batch: list[tuple[Reservation, asyncio.Future]]
+    ):
+        try:
+            results = await self._settle(event_id, [reservation for reservation, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+reservation_batcher = ReservationBatcher(
+    settle_reservation_batch,
+    settings.RESERVATION_BATCH_MAX_SIZE,
+    settings.RESERVATION_BATCH_MAX_WAIT_MS,
+)
+
+
+async def admit_reservation(reservation: Reservation) -> tuple[Reservation, str]:
+    """
+    Create a reservation through the admission batcher, or directly when batching
+    is disabled with `RESERVATION_BATCH_MAX_SIZE <= 1`.
+
+    Parameters:
+        reservation (Reservation): The reservation to create.
+
+    Returns:
+        tuple: A tuple containing the created Reservation object and a success message,
+               or None and an error message if the creation fails.
+    """
+    if reservation_batcher.max_batch_size <= 1:
+        return await create_reservation(reservation)
+    return await reservation_batcher.submit(reservation)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityFeed:
+    """
+    Pushes per-event availability to in-process subscribers, coalesced per interval.
+
+    Booking paths call `notify` after every committed change. Changes are only
+    recorded, never sent straight away: every `interval` seconds `publish_pending`
+    looks each changed event's availability up once and hands it to all of that
+    event's subscribers, so a burst of sales costs one lookup and one message per
+    subscriber per interval however many tickets were sold. Every `resync`
+    seconds all subscribed events are looked up as well, which picks up changes
+    made by other worker processes.
+
+    Each subscriber gets a one-slot queue that always holds the latest value, so a
+    slow client skips stale updates instead of buffering them.
+
+    Attributes:
+        lookup (Callable): Returns an event's available tickets and a message, or None if it is gone.
+        interval (float): The minimum number of seconds between two updates for one event.
+        resync (float): The number of seconds between lookups of every subscribed event.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[int], Awaitable[tuple[Optional[int], str]]],
+        interval: float,
+        resync: float,
+    ):
+        self.lookup = lookup
+        self.interval = interval
+        self.resync = resync
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._last_sent: dict[int, int] = {}
+        self._dirty: set[int] = set()
+        self._last_resync = time.monotonic()
+
+    def notify(self, event_id: int):
+        """
+        Record that an event's availability changed. Cheap enough to call on every booking.
+        """
+        if event_id in self._subscribers:
+            self._dirty.add(event_id)
+
+    @asynccontextmanager
+    async def subscribe(self, event_id: int) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to an event's availability for the duration of the block.
+
+        The queue yields the event's available tickets, starting with the current
+        value, and None once the event has been deleted.
+        """
+        updates = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(event_id, set()).add(updates)
+        try:
+            tickets_available, _ = await self.lookup(event_id)
+            _offer(updates, tickets_available)
+            yield updates
+        finally:
+            subscribers = self._subscribers[event_id]
+            subscribers.discard(updates)
+            if not subscribers:
+                del self._subscribers[event_id]
+                self._last_sent.pop(event_id, None)
+                self._dirty.discard(event_id)
+
+    async def publish_pending(self) -> int:
+        """
+        Send the current availability of every changed event to its subscribers.
+
+        Returns:
+            int: The number of messages handed to subscribers.
+        """
+        now = time.monotonic()
+        if now - self._last_resync >= self.resync:
+            self._last_resync = now
+            self._dirty.update(self._subscribers)
+
+        dirty, self._dirty = self._dirty, set()
+        sent = 0
+        for event_id in dirty:
+            if event_id not in self._subscribers:
+                continue
+
+            tickets_available, _ = await self.lookup(event_id)
+            if event_id in self._last_sent and self._last_sent[event_id] == tickets_available:
+                continue
+            self._last_sent[event_id] = tickets_available
+
+            # The set can shrink while lookups await; iterate over a copy.
+            for updates in list(self._subscribers.get(event_id, ())):
+                _offer(updates, tickets_available)
+                sent += 1
+        return sent
+
+    async def run(self):
+        """
+        Publish pending changes every `interval` seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.publish_pending()
+            except Exception:
+                logger.exception("Failed to publish availability updates")
+
+    def stats(self) -> dict:
+        """
+        Return the number of subscribed events and subscribers.
+        """
+        return {
+            "events": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+def _offer(updates: asyncio.Queue, value: Optional[int]):
+    # Replace whatever the subscriber has not consumed yet with the latest value.
+    if updates.full():
+        updates.get_nowait()
+    updates.put_nowait(value)
@@ -1,22 +1,47 @@
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from ..models.reservation import Reservation
 from ..models.event import Event
+from ..models.reservation import Reservation
+from ..models.sales_delta import SalesDelta
 from ..models.user import User
-from ..database import AsyncSessionLocal
-
-
-async def get_all_reservations():
+from ..database import AsyncSessionLocal, ReadSessionLocal
+from .event_service import invalidate_event
+from .inventory import reserve_tickets, release_tickets, get_tickets_available
+from .pagination import paginate
+from .rows import ReservationRow, fetch_records, select_records
+from .sales_rollups import sales_deltas
+from .single_flight import service_reads
+
+
+@service_reads.coalesce
+async def get_all_reservations(
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    event_id: Optional[int] = None,
+):
     """
-    Fetch all reservations from the database.
+    Fetch reservations from the database, optionally filtered by event and paginated by ID.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of reservations to return. None returns all of them.
+        after (Optional[int]): Only return reservations with an ID greater than this cursor.
+        event_id (Optional[int]): Only return reservations for this event.
 
     Returns:
-        tuple: A tuple containing a list of Reservation objects and a success message,
+        tuple: A tuple containing a list of ReservationRow records and a success message,
                or None and an error message if no reservations are found.
     """
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         async with session.begin():
-            result = await session.execute(select(Reservation))
-            reservations = result.scalars().all()
+            statement = select_records(ReservationRow)
+            if event_id is not None:
+                statement = statement.where(Reservation.event_id == event_id)
+            result = await session.execute(
+                paginate(statement, Reservation.id, limit, after)
+            )
+            reservations = fetch_records(result, ReservationRow)
 
             if not reservations:
                 return None, "Reservations not found"
@@ -24,23 +49,36 @@ async def get_all_reservations():
             return reservations, "Reservations found successfully"
 
 
-async def get_reservations_by_user(user_id: int):
+@service_reads.coalesce
+async def get_reservations_by_user(
+    user_id: int,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+):
     """
-    Fetch all reservations made by a specific user.
+    Fetch reservations made by a specific user, optionally paginated by ID.
 
     Parameters:
         user_id (int): The unique identifier of the user.
+        limit (Optional[int]): The maximum number of reservations to return. None returns all of them.
+        after (Optional[int]): Only return reservations with an ID greater than this cursor.
 
     Returns:
-        tuple: A tuple containing a list of Reservation objects made by the specified user
+        tuple: A tuple containing a list of ReservationRow records made by the specified user
                and a success message, or None and an error message if no reservations are found.
     """
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         async with session.begin():
+            statement = select_records(ReservationRow)
             result = await session.execute(
-                select(Reservation).where(Reservation.user_id == user_id)
+                paginate(
+                    statement.where(Reservation.user_id == user_id),
+                    Reservation.id,
+                    limit,
+                    after,
+                )
             )
-            reservations = result.scalars().all()
+            reservations = fetch_records(result, ReservationRow)
 
             if not reservations:
                 return None, f"No reservations found for user ID {user_id}"
@@ -52,6 +90,11 @@ async def create_reservation(reservation: Reservation) -> tuple[Reservation, str
     """
     Create a new reservation in the database.
 
+    The inventory check and decrement are done with one conditional UPDATE on the
+    event row (see `inventory.reserve_tickets`) and the reservation is inserted in
+    the same transaction, so concurrent requests can neither oversell the event
+    nor queue up behind a lock held for a read-modify-write round trip.
+
     Parameters:
         reservation (Reservation): The reservation object to be added to the database.
 
@@ -59,38 +102,163 @@ async def create_reservation(reservation: Reservation) -> tuple[Reservation, str
         tuple: A tuple containing the created Reservation object and a success message,
                or None and an error message if the creation fails.
     """
+    if reservation.tickets_reserved < 1:
+        return (
+            None,
+            "Number of reserved ticket must be at least one.",
+        )
+
     async with AsyncSessionLocal() as session:
         async with session.begin():
             user = await session.get(User, reservation.user_id)
             if not user:
                 return None, "User not found"
 
-            if reservation.tickets_reserved < 1:
-                return (
-                    None,
-                    "Number of reserved ticket must be at least one.",
+            if not await reserve_tickets(
+                session, reservation.event_id, reservation.tickets_reserved
+            ):
+                tickets_available = await get_tickets_available(
+                    session, reservation.event_id
                 )
-
-            event = await session.get(Event, reservation.event_id)
-            if not event:
-                return None, "Event not found"
-
-            if event.tickets_available < reservation.tickets_reserved:
+                if tickets_available is None:
+                    return None, "Event not found"
                 return (
                     None,
-                    f"Only {event.tickets_available} tickets available, requested {reservation.tickets_reserved}.",
+                    f"Only {tickets_available} tickets available, requested {reservation.tickets_reserved}.",
                 )
-            event.tickets_available -= reservation.tickets_reserved
             session.add(reservation)
-            session.add(event)
+            session.add_all(sales_deltas([reservation]))
 
+        invalidate_event(reservation.event_id)
         return reservation, "Reservation created successfully"
 
 
+async def settle_reservation_batch(
+    event_id: int, reservations: list[Reservation]
+) -> list[tuple[Reservation, str]]:
+    """
+    Create a batch of reservations for one event in a single transaction.
+
+    The users are checked with one `IN (...)` query and, when the batch fits in the
+    remaining inventory, the event is decremented once for the whole batch. When
+    it does not fit, requests are admitted one by one in arrival order until the
+    inventory runs out.
+
+    Parameters:
+        event_id (int): The unique identifier of the event all reservations are for.
+        reservations (list[Reservation]): The reservations to create, in arrival order.
+
+    Returns:
+        list: One (Reservation, message) or (None, error message) tuple per
+              reservation, in the same order as `reservations`.
+    """
+    results = [None] * len(reservations)
+    pending = _check_tickets(reservations, results)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            pending = await _check_users(session, reservations, pending, results)
+            accepted = await _reserve_in_order(
+                session, event_id, reservations, pending, results
+            )
+            session.add_all(reservations[index] for index in accepted)
+            session.add_all(sales_deltas(reservations[index] for index in accepted))
+
+    if accepted:
+        invalidate_event(event_id)
+    for index in accepted:
+        results[index] = (reservations[index], "Reservation created successfully")
+    return results
+
+
+async def create_reservations_bulk(
+    reservations: list[Reservation], atomic: bool
+) -> tuple[list[tuple[Reservation, str]], str]:
+    """
+    Create many reservations, possibly across many events, in a single transaction.
+
+    Users and events are validated with one `IN (...)` query each, and the
+    reservations are grouped per event so each event's inventory is decremented
+    once for its whole group. Events are processed in ID order, so concurrent
+    bulk requests lock their events in the same order.
+
+    In atomic mode either every reservation is created or none is. Otherwise each
+    reservation succeeds or fails on its own, with oversubscribed events admitting
+    reservations in request order until their inventory runs out.
+
+    Parameters:
+        reservations (list[Reservation]): The reservations to create, in request order.
+        atomic (bool): Whether a single failure should roll back the whole request.
+
+    Returns:
+        tuple: One (Reservation, message) or (None, error message) tuple per
+               reservation, in request order, and a summary message.
+    """
+    results = [None] * len(reservations)
+    pending = _check_tickets(reservations, results)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin() as transaction:
+            pending = await _check_users(session, reservations, pending, results)
+            pending = await _check_events(session, reservations, pending, results)
+
+            groups = defaultdict(list)
+            for index in pending:
+                groups[reservations[index].event_id].append(index)
+
+            # In atomic mode a failed validation already dooms the whole request.
+            if atomic and len(pending) < len(reservations):
+                groups.clear()
+
+            accepted = []
+            for event_id in sorted(groups):
+                indices = groups[event_id]
+                if not atomic:
+                    accepted += await _reserve_in_order(
+                        session, event_id, reservations, indices, results
+                    )
+                    continue
+
+                requested = sum(reservations[index].tickets_reserved for index in indices)
+                if not await reserve_tickets(session, event_id, requested):
+                    tickets_available = await get_tickets_available(session, event_id)
+                    for index in indices:
+                        results[index] = (
+                            None,
+                            f"Only {tickets_available} tickets available for event {event_id}, "
+                            f"requested {requested} in this batch.",
+                        )
+                    break
+                accepted += indices
+
+            if atomic and len(accepted) < len(reservations):
+                await transaction.rollback()
+                for index, result in enumerate(results):
+                    if result is None:
+                        results[index] = (
+                            None,
+                            "Not created because another reservation in the batch failed.",
+                        )
+                return results, "No reservations created"
+
+            session.add_all(reservations[index] for index in accepted)
+            session.add_all(sales_deltas(reservations[index] for index in accepted))
+
+    for index in accepted:
+        results[index] = (reservations[index], "Reservation created successfully")
+    for event_id in {reservations[index].event_id for index in accepted}:
+        invalidate_event(event_id)
+
+    return results, f"Created {len(accepted)} of {len(reservations)} reservations"
+
+
 async def update_reservation(reservation_id: int, user_id: int, tickets_reserved: int):
     """
     Update an existing reservation.
 
+    Only the difference between the old and new ticket counts is applied to the
+    event's inventory, using the same conditional update as `create_reservation`.
+
     Parameters:
         reservation_id (int): The ID of the reservation to update.
         user_id (int): The ID of the user making the update request.
@@ -100,28 +268,48 @@ async def update_reservation(reservation_id: int, user_id: int, tickets_reserved
         tuple: A tuple containing the updated Reservation object and a success message,
                or None and an error message if the update fails.
     """
+    if tickets_reserved < 1:
+        return (
+            None,
+            "Number of reserved ticket must be at least one.",
+        )
+
     async with AsyncSessionLocal() as session:
         async with session.begin():
-            reservation = await session.get(Reservation, reservation_id)
+            reservation = await session.get(
+                Reservation, reservation_id, with_for_update=True
+            )
             if not reservation or reservation.user_id != user_id:
                 return None, "Reservation not found or user mismatch"
 
-            event = await session.get(Event, reservation.event_id)
-            if tickets_reserved < 1:
-                return (
-                    None,
-                    "Number of reserved ticket must be at least one.",
-                )
             additional_tickets_needed = tickets_reserved - reservation.tickets_reserved
-            if additional_tickets_needed > event.tickets_available:
-                return (
-                    None,
-                    f"Not enough tickets available. Only {event.tickets_available} left.",
-                )
+            if additional_tickets_needed > 0:
+                if not await reserve_tickets(
+                    session, reservation.event_id, additional_tickets_needed, "adjust"
+                ):
+                    tickets_available = await get_tickets_available(
+                        session, reservation.event_id
+                    )
+                    return (
+                        None,
+                        f"Not enough tickets available. Only {tickets_available} left.",
+                    )
+            elif additional_tickets_needed < 0:
+                if not await release_tickets(
+                    session, reservation.event_id, -additional_tickets_needed, "adjust"
+                ):
+                    return None, f"Event for reservation {reservation_id} not found"
 
-            event.tickets_available -= additional_tickets_needed
             reservation.tickets_reserved = tickets_reserved
-
+            if additional_tickets_needed:
+                session.add(SalesDelta(
+                    event_id=reservation.event_id,
+                    user_id=user_id,
+                    tickets=additional_tickets_needed,
+                ))
+
+        if additional_tickets_needed:
+            invalidate_event(reservation.event_id)
         return reservation, "Reservation updated successfully"
 
 
@@ -138,15 +326,104 @@ async def cancel_reservation(reservation_id: int) -> tuple[bool, str]:
     """
     async with AsyncSessionLocal() as session:
         async with session.begin():
-            reservation = await session.get(Reservation, reservation_id)
+            reservation = await session.get(
+                Reservation, reservation_id, with_for_update=True
+            )
             if not reservation:
                 return False, "Reservation not found"
 
-            event = await session.get(Event, reservation.event_id)
-            if not event:
+            if not await release_tickets(
+                session, reservation.event_id, reservation.tickets_reserved
+            ):
                 return False, f"Event for reservation {reservation_id} not found"
 
-            event.tickets_available += reservation.tickets_reserved
             await session.delete(reservation)
+            session.add_all(sales_deltas([reservation], -1))
 
+        invalidate_event(reservation.event_id)
         return True, "Reservation cancelled successfully"
+
+
+def _check_tickets(reservations: list[Reservation], results: list) -> list[int]:
+    pending = []
+    for index, reservation in enumerate(reservations):
+        if reservation.tickets_reserved < 1:
+            results[index] = (None, "Number of reserved ticket must be at least one.")
+        else:
+            pending.append(index)
+    return pending
+
+
+async def _check_users(
+    session: AsyncSession, reservations: list[Reservation], indices: list[int], results: list
+) -> list[int]:
+    if not indices:
+        return []
+
+    result = await session.execute(
+        select(User.id).where(User.id.in_({reservations[index].user_id for index in indices}))
+    )
+    user_ids = set(result.scalars().all())
+
+    valid = []
+    for index in indices:
+        if reservations[index].user_id in user_ids:
+            valid.append(index)
+        else:
+            results[index] = (None, "User not found")
+    return valid
+
+
+async def _check_events(
+    session: AsyncSession, reservations: list[Reservation], indices: list[int], results: list
+) -> list[int]:
+    if not indices:
+        return []
+
+    result = await session.execute(
+        select(Event.id).where(Event.id.in_({reservations[index].event_id for index in indices}))
+    )
+    event_ids = set(result.scalars().all())
+
+    valid = []
+    for index in indices:
+        if reservations[index].event_id in event_ids:
+            valid.append(index)
+        else:
+            results[index] = (None, "Event not found")
+    return valid
+
+
+async def _reserve_in_order(
+    session: AsyncSession,
+    event_id: int,
+    reservations: list[Reservation],
+    indices: list[int],
+    results: list,
+) -> list[int]:
+    """
+    Take inventory for a group of reservations for one event: with one decrement
+    if the whole group fits, otherwise one by one in order until it runs out.
+    Returns the indices that got their tickets and records errors for the rest.
+    """
+    requested = sum(reservations[index].tickets_reserved for index in indices)
+    if not indices or await reserve_tickets(session, event_id, requested):
+        return indices
+
+    tickets_available = await get_tickets_available(session, event_id)
+    admitted = []
+    for index in indices:
+        tickets_reserved = reservations[index].tickets_reserved
+        if tickets_available is None:
+            results[index] = (None, "Event not found")
+        elif tickets_reserved > tickets_available or not await reserve_tickets(
+            session, event_id, tickets_reserved
+        ):
+            results[index] = (
+                None,
+                f"Only {tickets_available} tickets available, requested {tickets_reserved}.",
+            )
+        else:
+            tickets_available -= tickets_reserved
+            admitted.append(index)
+    return admitted
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    A size-bounded least-recently-used cache whose entries also expire after a fixed TTL.
+
+    Lookups, inserts and invalidations are O(1). Hits, misses, evictions and
+    expirations are counted so the cache can be sized from real traffic.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept before the least recently used is evicted.
+        ttl (float): The number of seconds an entry stays valid. A TTL of 0 disables caching.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that found no valid entry.
+        evictions (int): The number of entries dropped to stay within `maxsize`.
+        expirations (int): The number of entries dropped because their TTL had passed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key` without counting a hit or miss or
+        refreshing its recency. Expired entries are still returned.
+        """
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache `value` under `key` for `ttl` seconds, evicting the least recently
+        used entry if the cache is full.
+        """
+        if self.ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """
+        Drop the entry for `key`, if any.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the cache's size, bounds and counters.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,43 @@
+from sqlalchemy import delete
+from sqlmodel import SQLModel, select
+from ..database import AsyncSessionLocal
+
+
+async def delete_in_chunks(
+    model: type[SQLModel], where, chunk_size: int, id_column=None
+) -> int:
+    """
+    Deletes every row of `model` matching `where`, `chunk_size` rows per transaction.
+
+    Each chunk selects a bounded set of primary keys and removes them with a
+    single `DELETE ... WHERE id IN (...)`, so locks are only held for one chunk at
+    a time and no row is loaded into the session.
+
+    Parameters:
+        model (type[SQLModel]): The table model to delete from.
+        where: The filter clause selecting the rows to delete.
+        chunk_size (int): The maximum number of rows deleted per transaction.
+        id_column: The model's single-column primary key. Defaults to `model.id`.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    id_column = model.id if id_column is None else id_column
+    deleted = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(id_column).where(where).limit(chunk_size)
+                )
+                ids = result.scalars().all()
+                if ids:
+                    await session.execute(
+                        delete(model)
+                        .where(id_column.in_(ids))
+                        .execution_options(synchronize_session=False)
+                    )
+
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            return deleted
@@ -1,31 +1,170 @@
+import sys
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
+from config.settings import settings
 from ..models.event import Event
+from ..models.hold import Hold
+from ..models.inventory_slot import InventorySlot
+from ..models.inventory_snapshot import InventorySnapshot
+from ..models.ledger_entry import LedgerEntry
 from ..models.reservation import Reservation
-from ..database import AsyncSessionLocal
+from ..database import AsyncSessionLocal, ReadSessionLocal
+from .availability_feed import AvailabilityFeed
+from .cache import TTLCache
+from .cascade import delete_in_chunks
+from .inventory import (
+    get_sharded_availability,
+    get_tickets_available,
+    resize_inventory_slots,
+)
+from .pagination import paginate
+from .rows import EventRow, fetch_records, select_records
+from .sales_rollups import sales_deltas
+from .single_flight import service_reads
 
+# Read-through cache for the event listing (under EVENT_LIST_KEY, as a dict of
+# EventRow records by id) and per-event availability (under the event id).
+event_cache = TTLCache(settings.EVENT_CACHE_MAX_ENTRIES, settings.EVENT_CACHE_TTL_S)
+EVENT_LIST_KEY = "events"
 
-async def get_all_events():
+
+def invalidate_event(event_id: Optional[int] = None):
+    """
+    Drops the cached event listing and, if given, one event's cached availability
+    and tells the availability feed about it.
+
+    Called after every committed change to an event or its inventory. Entries are
+    dropped rather than adjusted, since a reader may already have cached the
+    committed value and applying the change again would count it twice.
+
+    Parameters:
+        event_id (Optional[int]): The unique identifier of the event that changed.
+    """
+    event_cache.invalidate(EVENT_LIST_KEY)
+    if event_id is not None:
+        event_cache.invalidate(event_id)
+        availability_feed.notify(event_id)
+
+
+@service_reads.coalesce
+async def get_all_events(
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    name_prefix: Optional[str] = None,
+):
     """
-    Retrieves all events from the database.
+    Retrieves events, optionally filtered and paginated.
+
+    The unfiltered, unpaginated listing is served from the event cache when
+    possible. Any other combination is a keyset query on `id` that only reads
+    the requested page, from a read replica if one is configured. The cache is
+    filled from the primary, so it never holds values older than the last
+    invalidation. Events are read as `EventRow` records, not ORM instances.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of events to return. None returns all of them.
+        after (Optional[int]): Only return events with an ID greater than this cursor.
+        date_from (Optional[datetime]): Only return events taking place at or after this time.
+        date_to (Optional[datetime]): Only return events taking place at or before this time.
+        name_prefix (Optional[str]): Only return events whose name starts with this prefix.
 
     Returns:
-        tuple: A tuple containing a list of Event objects if found, and a corresponding message.
+        tuple: A tuple containing a list of EventRow records if found, and a corresponding message.
                Returns None and an error message if no events are found.
     """
-    async with AsyncSessionLocal() as session:
-        async with session.begin():
-            result = await session.execute(select(Event))
-            events = result.scalars().all()
-            if not events:
-                return None, "Events not found"
+    if any(
+        value is not None for value in (limit, after, date_from, date_to, name_prefix)
+    ):
+        statement = select_records(EventRow)
+        if date_from is not None:
+            statement = statement.where(Event.date_time >= date_from)
+        if date_to is not None:
+            statement = statement.where(Event.date_time <= date_to)
+        if name_prefix:
+            # LIKE with a bound pattern cannot use the name index everywhere; the range can.
+            statement = statement.where(
+                Event.name.startswith(name_prefix, autoescape=True),
+                Event.name >= name_prefix,
+            )
+            upper_bound = _prefix_upper_bound(name_prefix)
+            if upper_bound is not None:
+                statement = statement.where(Event.name < upper_bound)
+
+        async with ReadSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(paginate(statement, Event.id, limit, after))
+                events = await _refresh_sharded_records(
+                    session, fetch_records(result, EventRow)
+                )
+
+        if not events:
+            return None, "Events not found"
+        return events, "Event found successfully"
+
+    events_by_id = event_cache.get(EVENT_LIST_KEY)
+    if events_by_id is None:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(select_records(EventRow).order_by(Event.id))
+                events = await _refresh_sharded_records(
+                    session, fetch_records(result, EventRow)
+                )
+
+        events_by_id = {event.id: event for event in events}
+        event_cache.set(EVENT_LIST_KEY, events_by_id)
+
+    if not events_by_id:
+        return None, "Events not found"
+
+    return list(events_by_id.values()), "Event found successfully"
+
+
+@service_reads.coalesce
+async def get_event_availability(event_id: int) -> tuple[Optional[int], str]:
+    """
+    Retrieves the number of tickets still available for an event, from the event
+    cache when possible.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        tuple: A tuple containing the number of available tickets and a success message,
+               or None and an error message if the event is not found.
+    """
+    tickets_available = event_cache.get(event_id)
+    if tickets_available is None:
+        async with AsyncSessionLocal() as session:
+            tickets_available = await get_tickets_available(session, event_id)
+        if tickets_available is None:
+            return None, "Event not found"
+
+        event_cache.set(event_id, tickets_available)
+
+    return tickets_available, "Event availability found successfully"
 
-            return events, "Event found successfully"
+
+# Live availability pushed to SSE and WebSocket subscribers; see routers/availability.py.
+availability_feed = AvailabilityFeed(
+    get_event_availability,
+    settings.AVAILABILITY_FEED_INTERVAL_S,
+    settings.AVAILABILITY_FEED_RESYNC_S,
+)
 
 
 async def create_event(event_data: Event) -> tuple[Event, str]:
     """
     Creates a new event and saves it to the database.
 
+    The event's initial tickets are recorded as its first ledger snapshot. If
+    `inventory_slots` is set, the tickets are split across that many counter
+    slots right away.
+
     Parameters:
         event_data (Event): The event data to save.
 
@@ -36,7 +175,21 @@ async def create_event(event_data: Event) -> tuple[Event, str]:
     async with AsyncSessionLocal() as session:
         try:
             async with session.begin():
+                slots = event_data.inventory_slots
+                event_data.inventory_slots = 0
+                event_data.deleting = False
                 session.add(event_data)
+                await session.flush()
+                session.add(
+                    InventorySnapshot(
+                        event_id=event_data.id,
+                        ledger_id=0,
+                        tickets_available=event_data.tickets_available,
+                    )
+                )
+                if slots:
+                    await resize_inventory_slots(session, event_data, slots)
+            invalidate_event()
             return event_data, "Event created successfully"
         except Exception as e:
             return None, f"Failed to create event: {e}"
@@ -44,7 +197,17 @@ async def create_event(event_data: Event) -> tuple[Event, str]:
 
 async def delete_event(event_id: int) -> tuple[bool, str]:
     """
-    Deletes an event identified by its ID.
+    Deletes an event identified by its ID, along with its reservations, holds and ledger.
+
+    The event is first marked as `deleting` and its inventory zeroed. From then on
+    `reserve_tickets` and `release_tickets` refuse it, so no reservation, hold,
+    cancellation or release can change its inventory while the rows go. Then its
+    holds, reservations and ledger entries are deleted with set-based statements
+    in chunks of `CASCADE_DELETE_CHUNK_SIZE` rows, each in its own short
+    transaction, and finally the event itself is removed. Each chunk of
+    reservations is taken out of the sales rollups in the transaction that
+    deletes it, from the rows it actually deletes, so a reservation cancelled
+    just before its chunk is never subtracted twice.
 
     Parameters:
         event_id (int): The unique identifier of the event to delete.
@@ -55,17 +218,120 @@ async def delete_event(event_id: int) -> tuple[bool, str]:
     """
     async with AsyncSessionLocal() as session:
         async with session.begin():
-            event = await session.get(Event, event_id)
+            event = await session.get(Event, event_id, with_for_update=True)
             if not event:
                 return False, "Event not found"
 
-            reservations = await session.execute(
-                select(Reservation).where(Reservation.event_id == event_id)
+            await session.execute(
+                delete(InventorySlot).where(InventorySlot.event_id == event_id)
+            )
+            event.inventory_slots = 0
+            event.tickets_available = 0
+            event.deleting = True
+
+    invalidate_event(event_id)
+    chunk_size = settings.CASCADE_DELETE_CHUNK_SIZE
+    await delete_in_chunks(Hold, Hold.event_id == event_id, chunk_size)
+    while True:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                deleted = await _delete_reservations(session, event_id, chunk_size)
+        if deleted < chunk_size:
+            break
+    await delete_in_chunks(LedgerEntry, LedgerEntry.event_id == event_id, chunk_size)
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            # Nothing can add rows for the event once it is marked; this last sweep
+            # only makes sure no foreign key is left pointing at it.
+            await session.execute(delete(Hold).where(Hold.event_id == event_id))
+            await _delete_reservations(session, event_id)
+            await session.execute(
+                delete(LedgerEntry).where(LedgerEntry.event_id == event_id)
             )
+            await session.execute(
+                delete(InventorySnapshot).where(InventorySnapshot.event_id == event_id)
+            )
+            await session.execute(delete(Event).where(Event.id == event_id))
+
+    invalidate_event(event_id)
+    return True, "Event deleted successfully"
+
+
+async def set_inventory_slots(event_id: int, slots: int) -> tuple[Event, str]:
+    """
+    Enables, resizes or disables sharded inventory for an event.
+
+    With `slots > 0` the event's remaining tickets are spread across that many
+    counter slots, so concurrent reservations update different rows. With
+    `slots == 0` the slots are folded back into `tickets_available`.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+        slots (int): The number of counter slots to use.
+
+    Returns:
+        tuple: A tuple containing the updated Event object and a success message,
+               or None and an error message if the event is not found or `slots` is invalid.
+    """
+    if slots < 0:
+        return None, "Number of inventory slots cannot be negative."
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event = await session.get(Event, event_id)
+            if not event:
+                return None, "Event not found"
+
+            await resize_inventory_slots(session, event, slots)
+
+        invalidate_event(event_id)
+        return event, f"Event inventory split across {slots} slots"
+
+
+async def _delete_reservations(
+    session: AsyncSession, event_id: int, limit: Optional[int] = None
+) -> int:
+    # Deletes up to `limit` of the event's reservations and takes exactly those
+    # rows out of the sales rollups, in the caller's transaction.
+    result = await session.execute(
+        select(
+            Reservation.id,
+            Reservation.event_id,
+            Reservation.user_id,
+            Reservation.tickets_reserved,
+        )
+        .where(Reservation.event_id == event_id)
+        .order_by(Reservation.id)
+        .limit(limit)
+        .with_for_update()
+    )
+    rows = result.all()
+    if rows:
+        await session.execute(
+            delete(Reservation)
+            .where(Reservation.id.in_([row.id for row in rows]))
+            .execution_options(synchronize_session=False)
+        )
+        session.add_all(sales_deltas(rows, -1))
+    return len(rows)
+
 
-            for reservation in reservations.scalars():
-                await session.delete(reservation)
+async def _refresh_sharded_records(session: AsyncSession, events: list) -> list:
+    # The stored aggregate of sharded events lags their slots; report the live sum.
+    sharded = [event.id for event in events if event.inventory_slots]
+    if not sharded:
+        return events
+    tickets_available = await get_sharded_availability(session, sharded)
+    return [
+        event._replace(tickets_available=tickets_available[event.id])
+        if event.id in tickets_available
+        else event
+        for event in events
+    ]
 
-            await session.delete(event)
 
-        return True, "Event deleted successfully"
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    # The smallest string greater than every string starting with `prefix`, if any.
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    return stem[:-1] + chr(ord(stem[-1]) + 1) if stem else None
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlmodel import SQLModel, select
+from config.settings import settings
+from ..models.event import Event
+from ..models.reservation import Reservation
+from ..models.user import User
+from ..database import ReadSessionLocal
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def stream_ndjson(
+    model: type[SQLModel], where=None, batch_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Streams every row of a table as newline-delimited JSON.
+
+    Rows are read through a server-side cursor `batch_size` at a time and encoded
+    straight from the column values, without building ORM instances, so memory
+    stays flat regardless of table size and the first rows reach the client
+    before the last ones are read.
+
+    Parameters:
+        model (type[SQLModel]): The table model to export.
+        where: An optional filter clause.
+        batch_size (Optional[int]): The number of rows fetched per round trip.
+            Defaults to `EXPORT_BATCH_SIZE`.
+
+    Yields:
+        bytes: One chunk of NDJSON lines per fetched batch.
+    """
+    statement = select(*model.__table__.columns).order_by(model.id)
+    if where is not None:
+        statement = statement.where(where)
+
+    async with ReadSessionLocal() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.mappings().partitions():
+            yield "".join(
+                json.dumps(dict(row), default=_encode_value) + "\n" for row in rows
+            ).encode()
+
+
+def export_events() -> AsyncIterator[bytes]:
+    """
+    Streams all events as NDJSON.
+
+    For events with sharded inventory, `tickets_available` is the stored,
+    lazily refreshed aggregate rather than the live sum of the event's slots.
+
+    Returns:
+        AsyncIterator[bytes]: The NDJSON chunks.
+    """
+    return stream_ndjson(Event)
+
+
+def export_users() -> AsyncIterator[bytes]:
+    """
+    Streams all users as NDJSON.
+
+    Returns:
+        AsyncIterator[bytes]: The NDJSON chunks.
+    """
+    return stream_ndjson(User)
+
+
+def export_reservations(event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Streams all reservations, or those of one event, as NDJSON.
+
+    Parameters:
+        event_id (Optional[int]): Only export reservations for this event.
+
+    Returns:
+        AsyncIterator[bytes]: The NDJSON chunks.
+    """
+    where = Reservation.event_id == event_id if event_id is not None else None
+    return stream_ndjson(Reservation, where)
@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from config.settings import settings
+from ..models.hold import Hold
+from ..models.reservation import Reservation
+from ..models.user import User
+from ..database import AsyncSessionLocal
+from .event_service import invalidate_event
+from .inventory import reserve_tickets, release_tickets, get_tickets_available
+from .sales_rollups import sales_deltas
+
+logger = logging.getLogger(__name__)
+
+
+async def create_hold(hold: Hold) -> tuple[Hold, str]:
+    """
+    Hold tickets for a user for `HOLD_TTL_S` seconds.
+
+    The tickets are taken from the event's inventory with the same conditional
+    decrement as a reservation, so `tickets_available` already accounts for them
+    while the user checks out.
+
+    Parameters:
+        hold (Hold): The hold to create. Its `expires_at` is set by the server.
+
+    Returns:
+        tuple: A tuple containing the created Hold object and a success message,
+               or None and an error message if the creation fails.
+    """
+    if hold.tickets_held < 1:
+        return None, "Number of held tickets must be at least one."
+
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            user = await session.get(User, hold.user_id)
+            if not user:
+                return None, "User not found"
+
+            if not await reserve_tickets(
+                session, hold.event_id, hold.tickets_held, "hold"
+            ):
+                tickets_available = await get_tickets_available(session, hold.event_id)
+                if tickets_available is None:
+                    return None, "Event not found"
+                return (
+                    None,
+                    f"Only {tickets_available} tickets available, requested {hold.tickets_held}.",
+                )
+
+            hold.expires_at = datetime.utcnow() + timedelta(seconds=settings.HOLD_TTL_S)
+            session.add(hold)
+
+        invalidate_event(hold.event_id)
+        return hold, "Hold created successfully"
+
+
+async def confirm_hold(hold_id: int) -> tuple[Reservation, str]:
+    """
+    Turn an unexpired hold into a reservation.
+
+    The tickets were already taken from the inventory when the hold was created,
+    so confirming only swaps the hold row for a reservation row.
+
+    Parameters:
+        hold_id (int): The ID of the hold to confirm.
+
+    Returns:
+        tuple: A tuple containing the created Reservation object and a success message,
+               or None and an error message if the hold is not found or has expired.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            hold = await session.get(Hold, hold_id, with_for_update=True)
+            if not hold:
+                return None, "Hold not found"
+            if hold.expires_at <= datetime.utcnow():
+                return None, "Hold has expired"
+
+            reservation = Reservation(
+                user_id=hold.user_id,
+                event_id=hold.event_id,
+                tickets_reserved=hold.tickets_held,
+            )
+            session.add(reservation)
+            session.add_all(sales_deltas([reservation]))
+            await session.delete(hold)
+
+        return reservation, "Hold confirmed successfully"
+
+
+async def release_hold(hold_id: int) -> tuple[bool, str]:
+    """
+    Release a hold and return its tickets to the event's inventory.
+
+    Parameters:
+        hold_id (int): The ID of the hold to release.
+
+    Returns:
+        tuple: A tuple indicating whether the release was successful,
+               and a corresponding message.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            hold = await session.get(Hold, hold_id, with_for_update=True)
+            if not hold:
+                return False, "Hold not found"
+
+            released = await release_holds(session, [hold])
+
+        apply_released_tickets(released)
+        return True, "Hold released successfully"
+
+
+async def release_holds(session: AsyncSession, holds: list) -> dict[int, int]:
+    """
+    Return the tickets of a set of holds to their events and delete the holds.
+
+    Tickets are summed per event, so each event's inventory is incremented once
+    however many of its holds are released, and the holds are removed with a
+    single `DELETE ... WHERE id IN (...)`.
+
+    Parameters:
+        session (AsyncSession): The session whose transaction the release joins.
+        holds (list): Hold objects or rows with `id`, `event_id` and `tickets_held`.
+
+    Returns:
+        dict: The number of tickets returned, by event ID. Pass it to
+              `apply_released_tickets` once the transaction has committed.
+    """
+    tickets_by_event = defaultdict(int)
+    for hold in holds:
+        tickets_by_event[hold.event_id] += hold.tickets_held
+
+    # Incrementing in event order keeps lock acquisition consistent across sweeps.
+    for event_id in sorted(tickets_by_event):
+        await release_tickets(session, event_id, tickets_by_event[event_id], "release")
+
+    await session.execute(
+        delete(Hold)
+        .where(Hold.id.in_([hold.id for hold in holds]))
+        .execution_options(synchronize_session=False)
+    )
+    return tickets_by_event
+
+
+def apply_released_tickets(tickets_by_event: dict[int, int]):
+    """
+    Drop cached event availability for tickets returned by a committed release.
+
+    Parameters:
+        tickets_by_event (dict): The number of tickets returned, by event ID.
+    """
+    for event_id in tickets_by_event:
+        invalidate_event(event_id)
+
+
+async def release_expired_holds(batch_size: int) -> int:
+    """
+    Release every hold whose `expires_at` has passed, `batch_size` holds per transaction.
+
+    Expired holds are found through the `expires_at` index, locked with
+    `SKIP LOCKED` so holds being confirmed concurrently are left alone, and
+    released in bulk with `release_holds`.
+
+    Parameters:
+        batch_size (int): The maximum number of holds released per transaction.
+
+    Returns:
+        int: The number of holds released.
+    """
+    released = 0
+    now = datetime.utcnow()
+    while True:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(Hold.id, Hold.event_id, Hold.tickets_held)
+                    .where(Hold.expires_at <= now)
+                    .order_by(Hold.expires_at)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                holds = result.all()
+                tickets_by_event = await release_holds(session, holds) if holds else {}
+
+        apply_released_tickets(tickets_by_event)
+        released += len(holds)
+        if len(holds) < batch_size:
+            return released
+
+
+async def run_hold_sweeper(interval: float, batch_size: int):
+    """
+    Release expired holds every `interval` seconds until cancelled.
+
+    Parameters:
+        interval (float): The number of seconds between sweeps.
+        batch_size (int): The maximum number of holds released per transaction.
+    """
+    while True:
+        try:
+            released = await release_expired_holds(batch_size)
+            if released:
+                logger.info("Released %d expired holds", released)
+        except Exception:
+            logger.exception("Failed to release expired holds")
+        await asyncio.sleep(interval)
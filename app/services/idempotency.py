@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from config.settings import settings
+from ..models.idempotency_record import IdempotencyRecord
+from ..database import AsyncSessionLocal
+from .cache import TTLCache
+from .cascade import delete_in_chunks
+
+logger = logging.getLogger(__name__)
+
+# Completed records by key, in front of the idempotency_record table.
+idempotency_cache = TTLCache(settings.IDEMPOTENCY_CACHE_MAX_ENTRIES, settings.IDEMPOTENCY_TTL_S)
+
+# Requests currently running in this process, by key; duplicates wait on these.
+_in_flight: dict[str, asyncio.Future] = {}
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """
+    Hash a request's method, path and body into the fingerprint stored with its key.
+    """
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def run_idempotent(
+    key: str, fingerprint: str, handler: Callable[[], Awaitable[tuple[int, str]]]
+) -> tuple[int, str]:
+    """
+    Run a write request at most once per idempotency key.
+
+    A completed key is answered from the in-memory cache or, after a restart or
+    on another worker, from the `idempotency_record` table. A duplicate that
+    arrives while the first request is still running in this process waits for
+    it and gets the same response; one that is running on another worker gets a
+    409. The key is claimed in the table before `handler` runs and the response
+    is stored afterwards. If `handler` raises, the claim is dropped and nothing
+    is stored, so the client can retry.
+
+    A claim whose response was never stored (the worker died, or storing the
+    response failed after the write committed) is never reclaimed
+    automatically, since the write may already have happened: the key keeps
+    answering 409, and claims older than `IDEMPOTENCY_PENDING_TIMEOUT_S` are
+    logged so an operator can check the write and delete the record.
+
+    Parameters:
+        key (str): The client-supplied idempotency key.
+        fingerprint (str): The request's fingerprint, from `request_fingerprint`.
+        handler (Callable): Runs the request and returns its status code and JSON body.
+
+    Returns:
+        tuple: The status code and JSON body to respond with.
+    """
+    while True:
+        record = idempotency_cache.get(key)
+        if record is not None:
+            return _replay(record, fingerprint)
+
+        in_flight = _in_flight.get(key)
+        if in_flight is None:
+            break
+        # If the first request fails, nothing is stored and this one runs instead.
+        await asyncio.wait([in_flight])
+
+    done = asyncio.get_running_loop().create_future()
+    _in_flight[key] = done
+    try:
+        record = await _claim(key, fingerprint)
+        if record is not None:
+            if record.status_code is None:
+                return 409, '{"detail":"A request with this Idempotency-Key is in progress"}'
+            idempotency_cache.set(key, record)
+            return _replay(record, fingerprint)
+
+        try:
+            status_code, body = await handler()
+        except BaseException:
+            await _release(key)
+            raise
+
+        record = await _complete(key, fingerprint, status_code, body)
+        idempotency_cache.set(key, record)
+        return status_code, body
+    finally:
+        del _in_flight[key]
+        done.set_result(None)
+
+
+async def purge_expired_idempotency_records(batch_size: int) -> int:
+    """
+    Delete every completed idempotency record older than `IDEMPOTENCY_TTL_S`, `batch_size` per transaction.
+
+    Unfinished claims are left for an operator to resolve.
+
+    Parameters:
+        batch_size (int): The maximum number of records deleted per transaction.
+
+    Returns:
+        int: The number of records deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_S)
+    return await delete_in_chunks(
+        IdempotencyRecord,
+        and_(IdempotencyRecord.created_at < cutoff, IdempotencyRecord.status_code.is_not(None)),
+        batch_size,
+        IdempotencyRecord.key,
+    )
+
+
+async def run_idempotency_purger(interval: float, batch_size: int):
+    """
+    Purge expired idempotency records every `interval` seconds until cancelled.
+
+    Parameters:
+        interval (float): The number of seconds between purges.
+        batch_size (int): The maximum number of records deleted per transaction.
+    """
+    while True:
+        try:
+            purged = await purge_expired_idempotency_records(batch_size)
+            if purged:
+                logger.info("Purged %d expired idempotency records", purged)
+        except Exception:
+            logger.exception("Failed to purge idempotency records")
+        await asyncio.sleep(interval)
+
+
+def _replay(record: IdempotencyRecord, fingerprint: str) -> tuple[int, str]:
+    if record.fingerprint != fingerprint:
+        return 422, '{"detail":"Idempotency-Key was already used for a different request"}'
+    return record.status_code, record.response_body
+
+
+async def _claim(key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+    # Returns None once this request owns the key, or the record that already does.
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        try:
+            async with session.begin():
+                record = await session.get(IdempotencyRecord, key, with_for_update=True)
+                if record is not None and _is_expired(record, now):
+                    await session.delete(record)
+                    await session.flush()
+                    record = None
+                if record is not None:
+                    if _is_abandoned(record, now):
+                        logger.warning(
+                            "Idempotency-Key %r has been pending since %s; check whether its "
+                            "write committed and delete the record to release the key",
+                            key,
+                            record.created_at.isoformat(),
+                        )
+                    return record
+
+                session.add(IdempotencyRecord(key=key, fingerprint=fingerprint, created_at=now))
+        except IntegrityError:
+            # Another worker claimed the key between our read and insert.
+            async with session.begin():
+                record = await session.get(IdempotencyRecord, key)
+            return record or IdempotencyRecord(key=key, fingerprint=fingerprint)
+    return None
+
+
+def _is_expired(record: IdempotencyRecord, now: datetime) -> bool:
+    # Only completed records expire; a pending claim may stand for a committed write.
+    age = (now - record.created_at).total_seconds()
+    return record.status_code is not None and age > settings.IDEMPOTENCY_TTL_S
+
+
+def _is_abandoned(record: IdempotencyRecord, now: datetime) -> bool:
+    age = (now - record.created_at).total_seconds()
+    return record.status_code is None and age > settings.IDEMPOTENCY_PENDING_TIMEOUT_S
+
+
+async def _complete(
+    key: str, fingerprint: str, status_code: int, body: str
+) -> IdempotencyRecord:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            record = await session.get(IdempotencyRecord, key)
+            if record is None:
+                record = IdempotencyRecord(key=key, fingerprint=fingerprint)
+                session.add(record)
+            record.status_code = status_code
+            record.response_body = body
+        return record
+
+
+async def _release(key: str):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            record = await session.get(IdempotencyRecord, key)
+            if record is not None:
+                await session.delete(record)
@@ -0,0 +1,280 @@
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Callable, Optional
+from sqlalchemy import exists, func, insert, literal
+from sqlmodel import select
+from config.settings import settings
+from ..models.event import Event
+from ..models.import_report import ImportReport, ImportRowError
+from ..models.inventory_snapshot import InventorySnapshot
+from ..models.user import User
+from ..database import AsyncSessionLocal
+from .event_service import invalidate_event
+
+logger = logging.getLogger(__name__)
+
+# Input formats by media type.
+IMPORT_FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+
+
+async def import_rows(
+    kind: str,
+    chunks: AsyncIterable[bytes],
+    input_format: str,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Imports events or users from a stream of CSV or NDJSON bytes.
+
+    The input is decoded and parsed one chunk at a time and each row validated
+    on its own; rejected rows are counted and skipped. Valid rows are inserted
+    `batch_size` at a time with one multi-row `INSERT` per transaction, while
+    the next batch is parsed, so at most two batches are held in memory
+    whatever the size of the input. Imported events get the ledger snapshot
+    `create_event` would record, but start with unsharded inventory.
+
+    CSV input starts with a header row naming the columns; NDJSON input holds
+    one object per line, as written by the exports. Unknown columns, such as
+    the `id` of exported rows, are ignored.
+
+    Parameters:
+        kind (str): "events" or "users".
+        chunks (AsyncIterable[bytes]): The UTF-8 encoded input, in chunks of any size.
+        input_format (str): "csv" or "ndjson".
+        batch_size (Optional[int]): The number of rows inserted per transaction.
+            Defaults to `IMPORT_BATCH_SIZE`.
+        progress (Optional[Callable]): Called with the report after each committed batch.
+
+    Returns:
+        ImportReport: The outcome of the import. If the input is malformed or an insert
+                      fails, the import stops, `completed` is false and the batches
+                      committed until then are kept.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    validate = _event_values if kind == "events" else _user_values
+    report = ImportReport(message="", completed=False)
+    started = time.perf_counter()
+    inserting = None
+
+    async def flush():
+        nonlocal inserting
+        task, inserting = inserting, None
+        if task:
+            report.imported += await task
+            report.batches += 1
+            report.elapsed_s = time.perf_counter() - started
+            report.rows_per_s = report.rows / report.elapsed_s
+            if progress:
+                progress(report)
+
+    error = None
+    try:
+        batch = []
+        async for rows in _read_rows(chunks, input_format):
+            for line, row in rows:
+                report.rows += 1
+                values, message = validate(row)
+                if values is None:
+                    report.rejected += 1
+                    if len(report.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                        report.errors.append(ImportRowError(line=line, message=message))
+                    continue
+                batch.append(values)
+                if len(batch) == batch_size:
+                    await flush()
+                    inserting = asyncio.create_task(_insert_batch(kind, batch))
+                    batch = []
+        await flush()
+        if batch:
+            inserting = asyncio.create_task(_insert_batch(kind, batch))
+    except Exception as e:
+        error = e
+    try:
+        await flush()
+    except Exception as e:
+        error = error or e
+
+    report.elapsed_s = time.perf_counter() - started
+    report.rows_per_s = report.rows / report.elapsed_s if report.elapsed_s else 0.0
+    report.completed = error is None
+    if error is None:
+        report.message = f"Imported {report.imported} {kind}, rejected {report.rejected}"
+    else:
+        report.message = f"Import stopped after {report.rows} rows: {error}"
+    logger.info(
+        "%s in %d batches, %.0f rows/s", report.message, report.batches, report.rows_per_s
+    )
+    return report
+
+
+async def _read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[tuple[int, str]]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    text, number = "", 0
+    async for chunk in chunks:
+        *lines, text = (text + decoder.decode(chunk)).split("\n")
+        if len(text) > settings.IMPORT_MAX_RECORD_LENGTH:
+            raise ValueError(
+                f"line {number + len(lines) + 1} is longer than "
+                f"{settings.IMPORT_MAX_RECORD_LENGTH} characters"
+            )
+        yield list(enumerate(lines, start=number + 1))
+        number += len(lines)
+    text += decoder.decode(b"", final=True)
+    if text:
+        yield [(number + 1, text)]
+
+
+async def _read_rows(
+    chunks: AsyncIterable[bytes], input_format: str
+) -> AsyncIterator[list[tuple[int, object]]]:
+    # Yields (line, row) pairs per chunk; a row is a dict, or an error message.
+    if input_format == "ndjson":
+        async for lines in _read_lines(chunks):
+            yield [(number, _json_object(text)) for number, text in lines if text.strip()]
+        return
+
+    header, pending, start, quotes, length = None, [], 0, 0, 0
+    async for lines in _read_lines(chunks):
+        records = []
+        for number, text in lines:
+            if not pending:
+                start = number
+            pending.append(text)
+            length += len(text)
+            # A quoted field holding newlines leaves an odd number of quotes on its first line.
+            quotes += text.count('"')
+            if quotes % 2:
+                if length > settings.IMPORT_MAX_RECORD_LENGTH:
+                    raise ValueError(
+                        f"record starting on line {start} is longer than "
+                        f"{settings.IMPORT_MAX_RECORD_LENGTH} characters"
+                    )
+                continue
+            records.append((start, "\n".join(pending)))
+            pending, quotes, length = [], 0, 0
+
+        rows = []
+        for (number, _), fields in zip(records, csv.reader(record for _, record in records)):
+            if not fields:
+                continue
+            if header is None:
+                header = [field.strip() for field in fields]
+            elif len(fields) != len(header):
+                rows.append((number, f"Expected {len(header)} fields, found {len(fields)}"))
+            else:
+                rows.append((number, dict(zip(header, fields))))
+        yield rows
+
+    if pending:
+        raise ValueError(f"unterminated quoted field on line {start}")
+
+
+def _json_object(text: str):
+    try:
+        row = json.loads(text)
+    except ValueError:
+        return "Invalid JSON"
+    return row if isinstance(row, dict) else "Row is not a JSON object"
+
+
+def _event_values(row) -> tuple[Optional[dict], str]:
+    if isinstance(row, str):
+        return None, row
+    try:
+        name = _str_field(row, "name")
+        description = row.get("description") or ""
+        if not isinstance(description, str):
+            raise ValueError("description must be a string")
+        date_time = row.get("date_time")
+        try:
+            date_time = datetime.fromisoformat(date_time)
+        except (TypeError, ValueError):
+            raise ValueError("date_time must be an ISO 8601 date and time")
+        if date_time.tzinfo:
+            date_time = date_time.astimezone(timezone.utc).replace(tzinfo=None)
+        tickets_total = _int_field(row, "tickets_total")
+        tickets_available = (
+            tickets_total
+            if row.get("tickets_available") in (None, "")
+            else _int_field(row, "tickets_available")
+        )
+    except ValueError as e:
+        return None, str(e)
+    if not 0 <= tickets_available <= tickets_total:
+        return None, "tickets_available must be between 0 and tickets_total"
+
+    return {
+        "name": name,
+        "description": description,
+        "date_time": date_time,
+        "tickets_total": tickets_total,
+        "tickets_available": tickets_available,
+        "inventory_slots": 0,
+        "deleting": False,
+    }, ""
+
+
+def _user_values(row) -> tuple[Optional[dict], str]:
+    if isinstance(row, str):
+        return None, row
+    try:
+        return {"name": _str_field(row, "name")}, ""
+    except ValueError as e:
+        return None, str(e)
+
+
+def _str_field(row: dict, name: str) -> str:
+    value = row.get(name)
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{name} is required")
+    return value
+
+
+def _int_field(row: dict, name: str) -> int:
+    value = row.get(name)
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            pass
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value
+
+
+async def _insert_batch(kind: str, rows: list[dict]) -> int:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            if kind == "users":
+                await session.execute(insert(User), rows)
+                return len(rows)
+
+            result = await session.execute(select(func.coalesce(func.max(Event.id), 0)))
+            last_id = result.scalar_one()
+            await session.execute(insert(Event), rows)
+            # Events created meanwhile are either invisible to this transaction or
+            # committed with their snapshot, so only this batch's events lack one.
+            await session.execute(
+                insert(InventorySnapshot).from_select(
+                    ["event_id", "ledger_id", "tickets_available", "created_at"],
+                    select(
+                        Event.id,
+                        literal(0),
+                        Event.tickets_available,
+                        literal(datetime.utcnow()),
+                    ).where(
+                        Event.id > last_id,
+                        ~exists().where(InventorySnapshot.event_id == Event.id),
+                    ),
+                )
+            )
+    invalidate_event()
+    return len(rows)
@@ -0,0 +1,274 @@
+import random
+from typing import Optional
+from sqlalchemy import delete, false, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from ..models.event import Event
+from ..models.inventory_slot import InventorySlot
+from ..models.ledger_entry import LedgerEntry
+
+
+async def get_inventory_slots(session: AsyncSession, event_id: int) -> Optional[int]:
+    """
+    Read how many counter slots an event's inventory is split across.
+
+    This is a plain, non-locking primary key read, so it never waits on or blocks
+    concurrent purchases.
+
+    Parameters:
+        session (AsyncSession): The session to read with.
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        Optional[int]: The number of slots (0 for an unsharded event), or None if the
+                       event does not exist or is being deleted.
+    """
+    result = await session.execute(
+        select(Event.inventory_slots).where(Event.id == event_id, Event.deleting == false())
+    )
+    return result.scalar_one_or_none()
+
+
+async def reserve_tickets(
+    session: AsyncSession, event_id: int, quantity: int, kind: str = "reserve"
+) -> bool:
+    """
+    Atomically take tickets from an event's inventory.
+
+    For an unsharded event the availability check and the decrement are a single
+    conditional `UPDATE event SET tickets_available = tickets_available - :n
+    WHERE id = :id AND tickets_available >= :n`, so concurrent buyers can never
+    drive the counter below zero and the event row is only locked for the
+    duration of that one statement. For a sharded event the same conditional
+    decrement is applied to a randomly picked slot, falling back to a rebalance
+    of the event's slots when that slot cannot cover the request.
+
+    A successful decrement appends a `-quantity` entry to the reservation ledger.
+    The ledger is an audit log written alongside the counter, not a source of
+    truth: availability is always decided by the counter, and the ledger is only
+    read to audit it and to rebuild it after an incident.
+
+    Parameters:
+        session (AsyncSession): The session whose transaction the decrement joins.
+        event_id (int): The unique identifier of the event.
+        quantity (int): The number of tickets to take.
+        kind (str): The ledger entry kind recording the change.
+
+    Returns:
+        bool: True if the tickets were taken, False if the event does not exist, is
+              being deleted or does not have enough tickets left.
+    """
+    inventory_slots = await get_inventory_slots(session, event_id)
+    if inventory_slots is None:
+        return False
+    if inventory_slots:
+        reserved = await _reserve_from_slots(session, event_id, inventory_slots, quantity)
+    else:
+        # The inventory_slots and deleting guards make a request that raced with the
+        # event being sharded or deleted fail closed instead of using a stale counter.
+        result = await session.execute(
+            update(Event)
+            .where(
+                Event.id == event_id,
+                Event.inventory_slots == 0,
+                Event.deleting == false(),
+                Event.tickets_available >= quantity,
+            )
+            .values(tickets_available=Event.tickets_available - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        reserved = result.rowcount == 1
+
+    if reserved:
+        session.add(LedgerEntry(event_id=event_id, kind=kind, delta=-quantity))
+    return reserved
+
+
+async def release_tickets(
+    session: AsyncSession, event_id: int, quantity: int, kind: str = "cancel"
+) -> bool:
+    """
+    Atomically return tickets to an event's inventory.
+
+    A successful increment appends a `+quantity` entry to the reservation ledger,
+    which, as in `reserve_tickets`, is an audit log of the counter.
+
+    Parameters:
+        session (AsyncSession): The session whose transaction the increment joins.
+        event_id (int): The unique identifier of the event.
+        quantity (int): The number of tickets to return.
+        kind (str): The ledger entry kind recording the change.
+
+    Returns:
+        bool: True if the tickets were returned, False if the event does not exist or
+              is being deleted.
+    """
+    inventory_slots = await get_inventory_slots(session, event_id)
+    if inventory_slots is None:
+        return False
+    if inventory_slots:
+        statement = update(InventorySlot).where(
+            InventorySlot.event_id == event_id,
+            InventorySlot.slot == random.randrange(inventory_slots),
+        ).values(tickets_available=InventorySlot.tickets_available + quantity)
+    else:
+        statement = update(Event).where(
+            Event.id == event_id, Event.deleting == false()
+        ).values(tickets_available=Event.tickets_available + quantity)
+    result = await session.execute(
+        statement.execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    session.add(LedgerEntry(event_id=event_id, kind=kind, delta=quantity))
+    return True
+
+
+async def get_tickets_available(session: AsyncSession, event_id: int) -> Optional[int]:
+    """
+    Read the number of tickets still available for an event.
+
+    This is a plain, non-locking read and is meant for building error messages
+    after a conditional update has been rejected, not for deciding whether to book.
+
+    Parameters:
+        session (AsyncSession): The session to read with.
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        Optional[int]: The number of available tickets, or None if the event does not exist.
+    """
+    result = await session.execute(
+        select(Event.tickets_available, Event.inventory_slots).where(
+            Event.id == event_id
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    if not row.inventory_slots:
+        return row.tickets_available
+    return await _sum_slots(session, event_id)
+
+
+async def get_sharded_availability(session: AsyncSession, event_ids: list[int]) -> dict[int, int]:
+    """
+    Sum the slots of sharded events in one query.
+
+    Parameters:
+        session (AsyncSession): The session to read with.
+        event_ids (list[int]): The sharded events to sum.
+
+    Returns:
+        dict: The available tickets of each event, by event ID.
+    """
+    if not event_ids:
+        return {}
+
+    result = await session.execute(
+        select(InventorySlot.event_id, func.sum(InventorySlot.tickets_available))
+        .where(InventorySlot.event_id.in_(event_ids))
+        .group_by(InventorySlot.event_id)
+    )
+    return {event_id: int(tickets_available) for event_id, tickets_available in result}
+
+
+async def resize_inventory_slots(session: AsyncSession, event: Event, slots: int):
+    """
+    Split an event's remaining inventory across `slots` counter slots, or fold it
+    back into the single `tickets_available` counter when `slots` is 0.
+
+    The event row and all of its existing slots are locked for the duration of the
+    transaction, so no ticket is lost or double counted while the layout changes.
+
+    Parameters:
+        session (AsyncSession): The session whose transaction the resize joins.
+        event (Event): The event to resize. It must belong to `session`.
+        slots (int): The new number of slots.
+    """
+    await session.refresh(event, with_for_update=True)
+    if event.inventory_slots:
+        tickets_available = await _sum_slots(session, event.id, lock=True)
+        await session.execute(
+            delete(InventorySlot).where(InventorySlot.event_id == event.id)
+        )
+    else:
+        tickets_available = event.tickets_available
+
+    if slots:
+        share, extra = divmod(tickets_available, slots)
+        session.add_all(
+            InventorySlot(
+                event_id=event.id,
+                slot=slot,
+                tickets_available=share + (1 if slot < extra else 0),
+            )
+            for slot in range(slots)
+        )
+
+    event.inventory_slots = slots
+    event.tickets_available = tickets_available
+
+
+async def _reserve_from_slots(
+    session: AsyncSession, event_id: int, inventory_slots: int, quantity: int
+) -> bool:
+    result = await session.execute(
+        update(InventorySlot)
+        .where(
+            InventorySlot.event_id == event_id,
+            InventorySlot.slot == random.randrange(inventory_slots),
+            InventorySlot.tickets_available >= quantity,
+        )
+        .values(tickets_available=InventorySlot.tickets_available - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        return True
+
+    # Skip the locking rebalance when the event as a whole is already sold out.
+    if await _sum_slots(session, event_id) < quantity:
+        return False
+    return await _rebalance_slots(session, event_id, quantity)
+
+
+async def _rebalance_slots(session: AsyncSession, event_id: int, quantity: int) -> bool:
+    """
+    Take `quantity` tickets from a sharded event whose picked slot ran dry and
+    spread what is left evenly across all of its slots again.
+    """
+    result = await session.execute(
+        select(InventorySlot)
+        .where(InventorySlot.event_id == event_id)
+        .order_by(InventorySlot.slot)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    slots = result.scalars().all()
+    tickets_available = sum(slot.tickets_available for slot in slots)
+    if not slots or tickets_available < quantity:
+        return False
+
+    tickets_available -= quantity
+    share, extra = divmod(tickets_available, len(slots))
+    for index, slot in enumerate(slots):
+        slot.tickets_available = share + (1 if index < extra else 0)
+
+    await session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(tickets_available=tickets_available)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+
+async def _sum_slots(session: AsyncSession, event_id: int, lock: bool = False) -> int:
+    statement = select(InventorySlot.tickets_available).where(
+        InventorySlot.event_id == event_id
+    )
+    if lock:
+        statement = statement.with_for_update()
+    result = await session.execute(statement)
+    return sum(result.scalars().all())
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from ..models.event import Event
+from ..models.inventory_snapshot import InventorySnapshot
+from ..models.ledger_entry import LedgerEntry
+from ..database import AsyncSessionLocal, ReadSessionLocal
+from .event_service import invalidate_event
+from .inventory import resize_inventory_slots, _sum_slots
+from .pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+
+async def get_ledger_entries(
+    event_id: int, limit: Optional[int] = None, after: Optional[int] = None
+):
+    """
+    Fetch an event's reservation ledger, oldest entry first, optionally paginated by ID.
+
+    The ledger is an audit log of the inventory counters: it is appended to in the
+    same transaction as every counter change, but reservations never read it.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+        limit (Optional[int]): The maximum number of entries to return. None returns all of them.
+        after (Optional[int]): Only return entries with an ID greater than this cursor.
+
+    Returns:
+        tuple: A tuple containing a list of LedgerEntry objects and a success message,
+               or None and an error message if no entries are found.
+    """
+    async with ReadSessionLocal() as session:
+        async with session.begin():
+            result = await session.execute(
+                paginate(
+                    select(LedgerEntry).where(LedgerEntry.event_id == event_id),
+                    LedgerEntry.id,
+                    limit,
+                    after,
+                )
+            )
+            entries = result.scalars().all()
+            if not entries:
+                return None, f"No ledger entries found for event {event_id}"
+
+            return entries, f"Ledger entries found for event {event_id}"
+
+
+async def replay_ledger(
+    session: AsyncSession, event_id: int, snapshot: InventorySnapshot
+) -> tuple[int, int]:
+    """
+    Derive an event's availability from its snapshot and the ledger entries appended since.
+
+    Parameters:
+        session (AsyncSession): The session to read with.
+        event_id (int): The unique identifier of the event.
+        snapshot (InventorySnapshot): The event's latest snapshot.
+
+    Returns:
+        tuple: The ID of the last ledger entry replayed and the derived number of
+               available tickets.
+    """
+    result = await session.execute(
+        select(func.max(LedgerEntry.id), func.coalesce(func.sum(LedgerEntry.delta), 0))
+        .where(LedgerEntry.event_id == event_id, LedgerEntry.id > snapshot.ledger_id)
+    )
+    last_id, delta = result.one()
+    return last_id or snapshot.ledger_id, snapshot.tickets_available + int(delta)
+
+
+async def compact_ledger(event_id: int) -> tuple[Optional[InventorySnapshot], str]:
+    """
+    Fold an event's ledger tail into a new snapshot.
+
+    The event row and its inventory slots are locked first, so every transaction
+    that changed the inventory has committed its ledger entry before the tail is
+    read. The derived availability is compared with the live counter and any
+    drift is logged. Events created before the ledger existed have no snapshot;
+    their first one is taken from the live counter.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        tuple: A tuple containing the new InventorySnapshot and a success message,
+               or None and an error message if the event is not found.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event = await session.get(Event, event_id, with_for_update=True)
+            if not event:
+                return None, "Event not found"
+
+            tickets_available = await _lock_inventory(session, event)
+            snapshot = await session.get(InventorySnapshot, event_id)
+            if snapshot is None:
+                result = await session.execute(
+                    select(func.coalesce(func.max(LedgerEntry.id), 0))
+                    .where(LedgerEntry.event_id == event_id)
+                )
+                snapshot = InventorySnapshot(
+                    event_id=event_id,
+                    ledger_id=result.scalar_one(),
+                    tickets_available=tickets_available,
+                )
+                session.add(snapshot)
+            else:
+                ledger_id, derived = await replay_ledger(session, event_id, snapshot)
+                if derived != tickets_available:
+                    logger.warning(
+                        "Event %d ledger derives %d tickets available, counter has %d",
+                        event_id,
+                        derived,
+                        tickets_available,
+                    )
+                snapshot.ledger_id = ledger_id
+                snapshot.tickets_available = derived
+                snapshot.created_at = datetime.utcnow()
+
+        return snapshot, "Ledger compacted successfully"
+
+
+async def rebuild_inventory(event_id: int) -> tuple[Optional[int], str]:
+    """
+    Reset an event's inventory counter to the availability derived from its ledger.
+
+    This is the only path on which the ledger overrides the counter, which is
+    otherwise authoritative. Used to recover after an incident has left the
+    counter wrong. The event and its slots are locked while the ledger is
+    replayed and the counter rewritten, and a fresh snapshot is stored so the
+    next replay starts from here.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        tuple: A tuple containing the rebuilt number of available tickets and a success
+               message, or None and an error message if the event is not found or
+               has no ledger snapshot to replay from.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event = await session.get(Event, event_id, with_for_update=True)
+            if not event:
+                return None, "Event not found"
+
+            previous = await _lock_inventory(session, event)
+            snapshot = await session.get(InventorySnapshot, event_id)
+            if snapshot is None:
+                return None, f"Event {event_id} has no ledger snapshot to replay from"
+
+            snapshot.ledger_id, tickets_available = await replay_ledger(
+                session, event_id, snapshot
+            )
+            snapshot.tickets_available = tickets_available
+            snapshot.created_at = datetime.utcnow()
+
+            slots = event.inventory_slots
+            if slots:
+                await resize_inventory_slots(session, event, 0)
+            event.tickets_available = tickets_available
+            if slots:
+                await session.flush()
+                await resize_inventory_slots(session, event, slots)
+
+        invalidate_event(event_id)
+        logger.info(
+            "Rebuilt event %d inventory from its ledger: %d -> %d tickets available",
+            event_id,
+            previous,
+            tickets_available,
+        )
+        return tickets_available, "Inventory rebuilt from ledger successfully"
+
+
+async def compact_ledgers(min_entries: int) -> int:
+    """
+    Compact every event whose ledger tail has at least `min_entries` entries.
+
+    Parameters:
+        min_entries (int): The tail length at which an event is compacted.
+
+    Returns:
+        int: The number of events compacted.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(LedgerEntry.event_id)
+            .outerjoin(
+                InventorySnapshot, InventorySnapshot.event_id == LedgerEntry.event_id
+            )
+            .where(LedgerEntry.id > func.coalesce(InventorySnapshot.ledger_id, 0))
+            .group_by(LedgerEntry.event_id)
+            .having(func.count() >= min_entries)
+        )
+        event_ids = result.scalars().all()
+
+    for event_id in event_ids:
+        await compact_ledger(event_id)
+    return len(event_ids)
+
+
+async def run_ledger_compactor(interval: float, min_entries: int):
+    """
+    Compact long ledger tails every `interval` seconds until cancelled.
+
+    Parameters:
+        interval (float): The number of seconds between compaction passes.
+        min_entries (int): The tail length at which an event is compacted.
+    """
+    while True:
+        try:
+            compacted = await compact_ledgers(min_entries)
+            if compacted:
+                logger.info("Compacted the ledgers of %d events", compacted)
+        except Exception:
+            logger.exception("Failed to compact ledgers")
+        await asyncio.sleep(interval)
+
+
+async def _lock_inventory(session: AsyncSession, event: Event) -> int:
+    # The event row is already locked; lock the slots as well so no sharded
+    # reservation can commit a ledger entry while the caller reads the tail.
+    if event.inventory_slots:
+        return await _sum_slots(session, event.id, lock=True)
+    return event.tickets_available
@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy.sql import Select
+
+
+def paginate(statement: Select, id_column, limit: Optional[int], after: Optional[int]) -> Select:
+    """
+    Applies keyset pagination on `id_column` to a select statement.
+
+    Rows are returned in `id_column` order starting strictly after the cursor,
+    so with an index covering the statement's filters and `id_column` each page
+    costs O(limit) no matter how deep into the table it is, unlike OFFSET.
+
+    Parameters:
+        statement (Select): The statement to paginate, with any filters already applied.
+        id_column: The unique, indexed column to page on, usually the primary key.
+        limit (Optional[int]): The maximum number of rows in the page. None returns every row.
+        after (Optional[int]): The cursor, i.e. the `id_column` value of the last row of the
+            previous page. None starts from the beginning.
+
+    Returns:
+        Select: The paginated statement.
+    """
+    if after is not None:
+        statement = statement.where(id_column > after)
+    statement = statement.order_by(id_column)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def next_cursor(rows: list, limit: Optional[int]) -> Optional[int]:
+    """
+    Returns the cursor for the page after `rows`, or None if `rows` is the last page.
+
+    Parameters:
+        rows (list): The rows of the current page, each with an `id`.
+        limit (Optional[int]): The page size the rows were fetched with.
+
+    Returns:
+        Optional[int]: The `id` of the last row when the page is full, otherwise None.
+    """
+    if limit is None or len(rows) < limit:
+        return None
+    return rows[-1].id
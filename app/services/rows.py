@@ -0,0 +1,63 @@
+from collections import namedtuple
+from functools import partial
+from itertools import repeat
+from sqlalchemy import Result
+from sqlmodel import SQLModel, select
+from ..models.event import Event
+from ..models.reservation import Reservation
+from ..models.user import User
+
+
+def projection(model: type[SQLModel], *columns: str) -> type:
+    """
+    Build an immutable record type for read-only queries on a table model.
+
+    Records are named tuples holding only the given columns: no identity map,
+    change tracking or per-instance `__dict__`, so they are several times smaller
+    and cheaper to build than ORM instances. They expose the same attributes, so
+    routers can still return them through the model's `response_model`.
+
+    Parameters:
+        model (type[SQLModel]): The table model to read.
+        *columns (str): The columns to read, in order. Defaults to every column the
+            model exposes, leaving out fields declared with `exclude=True`.
+
+    Returns:
+        type: The record type, with the selected table columns as `columns`.
+    """
+    table_columns = model.__table__.columns
+    names = columns or tuple(
+        column.name for column in table_columns if not model.model_fields[column.name].exclude
+    )
+    record = namedtuple(f"{model.__name__}Row", names)
+    record.columns = tuple(table_columns[name] for name in names)
+    return record
+
+
+EventRow = projection(Event)
+ReservationRow = projection(Reservation)
+UserRow = projection(User)
+
+
+def select_records(record: type):
+    """
+    Select the columns of a record type, to be filtered and paginated like `select(model)`.
+    """
+    return select(*record.columns)
+
+
+def fetch_records(result: Result, record: type) -> list:
+    """
+    Build one record per row of a `select_records` result.
+    """
+    # tuple.__new__ skips the per-row Python call of record._make.
+    return list(map(partial(tuple.__new__, record), result))
+
+
+def record_dicts(records: list) -> list[dict]:
+    """
+    Turn records into dicts keyed by column name, for encoders that do not handle named tuples.
+    """
+    if not records:
+        return []
+    return list(map(dict, map(zip, repeat(records[0]._fields), records)))
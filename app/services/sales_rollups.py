@@ -0,0 +1,310 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select
+from ..models.event import Event
+from ..models.event_sales import EventSales
+from ..models.reservation import Reservation
+from ..models.rollup_state import RollupState
+from ..models.sales_delta import SalesDelta
+from ..models.sales_report import EventSalesSummary, SellThroughBucket
+from ..models.user_sales import UserSales
+from ..database import AsyncSessionLocal, ReadSessionLocal
+
+logger = logging.getLogger(__name__)
+
+SALES_ROLLUP = "sales"
+
+
+def sales_deltas(reservations: Iterable, sign: int = 1) -> list[SalesDelta]:
+    """
+    Build the sales deltas recording that a set of reservations was created or removed.
+
+    Tickets are summed per event and user, so a batch appends one delta per pair
+    however many of its reservations share it.
+
+    Parameters:
+        reservations (Iterable): Reservation objects or rows with `event_id`, `user_id`
+            and `tickets_reserved`.
+        sign (int): 1 for reservations that were created, -1 for ones that were removed.
+
+    Returns:
+        list: The SalesDelta objects to add to the session making the change.
+    """
+    tickets = defaultdict(int)
+    for reservation in reservations:
+        tickets[reservation.event_id, reservation.user_id] += reservation.tickets_reserved
+    return [
+        SalesDelta(event_id=event_id, user_id=user_id, tickets=sign * count)
+        for (event_id, user_id), count in tickets.items()
+    ]
+
+
+async def get_event_sales(event_id: int) -> tuple[Optional[EventSalesSummary], str]:
+    """
+    Summarise an event's sales from the sales rollups.
+
+    This is a primary key read of the event and its `event_sales` row, so its
+    cost does not depend on how many reservations the event has.
+
+    Parameters:
+        event_id (int): The unique identifier of the event.
+
+    Returns:
+        tuple: A tuple containing the EventSalesSummary and a success message,
+               or None and an error message if the event is not found.
+    """
+    async with ReadSessionLocal() as session:
+        async with session.begin():
+            result = await session.execute(
+                select(
+                    Event.id,
+                    Event.name,
+                    Event.date_time,
+                    Event.tickets_total,
+                    func.coalesce(EventSales.tickets_sold, 0),
+                )
+                .outerjoin(EventSales, EventSales.event_id == Event.id)
+                .where(Event.id == event_id)
+            )
+            row = result.one_or_none()
+            if row is None:
+                return None, "Event not found"
+
+            state = await session.get(RollupState, SALES_ROLLUP)
+            event_id, name, date_time, tickets_total, tickets_sold = row
+            return EventSalesSummary(
+                event_id=event_id,
+                name=name,
+                date_time=date_time,
+                tickets_total=tickets_total,
+                tickets_sold=tickets_sold,
+                sell_through=_ratio(tickets_sold, tickets_total),
+                refreshed_at=state.refreshed_at if state else None,
+            ), "Event sales found successfully"
+
+
+async def get_top_buyers(limit: int):
+    """
+    Fetch the users holding the most reserved tickets, from the sales rollups.
+
+    The users are read from the end of the `tickets_sold` index, so only `limit`
+    rows are touched.
+
+    Parameters:
+        limit (int): The number of users to return.
+
+    Returns:
+        tuple: A tuple containing a list of UserSales objects, most tickets first, and a
+               success message, or None and an error message if no user has reservations.
+    """
+    async with ReadSessionLocal() as session:
+        async with session.begin():
+            result = await session.execute(
+                select(UserSales)
+                .order_by(UserSales.tickets_sold.desc(), UserSales.user_id.desc())
+                .limit(limit)
+            )
+            buyers = result.scalars().all()
+            if not buyers:
+                return None, "No sales recorded"
+
+            return buyers, "Top buyers found successfully"
+
+
+async def get_sell_through(date_from: datetime, date_to: datetime):
+    """
+    Compute the sell-through of the events taking place in a date range, per day.
+
+    The events are found through the `date_time` index and joined with their
+    `event_sales` rows, so only the events in the range are read.
+
+    Parameters:
+        date_from (datetime): Only include events taking place at or after this time.
+        date_to (datetime): Only include events taking place at or before this time.
+
+    Returns:
+        tuple: A tuple containing a list of SellThroughBucket objects, in day order, and a
+               success message, or None and an error message if no events are in the range.
+    """
+    day = func.date(Event.date_time)
+    async with ReadSessionLocal() as session:
+        async with session.begin():
+            result = await session.execute(
+                select(
+                    day,
+                    func.count(Event.id),
+                    func.coalesce(func.sum(Event.tickets_total), 0),
+                    func.coalesce(func.sum(EventSales.tickets_sold), 0),
+                )
+                .outerjoin(EventSales, EventSales.event_id == Event.id)
+                .where(Event.date_time >= date_from, Event.date_time <= date_to)
+                .group_by(day)
+                .order_by(day)
+            )
+            buckets = [
+                SellThroughBucket(
+                    day=bucket_day,
+                    events=events,
+                    tickets_total=tickets_total,
+                    tickets_sold=tickets_sold,
+                    sell_through=_ratio(tickets_sold, tickets_total),
+                )
+                for bucket_day, events, tickets_total, tickets_sold in result.all()
+            ]
+            if not buckets:
+                return None, "No events found in the date range"
+
+            return buckets, "Sell-through computed successfully"
+
+
+async def refresh_sales_rollups(batch_size: int) -> int:
+    """
+    Fold pending sales deltas into the event and user rollups, `batch_size` deltas per transaction.
+
+    Each transaction locks the rollup state row, sums the oldest deltas per
+    event and per user, applies the sums to the rollup rows and deletes the
+    folded deltas by ID, so deltas committed out of ID order are never dropped.
+    Rollup rows that fall to zero are removed.
+
+    Parameters:
+        batch_size (int): The maximum number of deltas folded per transaction.
+
+    Returns:
+        int: The number of deltas folded.
+    """
+    folded = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                state = await _lock_state(session)
+                result = await session.execute(
+                    select(SalesDelta.id, SalesDelta.event_id, SalesDelta.user_id, SalesDelta.tickets)
+                    .order_by(SalesDelta.id)
+                    .limit(batch_size)
+                )
+                deltas = result.all()
+                if deltas:
+                    by_event, by_user = defaultdict(int), defaultdict(int)
+                    for delta in deltas:
+                        by_event[delta.event_id] += delta.tickets
+                        by_user[delta.user_id] += delta.tickets
+                    await _fold(session, EventSales, EventSales.event_id, by_event)
+                    await _fold(session, UserSales, UserSales.user_id, by_user)
+                    await session.execute(
+                        delete(SalesDelta)
+                        .where(SalesDelta.id.in_([delta.id for delta in deltas]))
+                        .execution_options(synchronize_session=False)
+                    )
+                state.refreshed_at = datetime.utcnow()
+
+        folded += len(deltas)
+        if len(deltas) < batch_size:
+            return folded
+
+
+async def rebuild_sales_rollups() -> tuple[dict, str]:
+    """
+    Recompute the sales rollups from the reservation table.
+
+    Used once to backfill the rollups for reservations made before they existed,
+    or to recover after an incident. Unlike the refresher this aggregates the
+    whole reservation table. The deltas read in the same snapshot as the
+    reservations are dropped, while ones committed afterwards are left for the
+    refresher, so no sale is counted twice or missed.
+
+    Returns:
+        tuple: A tuple containing the number of event and user rollup rows written and a
+               success message.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            state = await _lock_state(session)
+            result = await session.execute(select(SalesDelta.id))
+            delta_ids = result.scalars().all()
+            events = await session.execute(
+                select(Reservation.event_id, func.sum(Reservation.tickets_reserved))
+                .group_by(Reservation.event_id)
+            )
+            events = [
+                {"event_id": event_id, "tickets_sold": tickets}
+                for event_id, tickets in events.all()
+                if tickets
+            ]
+            users = await session.execute(
+                select(Reservation.user_id, func.sum(Reservation.tickets_reserved))
+                .group_by(Reservation.user_id)
+            )
+            users = [
+                {"user_id": user_id, "tickets_sold": tickets}
+                for user_id, tickets in users.all()
+                if tickets
+            ]
+
+            await session.execute(delete(EventSales))
+            await session.execute(delete(UserSales))
+            if delta_ids:
+                await session.execute(
+                    delete(SalesDelta)
+                    .where(SalesDelta.id.in_(delta_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            if events:
+                await session.execute(insert(EventSales), events)
+            if users:
+                await session.execute(insert(UserSales), users)
+            state.refreshed_at = datetime.utcnow()
+
+    logger.info(
+        "Rebuilt sales rollups for %d events and %d users", len(events), len(users)
+    )
+    return {"events": len(events), "users": len(users)}, "Sales rollups rebuilt successfully"
+
+
+async def run_sales_rollup_refresher(interval: float, batch_size: int):
+    """
+    Fold pending sales deltas into the rollups every `interval` seconds until cancelled.
+
+    Parameters:
+        interval (float): The number of seconds between refreshes.
+        batch_size (int): The maximum number of deltas folded per transaction.
+    """
+    while True:
+        try:
+            await refresh_sales_rollups(batch_size)
+        except Exception:
+            logger.exception("Failed to refresh sales rollups")
+        await asyncio.sleep(interval)
+
+
+async def _lock_state(session: AsyncSession) -> RollupState:
+    state = await session.get(RollupState, SALES_ROLLUP, with_for_update=True)
+    if state is None:
+        # Two workers creating it at once make one refresh fail; the next one succeeds.
+        state = RollupState(name=SALES_ROLLUP)
+        session.add(state)
+        await session.flush()
+    return state
+
+
+async def _fold(
+    session: AsyncSession, model: type[SQLModel], key, totals: dict[int, int]
+):
+    result = await session.execute(select(model).where(key.in_(totals)))
+    for row in result.scalars().all():
+        row.tickets_sold += totals.pop(getattr(row, key.name))
+        if row.tickets_sold == 0:
+            await session.delete(row)
+    session.add_all(
+        model(**{key.name: id_, "tickets_sold": tickets})
+        for id_, tickets in totals.items()
+        if tickets
+    )
+
+
+def _ratio(sold: int, total: int) -> float:
+    return sold / total if total else 0.0
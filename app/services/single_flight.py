@@ -0,0 +1,107 @@
+import asyncio
+import inspect
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Hashable
+from config.settings import settings
+from ..database import primary_pinned
+from .cache import TTLCache
+
+_MISSING = object()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls of read functions into one call.
+
+    The first call for a key runs in its own task; calls with the same key that
+    arrive while it runs await that task instead of querying again, and all of
+    them get its result or exception. A caller that is cancelled, for example
+    by its client disconnecting, does not cancel the call for the others. With
+    a TTL, results are also kept for that many seconds and returned to later
+    calls, so a read is served at most once per TTL.
+
+    Results are shared between callers and must not be mutated; the services'
+    read functions return immutable records.
+
+    Attributes:
+        results (TTLCache): The retained results by key. A TTL of 0 keeps none.
+        calls (int): The number of calls that ran.
+        shared (int): The number of calls answered by a call that was already running.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.results = TTLCache(maxsize, ttl)
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result of `call()`, sharing it with every other call for `key`.
+        """
+        if self.results.ttl > 0:
+            result = self.results.get(key, _MISSING)
+            if result is not _MISSING:
+                return result
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.create_task(call())
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._finish, key))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def coalesce(self, function: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """
+        Wrap a read function so that identical concurrent calls share one call.
+
+        Calls are identical when they bind the same arguments, defaults included.
+        Calls made while reads are pinned to the primary for read-your-writes run
+        on their own, since a read that started before the client's write, or a
+        result retained from before it, must not answer them.
+        """
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        async def coalesced(*args, **kwargs):
+            if primary_pinned.get():
+                return await function(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (function, *bound.arguments.values())
+            return await self.do(key, partial(function, *args, **kwargs))
+
+        return coalesced
+
+    def clear(self):
+        """
+        Drop every retained result. Calls already running are still shared.
+        """
+        self.results.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the call counters and the number of calls running and results retained.
+        """
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._in_flight),
+            "retained": self.results.stats()["size"],
+        }
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieving the exception also keeps it from being logged as never retrieved
+        # when every caller was cancelled.
+        if not task.cancelled() and task.exception() is None:
+            self.results.set(key, task.result())
+
+
+# Shared by the event, user and reservation read functions.
+service_reads = SingleFlight(settings.SINGLE_FLIGHT_TTL_S, settings.SINGLE_FLIGHT_MAX_ENTRIES)
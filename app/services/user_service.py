@@ -1,29 +1,50 @@
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import delete, false, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
+from config.settings import settings
+from ..models.event import Event
+from ..models.hold import Hold
+from ..models.ledger_entry import LedgerEntry
 from ..models.user import User
 from ..models.reservation import Reservation
-from ..models.event import Event
-from ..database import AsyncSessionLocal
+from ..models.sales_delta import SalesDelta
+from ..database import AsyncSessionLocal, ReadSessionLocal
+from .hold_service import release_holds, apply_released_tickets
+from .inventory import release_tickets
+from .pagination import paginate
+from .rows import UserRow, fetch_records, select_records
+from .single_flight import service_reads
 
 
-async def get_all_users():
+@service_reads.coalesce
+async def get_all_users(limit: Optional[int] = None, after: Optional[int] = None):
     """
-    Fetch all users from the database.
+    Fetch users from the database, optionally paginated by ID.
+
+    Parameters:
+        limit (Optional[int]): The maximum number of users to return. None returns all of them.
+        after (Optional[int]): Only return users with an ID greater than this cursor.
 
     Returns:
-        tuple: A tuple containing a list of User objects and a success message,
+        tuple: A tuple containing a list of UserRow records and a success message,
                or None and an error message if no users are found.
     """
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         async with session.begin():
-            result = await session.execute(select(User))
-            users = result.scalars().all()
+            result = await session.execute(
+                paginate(select_records(UserRow), User.id, limit, after)
+            )
+            users = fetch_records(result, UserRow)
             if not users:
                 return None, "Users not found"
 
             return users, "Found users"
 
 
-async def get_user(user_id: int) -> tuple[User, str]:
+@service_reads.coalesce
+async def get_user(user_id: int) -> tuple[UserRow, str]:
     """
     Fetch a specific user by their user ID.
 
@@ -31,12 +52,15 @@ async def get_user(user_id: int) -> tuple[User, str]:
         user_id (int): The unique identifier of the user.
 
     Returns:
-        tuple: A tuple containing the User object and a success message,
+        tuple: A tuple containing the UserRow record and a success message,
                or None and an error message if the user is not found.
     """
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         async with session.begin():
-            user = await session.get(User, user_id)
+            result = await session.execute(
+                select_records(UserRow).where(User.id == user_id)
+            )
+            user = next(iter(fetch_records(result, UserRow)), None)
             if not user:
                 return None, f"User {user_id} not found"
 
@@ -67,6 +91,12 @@ async def delete_user(user_id: int) -> tuple[bool, str]:
     """
     Delete an existing user by their user ID.
 
+    The user's reservations are removed `CASCADE_DELETE_CHUNK_SIZE` at a time,
+    each chunk in its own short transaction: the chunk's tickets are returned to
+    their events with one aggregated `UPDATE` grouped by event, and the rows are
+    deleted with one `DELETE ... WHERE id IN (...)`. The last chunk, the user's
+    holds and the user itself are removed in the same transaction.
+
     Parameters:
         user_id (int): The unique identifier of the user to delete.
 
@@ -74,25 +104,90 @@ async def delete_user(user_id: int) -> tuple[bool, str]:
         tuple: A tuple indicating whether the deletion was successful,
                and a corresponding message.
     """
-    async with AsyncSessionLocal() as session:
-        async with session.begin():
-            user = await session.get(User, user_id)
-            if not user:
-                return False, f"User {user_id} not found"
-
-            reservations = await session.execute(
-                select(Reservation).where(Reservation.user_id == user_id)
-            )
-            reservations = reservations.scalars().all()
-
-            for reservation in reservations:
-                event = await session.get(Event, reservation.event_id)
-                if event:
-                    event.tickets_available += reservation.tickets_reserved
-                    await session.delete(reservation)
-
-            await session.delete(user)
-
-        await session.commit()
-
-        return True, f"User {user_id} deleted successfully"
+    chunk_size = settings.CASCADE_DELETE_CHUNK_SIZE
+    released = defaultdict(int)
+    while True:
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                user = await session.get(User, user_id)
+                if not user:
+                    apply_released_tickets(released)
+                    return False, f"User {user_id} not found"
+
+                result = await session.execute(
+                    select(Reservation.id)
+                    .where(Reservation.user_id == user_id)
+                    .order_by(Reservation.id)
+                    .limit(chunk_size)
+                    .with_for_update()
+                )
+                ids = result.scalars().all()
+                chunk_released = await _release_reservations(session, user_id, ids) if ids else {}
+
+                done = len(ids) < chunk_size
+                if done:
+                    holds = await session.execute(
+                        select(Hold).where(Hold.user_id == user_id).with_for_update()
+                    )
+                    holds = holds.scalars().all()
+                    if holds:
+                        for event_id, tickets in (await release_holds(session, holds)).items():
+                            chunk_released[event_id] = chunk_released.get(event_id, 0) + tickets
+
+                    await session.delete(user)
+
+        for event_id, tickets in chunk_released.items():
+            released[event_id] += tickets
+        if done:
+            break
+
+    apply_released_tickets(released)
+    return True, f"User {user_id} deleted successfully"
+
+
+async def _release_reservations(
+    session: AsyncSession, user_id: int, ids: list[int]
+) -> dict[int, int]:
+    # Sums the reservations' tickets per event once, in the database, then hands
+    # them back to every unsharded event with a single UPDATE ... FROM (subquery).
+    # Events being deleted get nothing back; their inventory is gone with them.
+    totals = (
+        select(
+            Reservation.event_id,
+            func.sum(Reservation.tickets_reserved).label("tickets"),
+        )
+        .where(Reservation.id.in_(ids))
+        .group_by(Reservation.event_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(totals.c.event_id, totals.c.tickets, Event.inventory_slots, Event.deleting)
+        .join(Event, Event.id == totals.c.event_id)
+        .order_by(totals.c.event_id)
+    )
+    rows = result.all()
+
+    await session.execute(
+        update(Event)
+        .where(
+            Event.id == totals.c.event_id,
+            Event.inventory_slots == 0,
+            Event.deleting == false(),
+        )
+        .values(tickets_available=Event.tickets_available + totals.c.tickets)
+        .execution_options(synchronize_session=False)
+    )
+    # Sharded events keep their stock in slots, which release_tickets knows how to fill.
+    for row in rows:
+        if not row.deleting and row.inventory_slots:
+            await release_tickets(session, row.event_id, row.tickets)
+        elif not row.deleting:
+            session.add(LedgerEntry(event_id=row.event_id, kind="cancel", delta=row.tickets))
+        session.add(SalesDelta(event_id=row.event_id, user_id=user_id, tickets=-row.tickets))
+
+    await session.execute(
+        delete(Reservation)
+        .where(Reservation.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    return {row.event_id: row.tickets for row in rows if not row.deleting}
@@ -0,0 +1,186 @@
+import itertools
+import math
+import secrets
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+from sortedcontainers import SortedDict
+from config.settings import settings
+from ..models.queue_ticket import QueueTicket
+
+
+class WaitingRoom(ABC):
+    """
+    A per-event FIFO queue that admits a bounded number of clients into the
+    reservation path at a time.
+
+    Clients join the queue for an event and receive a token. The first
+    `concurrency` live tokens of an event are admitted; everyone behind them polls
+    until they move up. Once `concurrency + max_queue` tokens are live for an
+    event, further joins are rejected so that the backlog, and with it tail
+    latency, stays bounded.
+
+    Implementations only have to provide the storage, so the in-process
+    `InMemoryWaitingRoom` can later be swapped for one backed by a shared store.
+
+    Attributes:
+        concurrency (int): The number of clients admitted per event at a time.
+        max_queue (int): The number of clients allowed to wait behind the admitted ones.
+        poll_interval (int): The expected seconds per admission round, used for Retry-After hints.
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, poll_interval: int):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.poll_interval = poll_interval
+
+    @abstractmethod
+    async def join(self, event_id: int) -> tuple[Optional[QueueTicket], str]:
+        """
+        Add a client to the end of an event's queue.
+
+        Parameters:
+            event_id (int): The unique identifier of the event.
+
+        Returns:
+            tuple: A tuple containing the new QueueTicket and a success message,
+                   or None and an error message if the queue is full.
+        """
+
+    @abstractmethod
+    async def status(self, token: str) -> tuple[Optional[QueueTicket], str]:
+        """
+        Look up a client's current place in the queue and mark it as still waiting.
+
+        Parameters:
+            token (str): The token returned by `join`.
+
+        Returns:
+            tuple: A tuple containing the QueueTicket and a success message,
+                   or None and an error message if the token is unknown or expired.
+        """
+
+    @abstractmethod
+    async def leave(self, token: str):
+        """
+        Remove a client from the queue, letting the next one in line move up.
+
+        Parameters:
+            token (str): The token returned by `join`.
+        """
+
+    def retry_after(self, position: int) -> int:
+        """
+        Estimate how many seconds a client at `position` should wait before retrying.
+
+        Parameters:
+            position (int): The client's position, or the queue length for a rejected join.
+
+        Returns:
+            int: The suggested delay in seconds, at least `poll_interval`.
+        """
+        rounds = math.ceil((position - self.concurrency + 1) / self.concurrency)
+        return self.poll_interval * max(rounds, 1)
+
+    def _ticket(self, token: str, event_id: int, position: int) -> QueueTicket:
+        return QueueTicket(
+            token=token,
+            event_id=event_id,
+            position=position,
+            admitted=position < self.concurrency,
+            retry_after=self.retry_after(position),
+        )
+
+
+class _Entry:
+    __slots__ = ("event_id", "seq", "last_seen")
+
+    def __init__(self, event_id: int, seq: int, last_seen: float):
+        self.event_id = event_id
+        self.seq = seq
+        self.last_seen = last_seen
+
+
+class InMemoryWaitingRoom(WaitingRoom):
+    """
+    A `WaitingRoom` kept in process memory.
+
+    Each event's queue is a `SortedDict` keyed by a global join sequence number, so
+    joins, leaves and position lookups are all O(log n). Tokens that have not been
+    polled for `token_ttl` seconds are treated as abandoned and dropped.
+
+    Attributes:
+        token_ttl (float): Seconds after the last poll before a token expires.
+    """
+
+    def __init__(
+        self, concurrency: int, max_queue: int, poll_interval: int, token_ttl: float
+    ):
+        super().__init__(concurrency, max_queue, poll_interval)
+        self.token_ttl = token_ttl
+        self._queues: dict[int, SortedDict] = {}
+        self._entries: dict[str, _Entry] = {}
+        self._last_expired: dict[int, float] = {}
+        self._seq = itertools.count()
+
+    async def join(self, event_id: int) -> tuple[Optional[QueueTicket], str]:
+        self._expire(event_id)
+        queue = self._queues.setdefault(event_id, SortedDict())
+        if len(queue) >= self.concurrency + self.max_queue:
+            return None, f"Waiting room for event {event_id} is full"
+
+        token = secrets.token_urlsafe(16)
+        seq = next(self._seq)
+        queue[seq] = token
+        self._entries[token] = _Entry(event_id, seq, time.monotonic())
+        return self._ticket(token, event_id, len(queue) - 1), "Joined waiting room"
+
+    async def status(self, token: str) -> tuple[Optional[QueueTicket], str]:
+        entry = self._entries.get(token)
+        if entry:
+            self._expire(entry.event_id)
+        if token not in self._entries:
+            return None, "Queue token not found or expired"
+
+        entry.last_seen = time.monotonic()
+        position = self._queues[entry.event_id].index(entry.seq)
+        return self._ticket(token, entry.event_id, position), "Found queue token"
+
+    async def leave(self, token: str):
+        entry = self._entries.pop(token, None)
+        if not entry:
+            return
+
+        queue = self._queues[entry.event_id]
+        del queue[entry.seq]
+        if not queue:
+            del self._queues[entry.event_id]
+            self._last_expired.pop(entry.event_id, None)
+
+    def _expire(self, event_id: int):
+        # Scanning a queue is O(n), so do it at most a few times per TTL.
+        now = time.monotonic()
+        if now - self._last_expired.get(event_id, -math.inf) < self.token_ttl / 4:
+            return
+        self._last_expired[event_id] = now
+
+        queue = self._queues.get(event_id)
+        if not queue:
+            return
+
+        deadline = now - self.token_ttl
+        for seq, token in list(queue.items()):
+            if self._entries[token].last_seen < deadline:
+                del self._entries[token]
+                del queue[seq]
+        if not queue:
+            del self._queues[event_id]
+            del self._last_expired[event_id]
+
+
+waiting_room: WaitingRoom = InMemoryWaitingRoom(
+    settings.WAITING_ROOM_CONCURRENCY,
+    settings.WAITING_ROOM_MAX_QUEUE,
+    settings.WAITING_ROOM_POLL_INTERVAL_S,
+    settings.WAITING_ROOM_TOKEN_TTL_S,
+)
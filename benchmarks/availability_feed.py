@@ -0,0 +1,120 @@
+"""
+Load test for the live availability feed.
+
+Opens `--subscribers` Server-Sent Events streams on one event against a running
+server, waits until every stream has received the current availability, makes
+one reservation and measures how long the update takes to reach each
+subscriber. Reports connect time and delivery latency percentiles.
+
+Start a single worker first, with enough file descriptors for the subscribers on
+both sides (e.g. `ulimit -n 65536`):
+
+    uvicorn app.main:app --workers 1
+
+then run from the repository root:
+
+    python -m benchmarks.availability_feed --url http://127.0.0.1:8000 --subscribers 10000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+
+import httpx
+
+
+async def subscribe(
+    url: httpx.URL,
+    event_id: int,
+    connected: asyncio.Queue,
+    expected: int,
+    triggered: asyncio.Event,
+    latencies: list[float],
+):
+    # A bare asyncio stream per subscriber: tens of thousands of httpx streams
+    # would measure the client's connection pool rather than the server.
+    reader, writer = await asyncio.open_connection(url.host, url.port)
+    writer.write(
+        f"GET /events/{event_id}/availability/stream HTTP/1.1\r\n"
+        f"Host: {url.host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    try:
+        while line := await reader.readline():
+            if not line.startswith(b"data: "):
+                continue
+
+            tickets_available = json.loads(line[len(b"data: "):]).get("tickets_available")
+            if not triggered.is_set():
+                connected.put_nowait(tickets_available)
+            elif tickets_available == expected:
+                latencies.append(time.perf_counter())
+                return
+    finally:
+        writer.close()
+
+
+def percentile(values: list[float], p: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        event = (await client.post("/events/", json={
+            "name": "benchmark availability feed",
+            "description": "availability_feed benchmark",
+            "date_time": datetime.now().isoformat(),
+            "tickets_total": 10,
+            "tickets_available": 10,
+        })).json()
+        user = (await client.post("/users/", json={"name": "benchmark feed"})).json()
+
+        connected = asyncio.Queue()
+        triggered = asyncio.Event()
+        latencies = []
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(
+                subscribe(client.base_url, event["id"], connected, 9, triggered, latencies)
+            )
+            for _ in range(args.subscribers)
+        ]
+        for _ in range(args.subscribers):
+            await asyncio.wait_for(connected.get(), args.timeout)
+        connect_elapsed = time.perf_counter() - started
+
+        triggered.set()
+        sent_at = time.perf_counter()
+        await client.post("/reservations/", json={
+            "user_id": user["id"], "event_id": event["id"], "tickets_reserved": 1,
+        })
+        done, pending = await asyncio.wait(tasks, timeout=args.timeout)
+        for task in pending:
+            task.cancel()
+
+        delays = sorted(received - sent_at for received in latencies)
+        print(
+            f"subscribers={args.subscribers} connect_s={connect_elapsed:.3f} "
+            f"delivered={len(delays)} failed={sum(1 for t in done if t.exception())} "
+            f"missing={len(pending)}"
+        )
+        if len(delays) >= 2:
+            print(
+                f"delivery_s p50={percentile(delays, 50):.3f} p95={percentile(delays, 95):.3f} "
+                f"p99={percentile(delays, 99):.3f} max={delays[-1]:.3f}"
+            )
+
+        await client.delete(f"/users/{user['id']}")
+        await client.delete(f"/events/{event['id']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
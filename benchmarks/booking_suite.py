@@ -0,0 +1,389 @@
+"""
+Load-test and benchmark suite for the booking hot path.
+
+Drives the HTTP API with `--concurrency` closed-loop clients through four
+scenarios, each seeded from `--seed` so runs are reproducible:
+
+- `flash_sale`: `--requests` one-ticket reservations against a single event
+  holding `--tickets` tickets;
+- `uniform`: the same number of reservations spread evenly at random over
+  `--events` events;
+- `browse`: read-heavy traffic (event listings, availability and users'
+  reservations) with one reservation in ten;
+- `mass_cancel`: `--requests` existing reservations cancelled concurrently.
+
+For each scenario it reports throughput, p50/p95/p99 latency and status codes,
+then checks every event against the database: no oversell (available tickets
+never negative, reserved tickets never above capacity), no undersell (a
+flash sale or oversubscribed event must sell out, a mass cancellation must
+return every ticket) and no lost or phantom writes (reserved tickets equal the
+acknowledged reservations).
+
+`--target inprocess` runs the app inside this process over `httpx.ASGITransport`.
+`--target live` starts the production server (`python -m app.server`) with
+`--workers` workers on `--port`, or uses the server at `--url`. Data is seeded and checked directly through the database the
+process is configured for, so a server given by `--url` must use the same one.
+Set `DATABASE_URL` to run without MySQL, e.g. against SQLite (which serializes
+writers, so keep `--concurrency` low there and expect lock timeouts as 500s):
+
+    DATABASE_URL=sqlite+aiosqlite:///benchmark.db python -m benchmarks.booking_suite
+
+`--save-baseline` writes the results to a JSON file, and `--compare` fails the
+run when throughput drops or p95 latency grows by more than `--max-regression`
+against such a file. The exit status is 1 on a regression or a consistency
+failure, so the suite can gate changes to `booking_service`:
+
+    python -m benchmarks.booking_suite --save-baseline baseline.json
+    python -m benchmarks.booking_suite --compare baseline.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.database import DATABASE_URL, AsyncSessionLocal, close_db, engine
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.booking_service import create_reservations_bulk
+from app.services.event_service import create_event
+from app.services.inventory import get_tickets_available
+from app.services.user_service import create_user
+
+SCENARIOS = ("flash_sale", "uniform", "browse", "mass_cancel")
+
+# A planned request: method, path and JSON body.
+Request = tuple[str, str, Optional[dict]]
+
+
+async def seed(events: int, tickets: int, users: int) -> tuple[list[int], list[int]]:
+    event_ids = []
+    for index in range(events):
+        event, _ = await create_event(Event(
+            name=f"benchmark event {index}",
+            description="booking_suite benchmark",
+            date_time=datetime.now(),
+            tickets_total=tickets,
+            tickets_available=tickets,
+        ))
+        event_ids.append(event.id)
+
+    user_ids = []
+    for index in range(users):
+        user, _ = await create_user(User(name=f"benchmark user {index}"))
+        user_ids.append(user.id)
+    return event_ids, user_ids
+
+
+async def check_consistency(
+    event_ids: list[int], tickets: int, acknowledged: Counter, sold_out: bool
+) -> list[str]:
+    """
+    Compare each event's inventory and reservations with what the clients were told.
+
+    Parameters:
+        event_ids (list[int]): The events to check.
+        tickets (int): The capacity of each event.
+        acknowledged (Counter): Tickets per event the clients hold, from acknowledged writes.
+        sold_out (bool): Whether every event had more demand than tickets.
+
+    Returns:
+        list[str]: One message per violation, empty if the events are consistent.
+    """
+    violations = []
+    async with AsyncSessionLocal() as session:
+        reserved_by_event = dict((await session.execute(
+            select(Reservation.event_id, func.sum(Reservation.tickets_reserved))
+            .where(Reservation.event_id.in_(event_ids))
+            .group_by(Reservation.event_id)
+        )).all())
+        for event_id in event_ids:
+            available = await get_tickets_available(session, event_id)
+            reserved = int(reserved_by_event.get(event_id) or 0)
+            if available < 0 or reserved > tickets:
+                violations.append(
+                    f"event {event_id}: oversold, {reserved} reserved and {available} available of {tickets}"
+                )
+            if reserved + available != tickets:
+                violations.append(
+                    f"event {event_id}: {reserved} reserved + {available} available != {tickets}"
+                )
+            if reserved != acknowledged[event_id]:
+                violations.append(
+                    f"event {event_id}: {reserved} reserved but {acknowledged[event_id]} acknowledged"
+                )
+            if sold_out and available:
+                violations.append(f"event {event_id}: undersold, {available} left with demand remaining")
+    return violations
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    plan: list[Request],
+    concurrency: int,
+    on_response: Callable[[Request, httpx.Response], None],
+) -> tuple[float, list[float], Counter]:
+    """
+    Send the planned requests from `concurrency` closed-loop clients.
+
+    Returns:
+        tuple: The elapsed time in seconds, each request's latency in seconds,
+               and the count of each status code.
+    """
+    latencies = []
+    statuses = Counter()
+    requests = iter(plan)
+
+    async def worker():
+        for request in requests:
+            method, path, body = request
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            on_response(request, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+async def run_scenario(
+    name: str, client: httpx.AsyncClient, args: argparse.Namespace
+) -> dict:
+    rng = random.Random(f"{args.seed}:{name}")
+    events = 1 if name == "flash_sale" else args.events
+    event_ids, user_ids = await seed(events, args.tickets, args.users)
+    acknowledged = Counter()
+
+    def reservation(event_id: int) -> Request:
+        return "POST", "/reservations/", {
+            "user_id": rng.choice(user_ids), "event_id": event_id, "tickets_reserved": 1,
+        }
+
+    if name == "mass_cancel":
+        created, _ = await create_reservations_bulk(
+            [
+                Reservation(
+                    user_id=rng.choice(user_ids),
+                    event_id=event_ids[index % events],
+                    tickets_reserved=1,
+                )
+                for index in range(min(args.requests, events * args.tickets))
+            ],
+            atomic=True,
+        )
+        for created_reservation, _ in created:
+            acknowledged[created_reservation.event_id] += 1
+        plan = [
+            ("DELETE", f"/reservations/{created_reservation.id}", None)
+            for created_reservation, _ in created
+        ]
+        rng.shuffle(plan)
+        event_by_path = {
+            f"/reservations/{created_reservation.id}": created_reservation.event_id
+            for created_reservation, _ in created
+        }
+    elif name == "browse":
+        plan = []
+        for _ in range(args.requests):
+            roll = rng.random()
+            if roll < 0.1:
+                plan.append(reservation(rng.choice(event_ids)))
+            elif roll < 0.4:
+                plan.append(("GET", "/events/?limit=50", None))
+            elif roll < 0.8:
+                plan.append(("GET", f"/events/{rng.choice(event_ids)}/availability", None))
+            else:
+                plan.append(("GET", f"/users/{rng.choice(user_ids)}/reservations?limit=50", None))
+    else:
+        plan = [reservation(rng.choice(event_ids)) for _ in range(args.requests)]
+
+    def on_response(request: Request, response: httpx.Response):
+        method, path, body = request
+        if method == "POST" and response.status_code == 201:
+            acknowledged[body["event_id"]] += 1
+        elif method == "DELETE" and response.status_code == 204:
+            acknowledged[event_by_path[path]] -= 1
+
+    elapsed, latencies, statuses = await drive(client, plan, args.concurrency, on_response)
+
+    demand = Counter(body["event_id"] for method, _, body in plan if method == "POST")
+    sold_out = {
+        "flash_sale": True,
+        "uniform": all(demand[event_id] >= args.tickets for event_id in event_ids),
+        "browse": False,
+        "mass_cancel": False,
+    }[name]
+    violations = await check_consistency(event_ids, args.tickets, acknowledged, sold_out)
+
+    for user_id in user_ids:
+        await client.delete(f"/users/{user_id}")
+    for event_id in event_ids:
+        await client.delete(f"/events/{event_id}")
+
+    latencies.sort()
+    return {
+        "requests": len(plan),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(plan) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "statuses": {str(code): count for code, count in sorted(statuses.items(), key=str)},
+        "violations": violations,
+    }
+
+
+def percentile(values: list[float], p: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    List the scenarios whose throughput or p95 latency regressed beyond `max_regression`.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: throughput {result['throughput_rps']:.1f} rps, "
+                f"baseline {before['throughput_rps']:.1f} rps"
+            )
+        if result["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.1f} ms, baseline {before['p95_ms']:.1f} ms"
+            )
+    return regressions
+
+
+async def with_client(
+    args: argparse.Namespace, run: Callable[[httpx.AsyncClient], Awaitable[dict]]
+) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.target == "inprocess":
+        # ASGITransport does not send lifespan events, so run the app's lifespan here.
+        from app.main import app, app_lifespan
+
+        async with app_lifespan(app):
+            # Report unhandled errors as 500s, as a live server would.
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=args.timeout
+            ) as client:
+                return await run(client)
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+            env={**os.environ, "DATABASE_URL": DATABASE_URL},
+        )
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+            deadline = time.monotonic() + args.timeout
+            while True:
+                try:
+                    await client.get("/metrics/pool")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or (server and server.poll() is not None):
+                        raise
+                    await asyncio.sleep(0.2)
+            return await run(client)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--target", choices=("inprocess", "live"), default="inprocess")
+    parser.add_argument("--url", help="A running server to use with --target live")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    async def run(client: httpx.AsyncClient) -> dict:
+        results = {}
+        for name in args.scenarios:
+            results[name] = result = await run_scenario(name, client, args)
+            print(
+                f"{name:>11}: requests={result['requests']} "
+                f"rps={result['throughput_rps']:.1f} p50_ms={result['p50_ms']:.1f} "
+                f"p95_ms={result['p95_ms']:.1f} p99_ms={result['p99_ms']:.1f} "
+                f"statuses={result['statuses']} "
+                f"consistent={'yes' if not result['violations'] else 'NO'}"
+            )
+            for violation in result["violations"]:
+                print(f"{'':>13}{violation}")
+        return results
+
+    results = await with_client(args, run)
+    await close_db()
+    failed = any(result["violations"] for result in results.values())
+
+    parameters = {
+        name: getattr(args, name)
+        for name in ("requests", "concurrency", "events", "tickets", "users", "seed", "workers")
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if (baseline.get("target"), baseline.get("parameters")) != (args.target, parameters):
+            print(f"warning: {args.compare} was recorded with different parameters or target")
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        failed = failed or bool(regressions)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "target": args.target,
+                "database": engine.dialect.name,
+                "parameters": parameters,
+                "scenarios": results,
+            }, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
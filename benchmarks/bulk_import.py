@@ -0,0 +1,112 @@
+"""
+Throughput and memory of the streaming import versus one create call per row.
+
+Generates `--rows` events and as many users as NDJSON on the fly, so no file
+is held in memory, and imports them with `import_rows` in batches of
+`--batch-size`, once for each size in `--rows`. Reports rows per second and
+the peak memory allocated during the import, from `tracemalloc`; the peak
+should stay flat as the row count grows. Then creates `--baseline-rows`
+events and users with `create_event` and `create_user`, one transaction per
+row, for comparison.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.bulk_import --rows 100000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal, close_db, init_db
+from app.models.event import Event
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.user import User
+from app.services.event_service import create_event
+from app.services.import_service import import_rows
+from app.services.user_service import create_user
+
+BENCHMARK_NAME = "benchmark import"
+CHUNK_ROWS = 1000
+
+
+async def generate(kind: str, rows: int):
+    for start in range(0, rows, CHUNK_ROWS):
+        yield "".join(
+            json.dumps(
+                {
+                    "name": BENCHMARK_NAME,
+                    "description": "bulk_import benchmark",
+                    "date_time": "2031-01-01T10:00:00",
+                    "tickets_total": 100,
+                }
+                if kind == "events"
+                else {"name": BENCHMARK_NAME}
+            ) + "\n"
+            for _ in range(min(CHUNK_ROWS, rows - start))
+        ).encode()
+
+
+async def cleanup():
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event_ids = select(Event.id).where(Event.name == BENCHMARK_NAME)
+            await session.execute(
+                delete(InventorySnapshot).where(InventorySnapshot.event_id.in_(event_ids))
+            )
+            await session.execute(delete(Event).where(Event.name == BENCHMARK_NAME))
+            await session.execute(delete(User).where(User.name == BENCHMARK_NAME))
+
+
+async def per_row(kind: str, rows: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rows):
+        if kind == "events":
+            await create_event(Event(
+                name=BENCHMARK_NAME,
+                description="bulk_import benchmark",
+                date_time=datetime(2031, 1, 1, 10),
+                tickets_total=100,
+                tickets_available=100,
+            ))
+        else:
+            await create_user(User(name=BENCHMARK_NAME))
+    return rows / (time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--baseline-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    await init_db()
+    try:
+        for kind in ("events", "users"):
+            for rows in args.rows:
+                tracemalloc.start()
+                report = await import_rows(kind, generate(kind, rows), "ndjson", args.batch_size)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(
+                    f"{kind:>6} import: rows={report.imported} rows_per_s={report.rows_per_s:.0f} "
+                    f"peak_kib={peak / 1024:.0f}"
+                )
+                await cleanup()
+            rate = await per_row(kind, args.baseline_rows)
+            print(f"{kind:>6} per row: rows={args.baseline_rows} rows_per_s={rate:.0f}")
+            await cleanup()
+    finally:
+        await cleanup()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Throughput benchmark for bulk reservations.
+
+Creates the same set of reservations, spread across several events and users,
+three ways: one `create_reservation` call per reservation (what a group checkout
+or partner import has to do through POST /reservations/), and one
+`create_reservations_bulk` call per chunk in atomic and in best-effort mode.
+Reports reservations/sec for each.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.bulk_reservations --reservations 2000 --events 20 --chunk 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.booking_service import create_reservation, create_reservations_bulk
+from app.services.event_service import delete_event
+from app.services.user_service import delete_user
+
+
+async def setup(events: int, users: int, tickets: int) -> tuple[list[int], list[int]]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event_rows = [
+                Event(
+                    name=f"benchmark bulk {index}",
+                    description="bulk_reservations benchmark",
+                    date_time=datetime.now(),
+                    tickets_total=tickets,
+                    tickets_available=tickets,
+                )
+                for index in range(events)
+            ]
+            user_rows = [User(name=f"benchmark {index}") for index in range(users)]
+            session.add_all(event_rows + user_rows)
+    return [event.id for event in event_rows], [user.id for user in user_rows]
+
+
+async def teardown(event_ids: list[int], user_ids: list[int]):
+    # The services also remove the ledger entries and snapshots the run left behind.
+    for event_id in event_ids:
+        await delete_event(event_id)
+    for user_id in user_ids:
+        await delete_user(user_id)
+
+
+def make_reservations(count: int, event_ids: list[int], user_ids: list[int]) -> list[Reservation]:
+    rng = random.Random(0)
+    return [
+        Reservation(
+            user_id=rng.choice(user_ids),
+            event_id=rng.choice(event_ids),
+            tickets_reserved=1,
+        )
+        for _ in range(count)
+    ]
+
+
+async def one_by_one(reservations: list[Reservation], chunk: int) -> int:
+    created = 0
+    for reservation in reservations:
+        result, _ = await create_reservation(reservation)
+        created += result is not None
+    return created
+
+
+def bulk(atomic: bool):
+    async def run(reservations: list[Reservation], chunk: int) -> int:
+        created = 0
+        for start in range(0, len(reservations), chunk):
+            results, _ = await create_reservations_bulk(
+                reservations[start:start + chunk], atomic
+            )
+            created += sum(1 for reservation, _ in results if reservation)
+        return created
+
+    return run
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservations", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--chunk", type=int, default=500)
+    args = parser.parse_args()
+
+    await init_db()
+
+    for name, path in (
+        ("one_by_one", one_by_one),
+        ("bulk_atomic", bulk(atomic=True)),
+        ("bulk_best_effort", bulk(atomic=False)),
+    ):
+        event_ids, user_ids = await setup(args.events, args.users, args.reservations)
+        reservations = make_reservations(args.reservations, event_ids, user_ids)
+
+        started = time.perf_counter()
+        created = await path(reservations, args.chunk)
+        elapsed = time.perf_counter() - started
+
+        await teardown(event_ids, user_ids)
+        print(
+            f"{name:>16}: created={created} elapsed_s={elapsed:.3f} "
+            f"reservations_per_s={created / elapsed:.1f}"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
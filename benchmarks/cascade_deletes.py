@@ -0,0 +1,126 @@
+"""
+Benchmark for deleting events and users with many reservations.
+
+Seeds one event and one user sharing `--reservations` reservations, then deletes
+them two ways: the previous row-by-row cascade (one `session.delete`, and for
+users one inventory update, per reservation) and the set-based, chunked
+`delete_event` / `delete_user`. Reports the elapsed time of each. The
+set-based paths also write the ledger entries and sales deltas of the
+current schema, so they do strictly more work than the row-by-row paths,
+which reproduce the old code and write neither.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.cascade_deletes --reservations 100000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.event_service import delete_event
+from app.services.user_service import delete_user
+
+INSERT_CHUNK = 10000
+
+
+async def setup(reservations: int) -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event = Event(
+                name="benchmark cascade",
+                description="cascade_deletes benchmark",
+                date_time=datetime.now(),
+                tickets_total=reservations,
+                tickets_available=0,
+            )
+            user = User(name="benchmark cascade")
+            session.add_all([event, user])
+
+    row = {"user_id": user.id, "event_id": event.id, "tickets_reserved": 1}
+    for start in range(0, reservations, INSERT_CHUNK):
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(
+                    insert(Reservation),
+                    [row] * min(INSERT_CHUNK, reservations - start),
+                )
+    return event.id, user.id
+
+
+async def row_by_row_event(event_id: int, user_id: int):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            reservations = await session.execute(
+                select(Reservation).where(Reservation.event_id == event_id)
+            )
+            for reservation in reservations.scalars():
+                await session.delete(reservation)
+            await session.delete(await session.get(Event, event_id))
+            await session.delete(await session.get(User, user_id))
+
+
+async def row_by_row_user(event_id: int, user_id: int):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            reservations = await session.execute(
+                select(Reservation).where(Reservation.user_id == user_id)
+            )
+            # The original loop, reproduced as it was: it returned tickets through
+            # the ORM and appended no ledger entries, so none are timed here.
+            for reservation in reservations.scalars().all():
+                event = await session.get(Event, reservation.event_id)
+                if event:
+                    event.tickets_available += reservation.tickets_reserved
+                    await session.delete(reservation)
+            await session.delete(await session.get(User, user_id))
+            await session.delete(await session.get(Event, event_id))
+
+
+async def set_based_event(event_id: int, user_id: int):
+    await delete_event(event_id)
+    await delete_user(user_id)
+
+
+async def set_based_user(event_id: int, user_id: int):
+    await delete_user(user_id)
+    await delete_event(event_id)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservations", type=int, default=100000)
+    args = parser.parse_args()
+
+    await init_db()
+
+    for name, path in (
+        ("row_by_row_event", row_by_row_event),
+        ("set_based_event", set_based_event),
+        ("row_by_row_user", row_by_row_user),
+        ("set_based_user", set_based_user),
+    ):
+        event_id, user_id = await setup(args.reservations)
+
+        started = time.perf_counter()
+        await path(event_id, user_id)
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{name:>16}: reservations={args.reservations} elapsed_s={elapsed:.3f} "
+            f"rows_per_s={args.reservations / elapsed:.1f}"
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
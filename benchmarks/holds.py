@@ -0,0 +1,134 @@
+"""
+Throughput of checkout holds: creating, confirming and expiring them.
+
+Creates `--holds` holds spread over `--events` events from `--concurrency`
+concurrent callers and confirms half of them, reporting operations per
+second for each. The other half is expired and released twice: once with one
+`release_hold` call per hold, and once by the sweeper's
+`release_expired_holds` in batches of `--batch-size`. Reports holds released
+per second for both. SQLite allows one writer at a time, so use
+`--concurrency 1` against it.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.holds --holds 2000 --events 10 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal, close_db, init_db
+from app.models.event import Event
+from app.models.hold import Hold
+from app.models.user import User
+from app.services.event_service import delete_event
+from app.services.hold_service import (
+    confirm_hold,
+    create_hold,
+    release_expired_holds,
+    release_hold,
+)
+from app.services.user_service import delete_user
+
+BENCHMARK_NAME = "benchmark holds"
+
+
+async def setup(events: int, holds: int) -> tuple[list[int], int]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event_rows = [
+                Event(
+                    name=BENCHMARK_NAME,
+                    description="holds benchmark",
+                    date_time=datetime(2031, 1, 1),
+                    tickets_total=holds,
+                    tickets_available=holds,
+                )
+                for _ in range(events)
+            ]
+            user = User(name=BENCHMARK_NAME)
+            session.add_all(event_rows + [user])
+        return [event.id for event in event_rows], user.id
+
+
+async def run_concurrently(calls: list, concurrency: int) -> tuple[list, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run(call) for call in calls))
+    return results, time.perf_counter() - started
+
+
+async def create_holds(event_ids: list[int], user_id: int, count: int, concurrency: int):
+    calls = [
+        lambda index=index: create_hold(
+            Hold(user_id=user_id, event_id=event_ids[index % len(event_ids)], tickets_held=1)
+        )
+        for index in range(count)
+    ]
+    results, elapsed = await run_concurrently(calls, concurrency)
+    return [hold.id for hold, _ in results if hold], elapsed
+
+
+async def expire(hold_ids: list[int]):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(
+                update(Hold)
+                .where(Hold.id.in_(hold_ids))
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--holds", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    await init_db()
+    event_ids, user_id = await setup(args.events, args.holds)
+    try:
+        hold_ids, elapsed = await create_holds(event_ids, user_id, args.holds, args.concurrency)
+        print(f"        create: holds={len(hold_ids)} per_s={len(hold_ids) / elapsed:.0f}")
+
+        half = len(hold_ids) // 2
+        _, elapsed = await run_concurrently(
+            [lambda hold_id=hold_id: confirm_hold(hold_id) for hold_id in hold_ids[:half]],
+            args.concurrency,
+        )
+        print(f"       confirm: holds={half} per_s={half / elapsed:.0f}")
+
+        expired = hold_ids[half:]
+        await expire(expired)
+        _, elapsed = await run_concurrently(
+            [lambda hold_id=hold_id: release_hold(hold_id) for hold_id in expired],
+            args.concurrency,
+        )
+        print(f" release_hold: holds={len(expired)} per_s={len(expired) / elapsed:.0f}")
+
+        expired, _ = await create_holds(event_ids, user_id, len(expired), args.concurrency)
+        await expire(expired)
+        started = time.perf_counter()
+        released = await release_expired_holds(args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"         sweep: holds={released} per_s={released / elapsed:.0f}")
+    finally:
+        for event_id in event_ids:
+            await delete_event(event_id)
+        await delete_user(user_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Overhead benchmark for the request metrics middleware and SQL timing hooks.
+
+Measures two things separately and reports the added cost per request and per
+query in microseconds, taking the best of `--rounds` alternating runs to keep
+scheduler noise out of the difference:
+
+- `--requests` in-process requests to a trivial endpoint, on an app with and
+  without `RequestMetricsMiddleware`;
+- `--queries` `SELECT 1` round trips, on an engine with and without the
+  `instrument_engine` hooks.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.instrumentation_overhead --requests 20000 --queries 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import DATABASE_URL
+from app.instrumentation import (
+    RequestMetricsMiddleware,
+    RequestStats,
+    instrument_engine,
+    request_stats,
+)
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/ping/{item_id}")
+    async def ping(item_id: int):
+        return {"item_id": item_id}
+
+    return app
+
+
+async def time_requests(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        await client.get("/ping/0")
+        started = time.perf_counter()
+        for index in range(requests):
+            await client.get(f"/ping/{index}")
+        return time.perf_counter() - started
+
+
+async def time_queries(instrumented: bool, queries: int) -> float:
+    engine = create_async_engine(DATABASE_URL, pool_size=1)
+    if instrumented:
+        instrument_engine(engine)
+    token = request_stats.set(RequestStats())
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            started = time.perf_counter()
+            for _ in range(queries):
+                await conn.execute(text("SELECT 1"))
+            return time.perf_counter() - started
+    finally:
+        request_stats.reset(token)
+        await engine.dispose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    apps = {False: make_app(instrumented=False), True: make_app(instrumented=True)}
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(args.rounds):
+        for instrumented, app in apps.items():
+            elapsed = await time_requests(app, args.requests)
+            best[instrumented] = min(best[instrumented], elapsed)
+    bare, instrumented = best[False], best[True]
+    print(
+        f"{'middleware':>10}: bare_us={bare / args.requests * 1e6:.1f} "
+        f"instrumented_us={instrumented / args.requests * 1e6:.1f} "
+        f"overhead_us={(instrumented - bare) / args.requests * 1e6:.1f} per request"
+    )
+
+    best = {False: float("inf"), True: float("inf")}
+    for _ in range(args.rounds):
+        for instrumented in best:
+            elapsed = await time_queries(instrumented, args.queries)
+            best[instrumented] = min(best[instrumented], elapsed)
+    bare, instrumented = best[False], best[True]
+    print(
+        f"{'sql_hooks':>10}: bare_us={bare / args.queries * 1e6:.1f} "
+        f"instrumented_us={instrumented / args.queries * 1e6:.1f} "
+        f"overhead_us={(instrumented - bare) / args.queries * 1e6:.1f} per query"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
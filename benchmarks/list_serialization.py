@@ -0,0 +1,114 @@
+"""
+CPU cost of large list responses with and without `FAST_LIST_RESPONSES`.
+
+Seeds `--rows` events and as many reservations, then requests each full listing
+in-process `--repeat` times in both modes: ORM instances validated through the
+response model and encoded with the stdlib `json`, versus plain rows encoded
+with orjson. Reports CPU milliseconds of this process per response and the
+body size; against SQLite that includes the database engine's own work.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.list_serialization --rows 10000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy import delete, insert
+
+from app.database import AsyncSessionLocal, close_db, init_db
+from app.main import app
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.event_service import create_event, delete_event, invalidate_event
+from app.services.user_service import create_user, delete_user
+from config.settings import settings
+
+INSERT_CHUNK = 10000
+
+
+async def seed(rows: int) -> tuple[int, int]:
+    event, _ = await create_event(Event(
+        name="benchmark list 0",
+        description="list_serialization benchmark",
+        date_time=datetime.now(),
+        tickets_total=rows,
+        tickets_available=0,
+    ))
+    user, _ = await create_user(User(name="benchmark list"))
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            for start in range(0, rows, INSERT_CHUNK):
+                count = min(INSERT_CHUNK, rows - start)
+                await session.execute(insert(Event), [
+                    {
+                        "name": f"benchmark list {start + index + 1}",
+                        "description": "list_serialization benchmark",
+                        "date_time": datetime.now(),
+                        "tickets_total": 100,
+                        "tickets_available": 100,
+                        "inventory_slots": 0,
+                    }
+                    for index in range(count - 1 if start == 0 else count)
+                ])
+                await session.execute(insert(Reservation), [
+                    {"user_id": user.id, "event_id": event.id, "tickets_reserved": 1}
+                ] * count)
+    invalidate_event()
+    return event.id, user.id
+
+
+async def cpu_per_response(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, int]:
+    response = await client.get(path)
+    response.raise_for_status()
+    started = time.process_time()
+    for _ in range(repeat):
+        await client.get(path)
+    return (time.process_time() - started) / repeat, len(response.content)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    await init_db()
+    event_id, user_id = await seed(args.rows)
+    paths = {
+        "events": "/events/?name_prefix=benchmark+list",
+        "reservations": f"/reservations/?event_id={event_id}",
+    }
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, path in paths.items():
+                results = {}
+                for fast in (False, True):
+                    settings.FAST_LIST_RESPONSES = fast
+                    results[fast] = await cpu_per_response(client, path, args.repeat)
+                (before, size), (after, _) = results[False], results[True]
+                print(
+                    f"{name:>12}: rows={args.rows} bytes={size} "
+                    f"validated_cpu_ms={before * 1000:.1f} fast_cpu_ms={after * 1000:.1f} "
+                    f"speedup={before / after:.1f}x"
+                )
+    finally:
+        await delete_user(user_id)
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(Event)
+                    .where(Event.name.startswith("benchmark list "), Event.id != event_id)
+                )
+        await delete_event(event_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
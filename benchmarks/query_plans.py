@@ -0,0 +1,295 @@
+"""
+Fails when a service query reads a whole table instead of going through an index.
+
+Migrates the database, seeds `--rows` reservations, then calls every service
+function once while recording the SQL each call issues. Each distinct SELECT,
+UPDATE and DELETE is run again under `EXPLAIN` (`EXPLAIN QUERY PLAN` on
+SQLite) and flagged if its plan scans a whole table or index: MySQL access
+type `ALL` or `index`, SQLite `SCAN <table>`. An unfiltered scan that a
+`LIMIT` stops early, with no sort or temporary table in the plan, reads one
+page and is not flagged. Calls listed in `ALLOWED_FULL_SCANS` read whole tables by design.
+
+MySQL picks plans from table statistics, so run it against a database with
+production-like row counts. Exits with status 1 if any query is flagged.
+
+    python -m benchmarks.query_plans --rows 5000
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+from sqlmodel import SQLModel, select
+
+from app.database import AsyncSessionLocal, close_db, engine, init_db, replica_engines
+from app.models.event import Event
+from app.models.hold import Hold
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import (
+    booking_service,
+    event_service,
+    export_service,
+    hold_service,
+    idempotency,
+    import_service,
+    ledger,
+    sales_rollups,
+    user_service,
+)
+
+# Service calls that read whole tables on purpose, and why.
+ALLOWED_FULL_SCANS = {
+    "get_all_events (cache fill)": "the unfiltered listing is read once per cache TTL",
+    "export_events": "exports stream the whole table",
+    "export_users": "exports stream the whole table",
+    "export_reservations": "exports stream the whole table",
+    "compact_ledgers": "background pass every LEDGER_COMPACT_INTERVAL_S over the ledger",
+    "rebuild_sales_rollups": "one-off backfill that aggregates every reservation",
+}
+
+INSERT_CHUNK = 10000
+PLANNED_STATEMENT = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+PAGE_READ = re.compile(r"^(?!.*\bWHERE\b).*\bLIMIT\b", re.IGNORECASE | re.DOTALL)
+
+# The service call issuing the statements being recorded.
+current_call: ContextVar[str] = ContextVar("current_call", default="")
+
+
+def record_statements(statements: dict):
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        call = current_call.get()
+        if call and PLANNED_STATEMENT.match(statement) and statement not in statements:
+            statements[statement] = (call, parameters[0] if executemany else parameters)
+
+    for pooled_engine in (engine, *replica_engines):
+        event.listen(pooled_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+async def explain(statement: str, parameters) -> tuple[list[str], list[str]]:
+    """
+    Return a statement's plan steps and those of them that read a whole table.
+    """
+    tables = set(SQLModel.metadata.tables)
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+            steps = [row[-1] for row in rows]
+            sorted_ = any("TEMP B-TREE" in step for step in steps)
+            scans = [
+                step for step in steps
+                if (match := re.match(r"SCAN (\w+)", step)) and match.group(1) in tables
+            ]
+        else:
+            rows = (await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).mappings().all()
+            steps = [
+                f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row['Extra'] or ''}"
+                for row in rows
+            ]
+            sorted_ = any(
+                "filesort" in (row["Extra"] or "") or "temporary" in (row["Extra"] or "")
+                for row in rows
+            )
+            scans = [
+                f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}"
+                for row in rows
+                if row["type"] in ("ALL", "index") and row["table"] in tables
+            ]
+    if scans and PAGE_READ.match(statement) and not sorted_:
+        return steps, []
+    return steps, scans
+
+
+async def seed(rows: int) -> tuple[list[int], list[int]]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            events = [
+                Event(
+                    name=f"query plans {index}",
+                    description="query_plans check",
+                    date_time=datetime(2032, 1, 1) + timedelta(hours=index),
+                    tickets_total=rows,
+                    tickets_available=rows,
+                )
+                for index in range(max(rows // 100, 2))
+            ]
+            users = [User(name=f"query plans {index}") for index in range(max(rows // 10, 2))]
+            session.add_all(events + users)
+            await session.flush()
+            event_ids = [item.id for item in events]
+            user_ids = [item.id for item in users]
+
+        for start in range(0, rows, INSERT_CHUNK):
+            async with session.begin():
+                await session.execute(insert(Reservation), [
+                    {
+                        "user_id": user_ids[index % len(user_ids)],
+                        "event_id": event_ids[index % len(event_ids)],
+                        "tickets_reserved": 1,
+                    }
+                    for index in range(start, min(start + INSERT_CHUNK, rows))
+                ])
+    await sales_rollups.rebuild_sales_rollups()
+    return event_ids, user_ids
+
+
+async def exercise_services(event_ids: list[int], user_ids: list[int]):
+    """
+    Call every service function once, labelling the statements each one issues.
+    """
+    event_id, other_event_id = event_ids[0], event_ids[1]
+    user_id, other_user_id = user_ids[0], user_ids[1]
+    created = {}
+
+    async def drain(stream):
+        async for _ in stream:
+            pass
+
+    async def idempotent_write():
+        return 201, "{}"
+
+    async def import_chunks():
+        yield (
+            b'{"name": "query plans import", "description": "query_plans check", '
+            b'"date_time": "2032-06-02T00:00:00", "tickets_total": 10}\n'
+        )
+
+    calls = [
+        ("create_user", lambda: user_service.create_user(User(name="query plans user"))),
+        ("get_user", lambda: user_service.get_user(user_id)),
+        ("get_all_users", lambda: user_service.get_all_users(limit=10, after=user_id)),
+        ("create_event", lambda: event_service.create_event(Event(
+            name="query plans sharded",
+            description="query_plans check",
+            date_time=datetime(2032, 6, 1),
+            tickets_total=100,
+            tickets_available=100,
+        ))),
+        ("set_inventory_slots", lambda: event_service.set_inventory_slots(created["create_event"].id, 4)),
+        ("get_all_events (cache fill)", lambda: event_service.get_all_events()),
+        ("get_all_events", lambda: event_service.get_all_events(
+            limit=10, date_from=datetime(2032, 1, 1), date_to=datetime(2032, 1, 2)
+        )),
+        ("get_all_events (name prefix)", lambda: event_service.get_all_events(
+            limit=10, name_prefix="query plans 1"
+        )),
+        ("import_rows", lambda: import_service.import_rows("events", import_chunks(), "ndjson")),
+        ("get_event_availability", lambda: event_service.get_event_availability(
+            created["create_event"].id
+        )),
+        ("create_reservation", lambda: booking_service.create_reservation(
+            Reservation(user_id=user_id, event_id=event_id, tickets_reserved=2)
+        )),
+        ("create_reservation (sharded)", lambda: booking_service.create_reservation(
+            Reservation(user_id=user_id, event_id=created["create_event"].id, tickets_reserved=2)
+        )),
+        ("settle_reservation_batch", lambda: booking_service.settle_reservation_batch(
+            event_id,
+            [Reservation(user_id=id_, event_id=event_id, tickets_reserved=1) for id_ in user_ids[:5]],
+        )),
+        ("create_reservations_bulk", lambda: booking_service.create_reservations_bulk(
+            [
+                Reservation(user_id=user_id, event_id=event_id, tickets_reserved=1),
+                Reservation(user_id=other_user_id, event_id=other_event_id, tickets_reserved=1),
+            ],
+            atomic=True,
+        )),
+        ("update_reservation", lambda: booking_service.update_reservation(
+            created["create_reservation"].id, user_id, 3
+        )),
+        ("get_all_reservations", lambda: booking_service.get_all_reservations(limit=10, event_id=event_id)),
+        ("get_reservations_by_user", lambda: booking_service.get_reservations_by_user(user_id, limit=10)),
+        ("cancel_reservation", lambda: booking_service.cancel_reservation(created["create_reservation"].id)),
+        ("create_hold", lambda: hold_service.create_hold(
+            Hold(user_id=user_id, event_id=event_id, tickets_held=1)
+        )),
+        ("confirm_hold", lambda: hold_service.confirm_hold(created["create_hold"].id)),
+        ("create_hold (to release)", lambda: hold_service.create_hold(
+            Hold(user_id=user_id, event_id=event_id, tickets_held=1)
+        )),
+        ("release_hold", lambda: hold_service.release_hold(created["create_hold (to release)"].id)),
+        ("release_expired_holds", lambda: hold_service.release_expired_holds(100)),
+        ("run_idempotent", lambda: idempotency.run_idempotent("query-plans", "fingerprint", idempotent_write)),
+        ("purge_expired_idempotency_records", lambda: idempotency.purge_expired_idempotency_records(100)),
+        ("get_ledger_entries", lambda: ledger.get_ledger_entries(event_id, limit=10)),
+        ("compact_ledger", lambda: ledger.compact_ledger(event_id)),
+        ("rebuild_inventory", lambda: ledger.rebuild_inventory(event_id)),
+        ("compact_ledgers", lambda: ledger.compact_ledgers(1)),
+        ("refresh_sales_rollups", lambda: sales_rollups.refresh_sales_rollups(100)),
+        ("get_event_sales", lambda: sales_rollups.get_event_sales(event_id)),
+        ("get_top_buyers", lambda: sales_rollups.get_top_buyers(10)),
+        ("get_sell_through", lambda: sales_rollups.get_sell_through(
+            datetime(2032, 1, 1), datetime(2032, 1, 3)
+        )),
+        ("rebuild_sales_rollups", lambda: sales_rollups.rebuild_sales_rollups()),
+        ("export_events", lambda: drain(export_service.export_events())),
+        ("export_users", lambda: drain(export_service.export_users())),
+        ("export_reservations", lambda: drain(export_service.export_reservations(event_id))),
+        ("delete_user", lambda: user_service.delete_user(other_user_id)),
+        ("delete_event", lambda: event_service.delete_event(other_event_id)),
+    ]
+    for name, call in calls:
+        token = current_call.set(name)
+        try:
+            result = await call()
+        finally:
+            current_call.reset(token)
+        created[name] = result[0] if isinstance(result, tuple) else result
+
+
+async def cleanup():
+    async with AsyncSessionLocal() as session:
+        event_ids = (await session.execute(
+            select(Event.id).where(Event.name.startswith("query plans"))
+        )).scalars().all()
+        user_ids = (await session.execute(
+            select(User.id).where(User.name.startswith("query plans"))
+        )).scalars().all()
+    for event_id in event_ids:
+        await event_service.delete_event(event_id)
+    for user_id in user_ids:
+        await user_service.delete_user(user_id)
+    await sales_rollups.refresh_sales_rollups(INSERT_CHUNK)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    await init_db()
+    event_ids, user_ids = await seed(args.rows)
+    statements = {}
+    record_statements(statements)
+    try:
+        await exercise_services(event_ids, user_ids)
+    finally:
+        current_call.set("")
+        await cleanup()
+
+    failures = 0
+    for statement, (call, parameters) in statements.items():
+        steps, scans = await explain(statement, parameters)
+        if args.verbose:
+            print(f"{call}: {'; '.join(steps)}")
+            print(f"    {' '.join(statement.split())[:200]}")
+        if not scans:
+            continue
+        allowed = ALLOWED_FULL_SCANS.get(call)
+        failures += allowed is None
+        print(f"{'allowed' if allowed else 'FULL SCAN'}: {call}: {'; '.join(scans)}")
+        print(f"    {' '.join(statement.split())[:200]}")
+        if allowed:
+            print(f"    ({allowed})")
+    print(f"{len(statements)} statements checked, {failures} unexpected full scans")
+    await close_db()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,146 @@
+"""
+Flash-sale concurrency benchmark for the reservation write path.
+
+Fires a burst of concurrent `create_reservation` calls at a single event and
+compares the atomic conditional-decrement path in `booking_service` with the
+previous read-modify-write implementation (reproduced below as
+`legacy_create_reservation`), and with the same burst routed through the
+admission batcher. Passing `--slots` adds a run against an event with sharded
+inventory. For each run it reports reservations/sec, rejections, errors and
+oversell against the event's capacity.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.reservation_concurrency --requests 500 --tickets 200 --slots 16
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.admission import admit_reservation
+from app.services.booking_service import create_reservation
+from app.services.event_service import delete_event
+from app.services.inventory import get_tickets_available, resize_inventory_slots
+from app.services.user_service import delete_user
+
+
+async def legacy_create_reservation(reservation: Reservation):
+    """
+    The original read-modify-write reservation path, kept for comparison.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            user = await session.get(User, reservation.user_id)
+            if not user:
+                return None, "User not found"
+
+            event = await session.get(Event, reservation.event_id)
+            if not event:
+                return None, "Event not found"
+
+            if event.tickets_available < reservation.tickets_reserved:
+                return None, "Sold out"
+            event.tickets_available -= reservation.tickets_reserved
+            session.add(reservation)
+            session.add(event)
+
+        return reservation, "Reservation created successfully"
+
+
+async def setup(tickets: int, slots: int = 0) -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event = Event(
+                name="benchmark flash sale",
+                description="reservation_concurrency benchmark",
+                date_time=datetime.now(),
+                tickets_total=tickets,
+                tickets_available=tickets,
+            )
+            user = User(name="benchmark")
+            session.add_all([event, user])
+            if slots:
+                await session.flush()
+                await resize_inventory_slots(session, event, slots)
+    return event.id, user.id
+
+
+async def teardown(event_id: int, user_id: int):
+    # The services also remove the ledger entries, snapshot and slots the run left behind.
+    await delete_event(event_id)
+    await delete_user(user_id)
+
+
+async def run(path, requests: int, tickets: int, quantity: int, slots: int = 0) -> dict:
+    event_id, user_id = await setup(tickets, slots)
+
+    async def attempt():
+        try:
+            reservation, _ = await path(
+                Reservation(user_id=user_id, event_id=event_id, tickets_reserved=quantity)
+            )
+            return "accepted" if reservation else "rejected"
+        except Exception:
+            return "error"
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(attempt() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as session:
+        reserved = await session.scalar(
+            select(func.coalesce(func.sum(Reservation.tickets_reserved), 0)).where(
+                Reservation.event_id == event_id
+            )
+        )
+        available = await get_tickets_available(session, event_id)
+    await teardown(event_id, user_id)
+
+    accepted = outcomes.count("accepted")
+    return {
+        "accepted": accepted,
+        "rejected": outcomes.count("rejected"),
+        "errors": outcomes.count("error"),
+        "elapsed_s": round(elapsed, 3),
+        "reservations_per_s": round(accepted / elapsed, 1) if elapsed else 0.0,
+        "oversold": max(reserved - tickets, 0),
+        "counter_drift": tickets - available - reserved,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--slots", type=int, default=0)
+    args = parser.parse_args()
+
+    await init_db()
+
+    runs = [
+        ("legacy", legacy_create_reservation, 0),
+        ("atomic", create_reservation, 0),
+        ("batched", admit_reservation, 0),
+    ]
+    if args.slots:
+        runs.append(("sharded", create_reservation, args.slots))
+
+    for name, path, slots in runs:
+        result = await run(path, args.requests, args.tickets, args.quantity, slots)
+        print(f"{name:>7}: {result}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Memory and throughput of ORM instances versus projected records on read paths.
+
+Seeds `--rows` events and as many reservations, then loads them `--rounds`
+times three ways: full ORM instances (`select(Model)`), all-column records
+(`EventRow`, `ReservationRow`) and, for events, an availability projection of
+just `id` and `tickets_available`. Reports rows loaded per second (best round),
+the peak memory allocated while loading and the memory still held by the
+loaded list, from `tracemalloc`.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.row_projection --rows 10000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal, close_db, init_db
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.rows import EventRow, ReservationRow, fetch_records, projection, select_records
+
+INSERT_CHUNK = 10000
+BENCHMARK_NAME = "benchmark projection"
+
+
+async def seed(rows: int) -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            user = User(name=BENCHMARK_NAME)
+            event = Event(
+                name=BENCHMARK_NAME,
+                description="row_projection benchmark",
+                date_time=datetime.now(),
+                tickets_total=rows,
+                tickets_available=0,
+            )
+            session.add_all([user, event])
+            await session.flush()
+            for start in range(0, rows, INSERT_CHUNK):
+                count = min(INSERT_CHUNK, rows - start)
+                await session.execute(insert(Event), [
+                    {
+                        "name": BENCHMARK_NAME,
+                        "description": "row_projection benchmark",
+                        "date_time": datetime.now(),
+                        "tickets_total": 100,
+                        "tickets_available": 100,
+                        "inventory_slots": 0,
+                    }
+                ] * (count - 1 if start == 0 else count))
+                await session.execute(insert(Reservation), [
+                    {"user_id": user.id, "event_id": event.id, "tickets_reserved": 1}
+                ] * count)
+        return event.id, user.id
+
+
+async def cleanup(event_id: int, user_id: int):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(delete(Reservation).where(Reservation.event_id == event_id))
+            await session.execute(delete(Event).where(Event.name == BENCHMARK_NAME))
+            await session.execute(delete(User).where(User.id == user_id))
+
+
+async def measure(load, rounds: int) -> tuple[float, int, int, int]:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        loaded = await load()
+        best = min(best, time.perf_counter() - started)
+        del loaded
+
+    tracemalloc.start()
+    loaded = await load()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, held, len(loaded)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    await init_db()
+    event_id, user_id = await seed(args.rows)
+    availability = projection(Event, "id", "tickets_available")
+
+    async def load(statement, record=None):
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(statement)
+                return fetch_records(result, record) if record else result.scalars().all()
+
+    events = select(Event).where(Event.name == BENCHMARK_NAME)
+    reservations = Reservation.event_id == event_id
+    loads = {
+        "events orm": lambda: load(events),
+        "events record": lambda: load(
+            select_records(EventRow).where(Event.name == BENCHMARK_NAME), EventRow
+        ),
+        "events availability": lambda: load(
+            select_records(availability).where(Event.name == BENCHMARK_NAME), availability
+        ),
+        "reservations orm": lambda: load(select(Reservation).where(reservations)),
+        "reservations record": lambda: load(
+            select_records(ReservationRow).where(reservations), ReservationRow
+        ),
+    }
+    try:
+        for name, run in loads.items():
+            elapsed, peak, held, count = await measure(run, args.rounds)
+            print(
+                f"{name:>20}: rows={count} rows_per_s={count / elapsed:.0f} "
+                f"peak_kib={peak / 1024:.0f} held_bytes_per_row={held / count:.0f}"
+            )
+    finally:
+        await cleanup(event_id, user_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Latency of the /stats dashboard endpoints versus aggregating the reservation table.
+
+Seeds `--rows` reservations spread over `--events` events and `--users` users,
+backfills the sales rollups with `rebuild_sales_rollups`, then requests each
+/stats endpoint in-process `--repeat` times and runs the equivalent
+`GROUP BY` over `reservation` as many times. Reports the median milliseconds of
+each; the rollup reads should stay flat as `--rows` grows while the scans do not.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.sales_rollups --rows 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import delete, func, insert
+from sqlmodel import select
+
+from app.database import AsyncSessionLocal, close_db, init_db
+from app.main import app
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services.sales_rollups import rebuild_sales_rollups
+
+INSERT_CHUNK = 10000
+BENCHMARK_NAME = "benchmark rollups"
+START = datetime(2031, 1, 1)
+
+
+async def seed(rows: int, events: int, users: int) -> tuple[list[int], list[int]]:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            event_rows = [
+                Event(
+                    name=BENCHMARK_NAME,
+                    description="sales_rollups benchmark",
+                    date_time=START + timedelta(hours=index),
+                    tickets_total=rows,
+                    tickets_available=0,
+                )
+                for index in range(events)
+            ]
+            user_rows = [User(name=BENCHMARK_NAME) for _ in range(users)]
+            session.add_all(event_rows + user_rows)
+            await session.flush()
+            event_ids = [event.id for event in event_rows]
+            user_ids = [user.id for user in user_rows]
+
+        for start in range(0, rows, INSERT_CHUNK):
+            async with session.begin():
+                await session.execute(insert(Reservation), [
+                    {
+                        "user_id": user_ids[index % users],
+                        "event_id": event_ids[index % events],
+                        "tickets_reserved": 1 + index % 3,
+                    }
+                    for index in range(start, min(start + INSERT_CHUNK, rows))
+                ])
+    return event_ids, user_ids
+
+
+async def cleanup(event_ids: list[int], user_ids: list[int]):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            await session.execute(delete(Reservation).where(Reservation.event_id.in_(event_ids)))
+            await session.execute(delete(Event).where(Event.id.in_(event_ids)))
+            await session.execute(delete(User).where(User.id.in_(user_ids)))
+    await rebuild_sales_rollups()
+
+
+async def median_ms(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def scan(statement):
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            return (await session.execute(statement)).all()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    await init_db()
+    event_ids, user_ids = await seed(args.rows, args.events, args.users)
+    await rebuild_sales_rollups()
+
+    end = START + timedelta(hours=args.events)
+    event_id = event_ids[0]
+    comparisons = {
+        "event sales": (
+            f"/stats/events/{event_id}",
+            select(func.sum(Reservation.tickets_reserved))
+            .where(Reservation.event_id == event_id),
+        ),
+        "top buyers": (
+            "/stats/users/top?limit=10",
+            select(Reservation.user_id, func.sum(Reservation.tickets_reserved).label("tickets"))
+            .group_by(Reservation.user_id)
+            .order_by(func.sum(Reservation.tickets_reserved).desc())
+            .limit(10),
+        ),
+        "sell-through": (
+            f"/stats/sell-through?date_from={START.isoformat()}&date_to={end.isoformat()}",
+            select(func.date(Event.date_time), func.sum(Reservation.tickets_reserved))
+            .join(Event, Event.id == Reservation.event_id)
+            .where(Event.date_time >= START, Event.date_time <= end)
+            .group_by(func.date(Event.date_time)),
+        ),
+    }
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, (path, statement) in comparisons.items():
+                response = await client.get(path)
+                response.raise_for_status()
+
+                async def request():
+                    await client.get(path)
+
+                rollup = await median_ms(request, args.repeat)
+                scanned = await median_ms(lambda: scan(statement), args.repeat)
+                print(
+                    f"{name:>12}: rows={args.rows} rollup_ms={rollup:.2f} "
+                    f"scan_ms={scanned:.2f} speedup={scanned / rollup:.0f}x"
+                )
+    finally:
+        await cleanup(event_ids, user_ids)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
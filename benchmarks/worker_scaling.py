@@ -0,0 +1,59 @@
+"""
+Throughput comparison of the production server with different worker counts.
+
+Runs `benchmarks.booking_suite --target live` once per `--workers` value, each
+against a fresh `python -m app.server` with that many workers, and prints each
+scenario's throughput and p95 latency side by side with the speedup over the
+first worker count. Arguments after `--` are passed on to the suite.
+
+Run from the repository root against the database configured in `.env`:
+
+    python -m benchmarks.worker_scaling --workers 1 4 -- --concurrency 200 --requests 5000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def run_suite(workers: int, suite_args: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.json")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.booking_suite", "--target", "live",
+             "--workers", str(workers), "--save-baseline", path, *suite_args],
+            check=True,
+        )
+        with open(path) as f:
+            return json.load(f)["scenarios"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("suite_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    suite_args = args.suite_args[1:] if args.suite_args[:1] == ["--"] else args.suite_args
+
+    results = {}
+    for workers in args.workers:
+        print(f"--- {workers} worker(s) ---", flush=True)
+        results[workers] = run_suite(workers, suite_args)
+
+    first = args.workers[0]
+    print()
+    for name in results[first]:
+        for workers, scenarios in results.items():
+            result = scenarios[name]
+            speedup = result["throughput_rps"] / results[first][name]["throughput_rps"]
+            print(
+                f"{name:>11}: workers={workers} rps={result['throughput_rps']:.1f} "
+                f"p95_ms={result['p95_ms']:.1f} speedup={speedup:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Bulk mode: submit the events, users or reservations in a CSV or NDJSON file.
+
+Rows are read lazily and sent by `--concurrency` workers sharing one pooled,
+keep-alive `httpx.AsyncClient`. Events and users are posted one per request;
+reservations go through `POST /reservations/bulk`, `--batch-size` per request.
+CSV files need a header row naming the fields; any other file is read as
+NDJSON, one object per line, as written by the `/export` endpoints.
+
+    python cli.py bulk events events.csv --concurrency 32
+    python cli.py bulk reservations reservations.ndjson --batch-size 500
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import sys
+import time
+from datetime import datetime
+
+import httpx
+from colorama import Fore, Style
+
+from validation.input_validation import validate_int
+
+REQUIRED_FIELDS = {
+    "events": ("name", "date_time", "tickets_total"),
+    "users": ("name",),
+    "reservations": ("user_id", "event_id", "tickets_reserved"),
+}
+
+# The server's default BULK_RESERVATION_MAX_ITEMS.
+MAX_BATCH_SIZE = 1000
+
+# Only failures that happen before the server applies a request are retried,
+# since creating events and users is not idempotent: a full waiting room or
+# worker pool, and connections that could not be opened.
+RETRY_STATUSES = {429, 503}
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+BACKOFF_BASE_S = 0.2
+BACKOFF_MAX_S = 10.0
+
+
+class BulkStats:
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rows(self):
+        return self.succeeded + self.failed
+
+    @property
+    def rate(self):
+        return self.rows / max(time.perf_counter() - self.started, 1e-9)
+
+    def fail(self, line, message):
+        self.failed += 1
+        print(Fore.RED + f"line {line}: {message}" + Style.RESET_ALL, file=sys.stderr)
+
+
+def read_rows(path):
+    """
+    Yield the line number and fields of each row of a CSV or NDJSON file.
+
+    Malformed NDJSON lines are yielded as None, so they are reported as failed rows.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line, text in enumerate(file, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError:
+                yield line, None
+
+
+def build_payload(kind, row):
+    """
+    Validate a row and turn it into the request body for its kind.
+
+    Returns (True, payload), or (False, error message) like the validation helpers.
+    """
+    if not isinstance(row, dict):
+        return False, "Error: the row is not a JSON object."
+    missing = [field for field in REQUIRED_FIELDS[kind] if row.get(field) in (None, "")]
+    if missing:
+        return False, f"Error: missing {', '.join(missing)}."
+
+    if kind == "users":
+        return True, {"name": row["name"]}
+
+    if kind == "reservations":
+        payload = {}
+        for field in REQUIRED_FIELDS[kind]:
+            valid, value = validate_int(row[field], field)
+            if not valid:
+                return False, value
+            payload[field] = value
+        return True, payload
+
+    valid, tickets_total = validate_int(row["tickets_total"], "tickets_total")
+    if not valid:
+        return False, tickets_total
+    tickets_available = row.get("tickets_available")
+    if tickets_available in (None, ""):
+        tickets_available = tickets_total
+    valid, tickets_available = validate_int(tickets_available, "tickets_available")
+    if not valid:
+        return False, tickets_available
+    try:
+        date_time = datetime.fromisoformat(str(row["date_time"]))
+    except ValueError:
+        return False, "Error: date_time must be an ISO 8601 date and time."
+
+    return True, {
+        "name": row["name"],
+        "description": row.get("description") or "",
+        "date_time": date_time.isoformat(),
+        "tickets_total": tickets_total,
+        "tickets_available": tickets_available,
+    }
+
+
+async def post(client, path, payload, retries, stats):
+    """
+    POST a request body, retrying with jittered exponential backoff while it was not applied.
+    """
+    for attempt in range(retries + 1):
+        response = None
+        try:
+            response = await client.post(path, json=payload)
+        except RETRY_ERRORS:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+        stats.retries += 1
+        delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt) * random.uniform(0.5, 1)
+        retry_after = response.headers.get("Retry-After", "") if response else ""
+        if retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        await asyncio.sleep(delay)
+
+
+async def submit(client, kind, batch, mode, retries, stats):
+    if kind != "reservations":
+        line, payload = batch[0]
+        response = await post(client, f"/{kind}/", payload, retries, stats)
+        if response.status_code == 201:
+            stats.succeeded += 1
+        else:
+            stats.fail(line, f"status {response.status_code}: {response.text}")
+        return
+
+    response = await post(
+        client,
+        "/reservations/bulk",
+        {"reservations": [payload for _, payload in batch], "mode": mode},
+        retries,
+        stats,
+    )
+    results = _bulk_results(response)
+    if results is None:
+        for line, _ in batch:
+            stats.fail(line, f"status {response.status_code}: {response.text}")
+        return
+    for (line, _), result in zip(batch, results):
+        if result["success"]:
+            stats.succeeded += 1
+        else:
+            stats.fail(line, result["message"])
+
+
+async def run_bulk(client, kind, path, concurrency=16, retries=3, batch_size=500,
+                   mode="best_effort", progress_interval=2.0):
+    """
+    Submit every row of a file with `concurrency` concurrent requests.
+
+    Rows are read only as fast as the workers take them, so memory stays flat
+    however large the file is. Returns the BulkStats of the run.
+    """
+    stats = BulkStats()
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while (batch := await queue.get()) is not None:
+            try:
+                await submit(client, kind, batch, mode, retries, stats)
+            except Exception as e:
+                # Anything a batch raises, from a dropped connection to a response
+                # that is not the expected JSON, fails that batch only; a dead worker
+                # would leave the reader blocked on a full queue.
+                for line, _ in batch:
+                    stats.fail(line, f"{type(e).__name__}: {e}")
+
+    async def report_progress():
+        while True:
+            await asyncio.sleep(progress_interval)
+            print(
+                f"{stats.rows} rows: {stats.succeeded} succeeded, {stats.failed} failed, "
+                f"{stats.rate:.0f} rows/s"
+            )
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    reporter = asyncio.create_task(report_progress())
+    try:
+        size = batch_size if kind == "reservations" else 1
+        batch = []
+        for line, row in read_rows(path):
+            valid, payload = build_payload(kind, row)
+            if not valid:
+                stats.fail(line, payload)
+                continue
+            batch.append((line, payload))
+            if len(batch) == size:
+                await queue.put(batch)
+                batch = []
+        if batch:
+            await queue.put(batch)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        reporter.cancel()
+        for task in workers:
+            task.cancel()
+    return stats
+
+
+def main(argv, base_url):
+    parser = argparse.ArgumentParser(
+        prog="cli.py bulk", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("kind", choices=REQUIRED_FIELDS)
+    parser.add_argument("path", help="a .csv file, or an NDJSON file")
+    parser.add_argument("--base-url", default=base_url)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=500, help="reservations per bulk request")
+    parser.add_argument("--mode", choices=("best_effort", "atomic"), default="best_effort",
+                        help="how each bulk reservation request is applied")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--progress-interval", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.retries < 0:
+        parser.error("--concurrency must be at least 1 and --retries at least 0")
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
+
+    async def run():
+        limits = httpx.Limits(
+            max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+        )
+        async with httpx.AsyncClient(
+            base_url=args.base_url, limits=limits, timeout=args.timeout
+        ) as client:
+            return await run_bulk(
+                client, args.kind, args.path, args.concurrency, args.retries,
+                args.batch_size, args.mode, args.progress_interval,
+            )
+
+    stats = asyncio.run(run())
+    color = Fore.GREEN if not stats.failed else Fore.RED
+    print(
+        color
+        + f"Submitted {stats.rows} {args.kind} in {time.perf_counter() - stats.started:.1f}s: "
+        f"{stats.succeeded} succeeded, {stats.failed} failed, {stats.retries} retries, "
+        f"{stats.rate:.0f} rows/s"
+        + Style.RESET_ALL
+    )
+    return 1 if stats.failed else 0
+
+
+def _bulk_results(response):
+    # An atomic request that fails is a 400 whose detail still lists every result.
+    if response.status_code not in (201, 400):
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if response.status_code == 400:
+        body = body.get("detail")
+    return body.get("results") if isinstance(body, dict) else None
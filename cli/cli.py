@@ -1,7 +1,9 @@
+import sys
 import requests
 
 from pyfiglet import Figlet
 from validation.input_validation import validate_int, validate_datetime
+import bulk
 
 import os
 import colorama
@@ -189,20 +191,36 @@ def create_reservation():
 
 def lookup_reservation():
     print("\n--- Lookup Reservation ---")
-    response = requests.get(f"{API_BASE_URL}/reservations/")
+    reservation_id_str = input("Reservation ID: ")
+    valid_reservation_id, reservation_id = validate_int(reservation_id_str, "Reservation ID")
+    if not valid_reservation_id:
+        print(reservation_id)
+        return
+
+    # The first reservation after the previous ID, read through the primary key.
+    response = requests.get(
+        f"{API_BASE_URL}/reservations/", params={"after": reservation_id - 1, "limit": 1}
+    )
     if response.status_code == 200:
-        reservations = response.json()
-        for index, reservation in enumerate(reservations):
-            print(f"Reservation {index + 1} Details:")
-            print("--------------------------------")
-            print(f"Reservation ID: {reservation['id']}")
-            print(f"User ID: {reservation['user_id']}")
-            print(f"Event ID: {reservation['event_id']}")
-            print(f"Tickets Reserved: {reservation['tickets_reserved']}\n")
+        reservations = [found for found in response.json() if found["id"] == reservation_id]
+    elif response.status_code == 404:
+        reservations = []
     else:
         print(
             f"Failed to lookup reservation.  Status code: {response.status_code}, Detail: {response.text}"
         )
+        return
+
+    if not reservations:
+        print(f"Reservation {reservation_id} not found.")
+        return
+    reservation = reservations[0]
+    print("Reservation Details:")
+    print("--------------------------------")
+    print(f"Reservation ID: {reservation['id']}")
+    print(f"User ID: {reservation['user_id']}")
+    print(f"Event ID: {reservation['event_id']}")
+    print(f"Tickets Reserved: {reservation['tickets_reserved']}\n")
 
 
 def update_reservation():
@@ -321,5 +339,7 @@ def main():
             print(Fore.RED + "Invalid choice, please try again." + Style.RESET_ALL)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["bulk"]:
+        sys.exit(bulk.main(sys.argv[2:], API_BASE_URL))
     print_heading("Event Ticketing")
     main()
@@ -1,11 +1,14 @@
+import re
 from datetime import datetime
 
 
 def validate_int(input_str, field_name="value"):
-    try:
+    # Only whole numbers: floats, booleans and other JSON values are not truncated or coerced.
+    if isinstance(input_str, int) and not isinstance(input_str, bool):
+        return True, input_str
+    if isinstance(input_str, str) and re.fullmatch(r"\s*[0-9]+\s*", input_str):
         return True, int(input_str)
-    except ValueError:
-        return False, f"Error: {field_name} must be an integer."
+    return False, f"Error: {field_name} must be an integer."
 
 
 def validate_datetime(
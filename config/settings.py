@@ -1,14 +1,130 @@
+from typing import List, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
-    DB_HOST: str
-    DB_NAME: str
-    DB_USER: str
-    DB_PASSWORD: str
+    DB_HOST: Optional[str] = None
+    DB_NAME: Optional[str] = None
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    # A full SQLAlchemy async URL used instead of the DB_* fields above, e.g.
+    # "sqlite+aiosqlite:///bench.db" to run the benchmark suite without MySQL.
+    DATABASE_URL: Optional[str] = None
+
+    # Connection pool sizing is per process; size it against the number of workers.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Connections all WEB_WORKERS together may hold to each database server; when set,
+    # each worker's pool size and overflow are capped to its share. Must be at least
+    # WEB_WORKERS, since every worker needs a connection.
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    DB_POOL_TIMEOUT_S: float = 30.0
+    DB_POOL_RECYCLE_S: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Logs every SQL statement; leave off outside of debugging.
+    DB_ECHO: bool = False
+    # Apply pending schema migrations at startup; the production server (app.server)
+    # does it once before forking and turns this off for its workers.
+    DB_INIT_ON_STARTUP: bool = True
+
+    # Production server (python -m app.server): worker processes, and how long a
+    # stopping worker waits for in-flight requests before closing them.
+    WEB_WORKERS: int = 1
+    SHUTDOWN_GRACE_S: float = 30.0
+
+    # Read replicas as full SQLAlchemy async URLs, e.g. '["mysql+aiomysql://user:pw@replica1/db"]'.
+    # Read-only endpoints are spread over them; none sends every read to the primary.
+    DB_REPLICA_URLS: List[str] = []
+    # Seconds a client's reads stay on the primary after it writes; 0 disables pinning.
+    DB_READ_YOUR_WRITES_S: float = 5.0
+
+    # Per-route request metrics served at /metrics; requests slower than the threshold
+    # are logged with their slowest SQL statements (0 disables the log).
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_THRESHOLD_S: float = 1.0
+    SLOW_REQUEST_MAX_STATEMENTS: int = 10
+
+    # Reservation admission batching; a max batch size of 1 disables it.
+    RESERVATION_BATCH_MAX_SIZE: int = 100
+    RESERVATION_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # Virtual waiting room in front of POST /reservations/. Kept in process memory, so
+    # app.server refuses it with more than one worker.
+    WAITING_ROOM_ENABLED: bool = False
+    WAITING_ROOM_CONCURRENCY: int = 50
+    WAITING_ROOM_MAX_QUEUE: int = 10000
+    WAITING_ROOM_POLL_INTERVAL_S: int = 1
+    WAITING_ROOM_TOKEN_TTL_S: float = 30.0
+
+    # Checkout holds and the background sweeper that releases expired ones.
+    HOLD_TTL_S: int = 600
+    HOLD_SWEEP_INTERVAL_S: float = 5.0
+    HOLD_SWEEP_BATCH_SIZE: int = 1000
+
+    # Read-through cache for event listings and availability; a TTL of 0 disables it.
+    EVENT_CACHE_TTL_S: float = 2.0
+    EVENT_CACHE_MAX_ENTRIES: int = 10000
+
+    # Identical concurrent reads of events, users and reservations share one query. Results
+    # are also kept for SINGLE_FLIGHT_TTL_S seconds; 0 shares only calls still running.
+    SINGLE_FLIGHT_TTL_S: float = 0.0
+    SINGLE_FLIGHT_MAX_ENTRIES: int = 10000
+
+    # Live availability feed: at most one update per event per interval, and a
+    # full re-read of subscribed events every resync period to catch other workers' sales.
+    AVAILABILITY_FEED_INTERVAL_S: float = 0.5
+    AVAILABILITY_FEED_RESYNC_S: float = 5.0
+    AVAILABILITY_FEED_KEEPALIVE_S: float = 15.0
+
+    # Upper bound on the `limit` of paginated list endpoints.
+    MAX_PAGE_SIZE: int = 1000
+    # List endpoints read plain rows and encode them with orjson, skipping response
+    # model validation; the JSON is the same, but rows are not checked against the models.
+    FAST_LIST_RESPONSES: bool = False
+
+    # Rows fetched per server-side cursor round trip by the NDJSON exports.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Upper bound on the number of reservations in one POST /reservations/bulk.
+    BULK_RESERVATION_MAX_ITEMS: int = 1000
+
+    # Streaming event and user imports: rows inserted per transaction, rejected rows listed
+    # in the report, and the longest record, in characters, read before an import stops.
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+    IMPORT_MAX_RECORD_LENGTH: int = 1048576
+
+    # Background folding of reservation ledger tails into per-event snapshots.
+    LEDGER_COMPACT_INTERVAL_S: float = 60.0
+    LEDGER_COMPACT_MIN_ENTRIES: int = 1000
+
+    # Background folding of sales deltas into the per-event and per-user rollups that
+    # the /stats endpoints read; dashboards lag bookings by up to one interval.
+    SALES_ROLLUP_REFRESH_INTERVAL_S: float = 5.0
+    SALES_ROLLUP_BATCH_SIZE: int = 10000
+
+    # Idempotency-Key handling for reservation writes: how long completed responses are
+    # replayed, how many are kept in memory, and after how long an unfinished claim is
+    # logged for an operator to resolve (it is never reclaimed automatically).
+    IDEMPOTENCY_TTL_S: int = 86400
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_PENDING_TIMEOUT_S: int = 60
+    IDEMPOTENCY_PURGE_INTERVAL_S: float = 300.0
+
+    # Rows deleted per transaction when deleting an event's or a user's reservations.
+    CASCADE_DELETE_CHUNK_SIZE: int = 5000
 
     class Config:
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def check_database(self):
+        if not self.DATABASE_URL and None in (
+            self.DB_HOST, self.DB_NAME, self.DB_USER, self.DB_PASSWORD
+        ):
+            raise ValueError("Set DATABASE_URL, or DB_HOST, DB_NAME, DB_USER and DB_PASSWORD")
+        return self
+
 
 settings = Settings()
@@ -1,3 +1,6 @@
+-- The schema at migration version 1. The application adopts a database created by
+-- this script and applies the later migrations in app/migrations on startup.
+
 CREATE TABLE event (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(255),
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from app.models.reservation import Reservation
+from app.services.admission import ReservationBatcher
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_requests_per_event():
+    batches = []
+
+    async def settle(event_id, reservations):
+        batches.append((event_id, len(reservations)))
+        return [(reservation, "ok") for reservation in reservations]
+
+    batcher = ReservationBatcher(settle, max_batch_size=3, max_wait_ms=20)
+    requests = [
+        Reservation(user_id=1, event_id=event_id, tickets_reserved=1)
+        for event_id in (1, 1, 1, 1, 2)
+    ]
+    results = await asyncio.gather(*(batcher.submit(r) for r in requests))
+
+    assert [reservation for reservation, _ in results] == requests
+    assert sorted(batches) == [(1, 1), (1, 3), (2, 1)]
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_settle_errors_to_every_caller():
+    async def settle(event_id, reservations):
+        raise RuntimeError("database unavailable")
+
+    batcher = ReservationBatcher(settle, max_batch_size=10, max_wait_ms=1)
+    results = await asyncio.gather(
+        *(
+            batcher.submit(Reservation(user_id=1, event_id=1, tickets_reserved=1))
+            for _ in range(2)
+        ),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from app.main import app
+from app.services.availability_feed import AvailabilityFeed
+from app.services.event_service import availability_feed
+
+
+@pytest.mark.asyncio
+async def test_feed_coalesces_changes_into_one_lookup_per_event():
+    availability = {1: 10}
+    lookups = []
+
+    async def lookup(event_id):
+        lookups.append(event_id)
+        return availability.get(event_id), "ok"
+
+    feed = AvailabilityFeed(lookup, interval=0.1, resync=60)
+    async with feed.subscribe(1) as first, feed.subscribe(1) as second:
+        assert first.get_nowait() == second.get_nowait() == 10
+
+        for tickets_available in (9, 8, 7):
+            availability[1] = tickets_available
+            feed.notify(1)
+        feed.notify(2)
+
+        assert await feed.publish_pending() == 2
+        assert first.get_nowait() == second.get_nowait() == 7
+        assert lookups == [1, 1, 1]
+
+        del availability[1]
+        feed.notify(1)
+        await feed.publish_pending()
+        assert first.get_nowait() is None
+
+    assert feed.stats() == {"events": 0, "subscribers": 0}
+
+
+
+@pytest.mark.asyncio
+async def test_websocket_unsubscribes_when_the_client_disconnects(monkeypatch):
+    async def lookup(event_id):
+        return 10, "ok"
+
+    monkeypatch.setattr(availability_feed, "lookup", lookup)
+    received, sent = asyncio.Queue(), asyncio.Queue()
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "server": ("test", 80),
+        "path": "/events/1/availability/ws",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "subprotocols": [],
+    }
+    await received.put({"type": "websocket.connect"})
+    # Drive the app directly: a test client would cancel the handler on close.
+    handler = asyncio.create_task(app(scope, received.get, sent.put))
+    try:
+        assert (await sent.get())["type"] == "websocket.accept"
+        assert (await sent.get())["text"] == '{"event_id":1,"tickets_available":10}'
+        assert availability_feed.stats() == {"events": 1, "subscribers": 1}
+
+        # No update is pending, so only reading the socket notices the disconnect.
+        await received.put({"type": "websocket.disconnect", "code": 1001})
+        await asyncio.wait_for(handler, timeout=1)
+        assert availability_feed.stats() == {"events": 0, "subscribers": 0}
+    finally:
+        handler.cancel()
@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.main import app
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service
+
+
+@pytest.mark.asyncio
+async def test_bulk_reservations_roll_back_atomically_or_succeed_partially(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(booking_service, "AsyncSessionLocal", session_maker)
+
+    async def state():
+        async with session_maker() as session:
+            events = (await session.execute(select(Event).order_by(Event.id))).scalars().all()
+            reservations = (
+                await session.execute(select(Reservation).order_by(Reservation.id))
+            ).scalars().all()
+            return (
+                [event.tickets_available for event in events],
+                [(item.event_id, item.tickets_reserved) for item in reservations],
+            )
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="buyer"))
+                session.add_all([
+                    Event(
+                        name=f"event {tickets}",
+                        description="bulk",
+                        date_time=datetime(2030, 1, 1),
+                        tickets_total=tickets,
+                        tickets_available=tickets,
+                    )
+                    for tickets in (5, 3)
+                ])
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/reservations/bulk", json={
+                "mode": "atomic",
+                "reservations": [
+                    {"user_id": 1, "event_id": 1, "tickets_reserved": 2},
+                    {"user_id": 1, "event_id": 2, "tickets_reserved": 4},
+                ],
+            })
+            assert response.status_code == 400
+            detail = response.json()["detail"]
+            assert (detail["message"], detail["created"]) == ("No reservations created", 0)
+            assert [result["success"] for result in detail["results"]] == [False, False]
+            assert detail["results"][1]["message"] == (
+                "Only 3 tickets available for event 2, requested 4 in this batch."
+            )
+            assert await state() == ([5, 3], [])
+
+            response = await client.post("/reservations/bulk", json={
+                "mode": "atomic",
+                "reservations": [
+                    {"user_id": 1, "event_id": 1, "tickets_reserved": 1},
+                    {"user_id": 99, "event_id": 1, "tickets_reserved": 1},
+                ],
+            })
+            assert response.status_code == 400
+            assert [r["message"] for r in response.json()["detail"]["results"]] == [
+                "Not created because another reservation in the batch failed.",
+                "User not found",
+            ]
+            assert await state() == ([5, 3], [])
+
+            response = await client.post("/reservations/bulk", json={
+                "mode": "best_effort",
+                "reservations": [
+                    {"user_id": 1, "event_id": 1, "tickets_reserved": 2},
+                    {"user_id": 1, "event_id": 2, "tickets_reserved": 2},
+                    {"user_id": 1, "event_id": 2, "tickets_reserved": 2},
+                    {"user_id": 99, "event_id": 1, "tickets_reserved": 1},
+                    {"user_id": 1, "event_id": 7, "tickets_reserved": 1},
+                    {"user_id": 1, "event_id": 1, "tickets_reserved": 0},
+                ],
+            })
+            assert response.status_code == 201
+            body = response.json()
+            assert body["created"] == 2
+            assert [result["success"] for result in body["results"]] == [
+                True, True, False, False, False, False
+            ]
+            assert [result["message"] for result in body["results"][2:]] == [
+                "Only 1 tickets available, requested 2.",
+                "User not found",
+                "Event not found",
+                "Number of reserved ticket must be at least one.",
+            ]
+            assert await state() == ([3, 1], [(1, 2), (2, 2)])
+    finally:
+        await engine.dispose()
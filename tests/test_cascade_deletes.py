@@ -0,0 +1,176 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from config.settings import settings
+from app.models.event import Event
+from app.models.hold import Hold
+from app.models.inventory_slot import InventorySlot
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.ledger_entry import LedgerEntry
+from app.models.reservation import Reservation
+from app.models.sales_delta import SalesDelta
+from app.models.user import User
+from app.services import booking_service, cascade, event_service, hold_service, user_service
+from app.services.booking_service import cancel_reservation, create_reservation, update_reservation
+from app.services.event_service import delete_event
+from app.services.hold_service import create_hold, release_hold
+from app.services.inventory import resize_inventory_slots
+from app.services.user_service import delete_user
+
+
+@pytest.mark.asyncio
+async def test_chunked_cascades_remove_dependents_and_restore_inventory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cascade.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (cascade, event_service, user_service):
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_maker)
+    monkeypatch.setattr(settings, "CASCADE_DELETE_CHUNK_SIZE", 3)
+
+    async def count(model, *where):
+        async with session_maker() as session:
+            result = await session.execute(select(func.count()).select_from(model).where(*where))
+            return result.scalar_one()
+
+    async def tickets_available():
+        async with session_maker() as session:
+            events = (await session.execute(select(Event).order_by(Event.id))).scalars().all()
+            slots = await session.execute(
+                select(InventorySlot.event_id, func.sum(InventorySlot.tickets_available))
+                .group_by(InventorySlot.event_id)
+            )
+            sharded = dict(slots.all())
+            return [sharded.get(event.id, event.tickets_available) for event in events]
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                ann, bob = User(name="ann"), User(name="bob")
+                # Available tickets already exclude the reservations and holds added below.
+                plain, sharded, doomed = [
+                    Event(
+                        name=name,
+                        description="cascade",
+                        date_time=datetime(2030, 1, 1),
+                        tickets_total=20,
+                        tickets_available=available,
+                    )
+                    for name, available in (("plain", 12), ("sharded", 14), ("doomed", 9))
+                ]
+                session.add_all([ann, bob, plain, sharded, doomed])
+                await session.flush()
+                await resize_inventory_slots(session, sharded, 2)
+
+                bookings = (
+                    [(ann, plain, 1)] * 4 + [(ann, sharded, 2)] * 3 + [(ann, doomed, 1)] * 5
+                    + [(bob, plain, 1)] * 2 + [(bob, doomed, 1)] * 4
+                )
+                session.add_all(
+                    Reservation(user_id=user.id, event_id=event.id, tickets_reserved=tickets)
+                    for user, event, tickets in bookings
+                )
+                expires_at = datetime.utcnow() + timedelta(minutes=5)
+                session.add_all([
+                    Hold(user_id=ann.id, event_id=plain.id, tickets_held=2, expires_at=expires_at),
+                    Hold(user_id=bob.id, event_id=doomed.id, tickets_held=2, expires_at=expires_at),
+                ])
+                session.add_all(
+                    LedgerEntry(event_id=doomed.id, kind="reserve", delta=-1) for _ in range(7)
+                )
+                session.add(InventorySnapshot(event_id=doomed.id, ledger_id=0, tickets_available=20))
+        assert await tickets_available() == [12, 14, 9]
+
+        # Twelve reservations in chunks of three, across an unsharded and a sharded event.
+        assert await delete_user(ann.id) == (True, f"User {ann.id} deleted successfully")
+        assert await count(User, User.id == ann.id) == 0
+        assert await count(Reservation, Reservation.user_id == ann.id) == 0
+        assert await count(Hold, Hold.user_id == ann.id) == 0
+        assert await tickets_available() == [18, 20, 14]
+        assert await count(Reservation, Reservation.user_id == bob.id) == 6
+
+        assert await delete_event(doomed.id) == (True, "Event deleted successfully")
+        for model in (Reservation, Hold, LedgerEntry, InventorySnapshot):
+            assert await count(model, model.event_id == doomed.id) == 0
+        assert await count(Event, Event.id == doomed.id) == 0
+        assert await tickets_available() == [18, 20]
+        assert await count(Reservation, Reservation.user_id == bob.id) == 2
+        assert await delete_event(doomed.id) == (False, "Event not found")
+
+        # Each reservation left the sales rollups once, whichever cascade deleted it.
+        async with session_maker() as session:
+            result = await session.execute(
+                select(SalesDelta.user_id, func.sum(SalesDelta.tickets))
+                .where(SalesDelta.event_id == doomed.id)
+                .group_by(SalesDelta.user_id)
+                .order_by(SalesDelta.user_id)
+            )
+            assert result.all() == [(ann.id, -5), (bob.id, -4)]
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_an_event_being_deleted_refuses_inventory_changes(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'deleting.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (booking_service, cascade, event_service, hold_service):
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_maker)
+    monkeypatch.setattr(settings, "CASCADE_DELETE_CHUNK_SIZE", 1)
+    refused = []
+
+    async def delete_in_chunks(model, where, chunk_size, id_column=None):
+        # Runs once the event is marked, before any of its rows are gone.
+        if not refused:
+            refused.extend([
+                await cancel_reservation(reservations[0].id),
+                await update_reservation(reservations[1].id, reservations[1].user_id, 1),
+                await release_hold(hold.id),
+                await create_reservation(Reservation(user_id=1, event_id=1, tickets_reserved=1)),
+                await create_hold(Hold(user_id=1, event_id=1, tickets_held=1)),
+            ])
+        return await cascade.delete_in_chunks(model, where, chunk_size, id_column)
+
+    monkeypatch.setattr(event_service, "delete_in_chunks", delete_in_chunks)
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="ann"))
+                session.add(Event(
+                    name="doomed",
+                    description="cascade",
+                    date_time=datetime(2030, 1, 1),
+                    tickets_total=10,
+                    tickets_available=10,
+                ))
+        reservations = [
+            (await create_reservation(Reservation(user_id=1, event_id=1, tickets_reserved=2)))[0]
+            for _ in range(2)
+        ]
+        hold, _ = await create_hold(Hold(user_id=1, event_id=1, tickets_held=3))
+
+        assert await delete_event(1) == (True, "Event deleted successfully")
+        assert refused == [
+            (False, f"Event for reservation {reservations[0].id} not found"),
+            (None, f"Event for reservation {reservations[1].id} not found"),
+            (True, "Hold released successfully"),
+            (None, "Only 0 tickets available, requested 1."),
+            (None, "Only 0 tickets available, requested 1."),
+        ]
+        for model in (Event, Reservation, Hold, LedgerEntry, InventorySnapshot):
+            assert await _count(session_maker, model) == 0
+        async with session_maker() as session:
+            assert (await session.execute(select(func.sum(SalesDelta.tickets)))).scalar_one() == 0
+    finally:
+        await engine.dispose()
+
+
+async def _count(session_maker, model):
+    async with session_maker() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import httpx
+import pytest
+
+pytest.importorskip("colorama")
+sys.path.insert(0, str(Path(__file__).parent.parent / "cli"))
+import bulk  # noqa: E402
+
+
+def test_build_payload_validates_rows_and_fills_defaults():
+    assert bulk.build_payload("events", {
+        "name": "Wine festival", "date_time": "2030-01-01 14:00:00", "tickets_total": "10"
+    }) == (True, {
+        "name": "Wine festival",
+        "description": "",
+        "date_time": "2030-01-01T14:00:00",
+        "tickets_total": 10,
+        "tickets_available": 10,
+    })
+    assert bulk.build_payload("events", {"name": "x", "date_time": "soon", "tickets_total": 1}) == (
+        False, "Error: date_time must be an ISO 8601 date and time."
+    )
+    assert bulk.build_payload("reservations", {"user_id": "1", "event_id": 2, "tickets_reserved": 3}) == (
+        True, {"user_id": 1, "event_id": 2, "tickets_reserved": 3}
+    )
+    assert bulk.build_payload("reservations", {"user_id": "a", "event_id": 2, "tickets_reserved": 3}) == (
+        False, "Error: user_id must be an integer."
+    )
+    for value in ([1], {"n": 1}, 2.5, 2.0, True, "1e3", "-1"):
+        assert bulk.build_payload("reservations", {"user_id": 1, "event_id": 2, "tickets_reserved": value}) == (
+            False, "Error: tickets_reserved must be an integer."
+        )
+    assert bulk.build_payload("users", {}) == (False, "Error: missing name.")
+    assert bulk.build_payload("users", None) == (False, "Error: the row is not a JSON object.")
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_retries_and_records_failed_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk, "BACKOFF_BASE_S", 0)
+    rows = [{"user_id": 1, "event_id": event_id, "tickets_reserved": 1} for event_id in range(1, 8)]
+    rows.insert(3, {"user_id": 1, "event_id": "x", "tickets_reserved": 1})
+    rows.insert(5, {"user_id": 1, "event_id": [4], "tickets_reserved": 1})
+    path = tmp_path / "reservations.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+    requests = []
+
+    def handle(request):
+        reservations = json.loads(request.content)["reservations"]
+        requests.append([item["event_id"] for item in reservations])
+        if len(requests) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        if reservations[0]["event_id"] == 3:
+            # Results without the expected fields; only this batch should fail.
+            return httpx.Response(201, json={"results": [{}, {}]})
+        if reservations[0]["event_id"] == 5:
+            raise RuntimeError("transport blew up")
+        return httpx.Response(201, json={"results": [
+            {"success": item["event_id"] != 2, "message": "Sold out"} for item in reservations
+        ]})
+
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handle), base_url="http://test"
+    ) as client:
+        # A worker killed by its batch would leave the reader blocked on the queue.
+        stats = await asyncio.wait_for(bulk.run_bulk(
+            client, "reservations", str(path), concurrency=1, batch_size=2, progress_interval=60
+        ), timeout=5)
+
+    assert requests == [[1, 2], [1, 2], [3, 4], [5, 6], [7]]
+    assert (stats.succeeded, stats.failed, stats.retries) == (2, 8, 1)
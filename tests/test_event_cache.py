@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service, event_service
+from app.services.booking_service import cancel_reservation, create_reservation
+from app.services.cache import TTLCache
+from app.services.event_service import get_event_availability
+
+
+class RefilledCache(TTLCache):
+    """
+    An event cache that a reader refills with the committed availability just
+    before the booking path touches it, as happens when a read lands between the
+    booking's commit and its cache update.
+    """
+
+    committed = None
+
+    def peek(self, key, default=None):
+        self._refill(key)
+        return super().peek(key, default)
+
+    def invalidate(self, key):
+        self._refill(key)
+        super().invalidate(key)
+
+    def _refill(self, key):
+        if key == 1 and self.committed is not None:
+            super().set(key, self.committed)
+
+
+@pytest.mark.asyncio
+async def test_booking_changes_count_once_when_a_reader_refilled_the_cache(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'event_cache.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(booking_service, "AsyncSessionLocal", session_maker)
+    monkeypatch.setattr(event_service, "AsyncSessionLocal", session_maker)
+    cache = RefilledCache(100, 60)
+    monkeypatch.setattr(event_service, "event_cache", cache)
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="fan"))
+                session.add(Event(
+                    name="show",
+                    description="event cache",
+                    date_time=datetime(2030, 1, 1),
+                    tickets_total=10,
+                    tickets_available=10,
+                ))
+        assert (await get_event_availability(1))[0] == 10
+
+        cache.committed = 8
+        reservation, _ = await create_reservation(
+            Reservation(user_id=1, event_id=1, tickets_reserved=2)
+        )
+        cache.committed = None
+        assert (await get_event_availability(1))[0] == 8
+
+        cache.committed = 10
+        assert await cancel_reservation(reservation.id) == (True, "Reservation cancelled successfully")
+        cache.committed = None
+        assert (await get_event_availability(1))[0] == 10
+    finally:
+        await engine.dispose()
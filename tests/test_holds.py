@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.models.event import Event
+from app.models.hold import Hold
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import hold_service
+from app.services.hold_service import (
+    confirm_hold,
+    create_hold,
+    release_expired_holds,
+    release_hold,
+    run_hold_sweeper,
+)
+
+
+@pytest.mark.asyncio
+async def test_holds_are_confirmed_released_and_swept_on_expiry(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'holds.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(hold_service, "AsyncSessionLocal", session_maker)
+
+    async def tickets_available():
+        async with session_maker() as session:
+            return [
+                event.tickets_available
+                for event in (await session.execute(select(Event).order_by(Event.id))).scalars()
+            ]
+
+    async def expire_all():
+        async with session_maker() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Hold).values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+                )
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="buyer"))
+                session.add_all([
+                    Event(
+                        name=f"event {index}",
+                        description="holds",
+                        date_time=datetime(2030, 1, 1),
+                        tickets_total=10,
+                        tickets_available=10,
+                    )
+                    for index in range(2)
+                ])
+
+        hold, _ = await create_hold(Hold(user_id=1, event_id=1, tickets_held=3))
+        assert hold.expires_at > datetime.utcnow()
+        assert await tickets_available() == [7, 10]
+        missing, message = await create_hold(Hold(user_id=1, event_id=2, tickets_held=11))
+        assert missing is None and message == "Only 10 tickets available, requested 11."
+
+        reservation, _ = await confirm_hold(hold.id)
+        assert (reservation.event_id, reservation.tickets_reserved) == (1, 3)
+        assert await tickets_available() == [7, 10]
+        assert (await confirm_hold(hold.id))[1] == "Hold not found"
+
+        hold, _ = await create_hold(Hold(user_id=1, event_id=2, tickets_held=4))
+        assert await release_hold(hold.id) == (True, "Hold released successfully")
+        assert await tickets_available() == [7, 10]
+
+        holds = [
+            (await create_hold(Hold(user_id=1, event_id=event_id, tickets_held=tickets_held)))[0]
+            for event_id, tickets_held in [(1, 1), (1, 2), (2, 1), (2, 2), (2, 3)]
+        ]
+        assert await tickets_available() == [4, 4]
+        await expire_all()
+
+        assert (await confirm_hold(holds[0].id))[1] == "Hold has expired"
+        assert await release_expired_holds(batch_size=2) == 5
+        assert await tickets_available() == [7, 10]
+
+        # The sweeper releases holds that expire while it runs.
+        await create_hold(Hold(user_id=1, event_id=2, tickets_held=5))
+        await expire_all()
+        sweeper = asyncio.create_task(run_hold_sweeper(interval=0.01, batch_size=10))
+        try:
+            for _ in range(100):
+                if await tickets_available() == [7, 10]:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            sweeper.cancel()
+            await asyncio.gather(sweeper, return_exceptions=True)
+        assert await tickets_available() == [7, 10]
+
+        async with session_maker() as session:
+            assert (await session.execute(select(Hold))).scalars().all() == []
+            reservations = (await session.execute(select(Reservation))).scalars().all()
+            assert [reservation.tickets_reserved for reservation in reservations] == [3]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from app.main import app
+from app.models.idempotency_record import IdempotencyRecord
+from app.models.reservation import Reservation
+from app.routers import reservations
+from app.services import cascade, idempotency
+from app.services.idempotency import idempotency_cache, request_fingerprint
+
+
+async def _database(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_idempotency_keys_replay_reject_share_and_expire(tmp_path, monkeypatch):
+    engine = await _database(tmp_path)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (cascade, idempotency):
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_maker)
+    calls = []
+
+    async def admit_reservation(reservation):
+        calls.append(reservation.tickets_reserved)
+        # Long enough for concurrent duplicates to arrive while this one runs.
+        await asyncio.sleep(0.05)
+        if reservation.tickets_reserved > 5:
+            return None, "Only 5 tickets available, requested 6."
+        return Reservation(id=len(calls), user_id=1, event_id=1, tickets_reserved=1), "ok"
+
+    monkeypatch.setattr(reservations, "admit_reservation", admit_reservation)
+
+    def post(client, key, tickets_reserved=1):
+        return client.post(
+            "/reservations/",
+            json={"user_id": 1, "event_id": 1, "tickets_reserved": tickets_reserved},
+            headers={"Idempotency-Key": key},
+        )
+
+    async def store(key, fingerprint, created_at):
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(IdempotencyRecord(key=key, fingerprint=fingerprint, created_at=created_at))
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await post(client, "replay")
+            assert first.status_code == 201 and first.json()["id"] == 1
+            # Dropping the in-memory cache makes the retry read the stored record.
+            idempotency_cache.clear()
+            retry = await post(client, "replay")
+            assert (retry.status_code, retry.content) == (201, first.content)
+            assert calls == [1]
+
+            reused = await post(client, "replay", tickets_reserved=2)
+            assert reused.status_code == 422
+            assert calls == [1]
+
+            # 4xx responses are stored and replayed as well.
+            for _ in range(2):
+                rejected = await post(client, "rejected", tickets_reserved=6)
+                assert rejected.status_code == 400
+            assert calls == [1, 6]
+
+            responses = await asyncio.gather(*(post(client, "shared") for _ in range(3)))
+            assert [response.status_code for response in responses] == [201, 201, 201]
+            assert len({response.content for response in responses}) == 1
+            assert calls == [1, 6, 1]
+
+            # An unfinished claim may stand for a committed write, however old it is.
+            body = b'{"user_id":1,"event_id":1,"tickets_reserved":1}'
+            fingerprint = request_fingerprint("POST", "/reservations/", body)
+            await store("pending", fingerprint, datetime.utcnow())
+            assert (await post(client, "pending")).status_code == 409
+            await store("abandoned", fingerprint, datetime.utcnow() - timedelta(days=2))
+            assert (await post(client, "abandoned")).status_code == 409
+            assert await idempotency.purge_expired_idempotency_records(10) == 0
+            assert (await post(client, "abandoned")).status_code == 409
+            assert calls == [1, 6, 1]
+
+            # Expired responses are purged and their keys can be used again.
+            await store("expired", fingerprint, datetime.utcnow() - timedelta(days=2))
+            async with session_maker() as session:
+                async with session.begin():
+                    record = await session.get(IdempotencyRecord, "expired")
+                    record.status_code, record.response_body = 201, "{}"
+            assert await idempotency.purge_expired_idempotency_records(10) == 1
+            reused = await post(client, "expired")
+            assert (reused.status_code, reused.json()["id"]) == (201, 4)
+            assert calls == [1, 6, 1, 1]
+    finally:
+        idempotency_cache.clear()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_claim_returns_the_record_of_a_worker_that_inserted_first(tmp_path, monkeypatch):
+    engine = await _database(tmp_path)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    class RacingSession(AsyncSession):
+        async def get(self, entity, ident, **kwargs):
+            record = await super().get(entity, ident, **kwargs)
+            if kwargs.get("with_for_update"):
+                # Another worker completes the key between our read and our insert.
+                async with session_maker() as other:
+                    async with other.begin():
+                        other.add(IdempotencyRecord(
+                            key=ident, fingerprint="f", status_code=201, response_body="{}"
+                        ))
+            return record
+
+    monkeypatch.setattr(
+        idempotency,
+        "AsyncSessionLocal",
+        sessionmaker(engine, class_=RacingSession, expire_on_commit=False),
+    )
+    try:
+        record = await idempotency._claim("race", "f")
+        assert (record.key, record.status_code, record.response_body) == ("race", 201, "{}")
+    finally:
+        await engine.dispose()
@@ -0,0 +1,131 @@
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.main import app
+from app.models.event import Event
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.user import User
+from app.services import import_service
+from app.services.import_service import import_rows
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.mark.asyncio
+async def test_import_parses_across_chunks_and_inserts_in_batches(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(import_service, "AsyncSessionLocal", session_maker)
+
+    events = (
+        "\ufeffname,description,date_time,tickets_total,tickets_available\r\n"
+        'gala,"two\nlines, ""quoted""",2030-01-01T10:00:00,10,4\r\n'
+        "\r\n"
+        "fair,,2030-01-02 09:30:00,5,\r\n"
+        "late,x,soon,5,5\r\n"
+        "over,x,2030-01-03T00:00:00,5,6\r\n"
+        "short,x\r\n"
+        "café,x,2030-01-04T00:00:00+02:00,3,3\r\n"
+    ).encode()
+    users = '{"id": 7, "name": "ann"}\n\n[1]\n{"name": ""}\n{broken\n{"name": "bob"}'.encode()
+
+    try:
+        # 7-byte chunks split lines, quoted fields and multi-byte characters.
+        report = await import_rows("events", chunked(events, 7), "csv", batch_size=2)
+        assert (report.completed, report.rows, report.imported, report.rejected) == (True, 6, 3, 3)
+        assert report.batches == 2
+        assert [(error.line, error.message) for error in report.errors] == [
+            (6, "date_time must be an ISO 8601 date and time"),
+            (7, "tickets_available must be between 0 and tickets_total"),
+            (8, "Expected 5 fields, found 2"),
+        ]
+
+        report = await import_rows("users", chunked(users, 5), "ndjson", batch_size=10)
+        assert (report.completed, report.imported, report.rejected) == (True, 2, 3)
+        assert [error.line for error in report.errors] == [3, 4, 5]
+
+        report = await import_rows("users", chunked(b'name\n"open\nann\n', 4), "csv")
+        assert not report.completed
+        assert "unterminated quoted field on line 2" in report.message
+
+        async with session_maker() as session:
+            imported = (await session.execute(select(Event).order_by(Event.id))).scalars().all()
+            assert [
+                (event.name, event.description, event.date_time, event.tickets_available)
+                for event in imported
+            ] == [
+                ("gala", 'two\nlines, "quoted"', datetime(2030, 1, 1, 10), 4),
+                ("fair", "", datetime(2030, 1, 2, 9, 30), 5),
+                ("café", "x", datetime(2030, 1, 3, 22), 3),
+            ]
+            snapshots = (await session.execute(select(InventorySnapshot))).scalars().all()
+            assert sorted((s.event_id, s.ledger_id, s.tickets_available) for s in snapshots) == [
+                (event.id, 0, event.tickets_available) for event in imported
+            ]
+            names = (await session.execute(select(User.name).order_by(User.id))).scalars().all()
+            assert names == ["ann", "bob"]
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_import_endpoints_stream_the_request_body(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import_http.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(import_service, "AsyncSessionLocal", session_maker)
+    events = b"name,date_time,tickets_total\n" + b"".join(
+        f"event {number},2030-01-01T10:00:00,{number}\n".encode() for number in range(1, 26)
+    ) + b"broken,soon,1\n"
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            # A chunked body, read by the endpoint as it arrives.
+            response = await client.post(
+                "/import/events",
+                content=chunked(events, 16),
+                headers={"Content-Type": "text/csv; charset=utf-8"},
+            )
+            assert response.status_code == 201
+            report = response.json()
+            assert (report["completed"], report["rows"], report["imported"], report["rejected"]) == (
+                True, 26, 25, 1
+            )
+            assert report["errors"] == [
+                {"line": 27, "message": "date_time must be an ISO 8601 date and time"}
+            ]
+
+            response = await client.post(
+                "/import/users",
+                content=b'{"name": "ann"}\n{"name": "bob"}\n',
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert (response.status_code, response.json()["imported"]) == (201, 2)
+
+            response = await client.post(
+                "/import/users", content=b"name\nann\n", headers={"Content-Type": "text/plain"}
+            )
+            assert response.status_code == 415
+
+            response = await client.post(
+                "/import/users", content=b'name\n"open\n', headers={"Content-Type": "text/csv"}
+            )
+            assert response.status_code == 400
+            assert response.json()["detail"]["completed"] is False
+
+        async with session_maker() as session:
+            totals = (await session.execute(select(Event.tickets_total).order_by(Event.id))).scalars().all()
+            assert totals == list(range(1, 26))
+            names = (await session.execute(select(User.name).order_by(User.id))).scalars().all()
+            assert names == ["ann", "bob"]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.instrumentation import RequestStats, instrument_engine, request_stats
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_are_timed_and_leave_no_start_behind(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'instrumentation.db'}")
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing"))
+            assert conn.sync_connection.info["query_started"] == []
+        assert stats.queries == 4
+    finally:
+        request_stats.reset(token)
+        await engine.dispose()
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.models.event import Event
+from app.models.inventory_slot import InventorySlot
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service, inventory
+from app.services.booking_service import create_reservation
+from app.services.inventory import (
+    get_tickets_available,
+    release_tickets,
+    reserve_tickets,
+    resize_inventory_slots,
+)
+
+
+@pytest.mark.asyncio
+async def test_sharded_reservations_sell_exactly_the_capacity(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'inventory.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def reserve(quantity):
+        async with session_maker() as session:
+            async with session.begin():
+                return await reserve_tickets(session, 1, quantity)
+
+    async def slot_tickets():
+        async with session_maker() as session:
+            result = await session.execute(
+                select(InventorySlot.tickets_available).order_by(InventorySlot.slot)
+            )
+            return result.scalars().all()
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                event = Event(
+                    name="sharded",
+                    description="inventory",
+                    date_time=datetime(2030, 1, 1),
+                    tickets_total=103,
+                    tickets_available=103,
+                )
+                session.add(event)
+                await session.flush()
+                await resize_inventory_slots(session, event, 4)
+        assert await slot_tickets() == [26, 26, 26, 25]
+
+        # Always picking slot 0 drains it, so later requests go through the rebalance.
+        monkeypatch.setattr(inventory.random, "randrange", lambda stop: 0)
+        sold = 0
+        for quantity in [3, 2, 1] * 40:
+            if await reserve(quantity):
+                sold += quantity
+        assert sold == 103
+        assert await slot_tickets() == [0, 0, 0, 0]
+        assert not await reserve(1)
+
+        async with session_maker() as session:
+            async with session.begin():
+                assert await release_tickets(session, 1, 5)
+                assert await release_tickets(session, 1, 2)
+                assert await get_tickets_available(session, 1) == 7
+
+        # A random slot that cannot cover the request falls back to the rebalance.
+        monkeypatch.setattr(inventory.random, "randrange", lambda stop: stop - 1)
+        assert await reserve(6)
+        assert sum(await slot_tickets()) == 1
+        assert not await reserve(2)
+
+        # Folding the slots back keeps what is left and drops the slot rows.
+        async with session_maker() as session:
+            async with session.begin():
+                event = await session.get(Event, 1)
+                await resize_inventory_slots(session, event, 0)
+        assert await slot_tickets() == []
+        async with session_maker() as session:
+            event = await session.get(Event, 1)
+            assert (event.inventory_slots, event.tickets_available) == (0, 1)
+        assert await reserve(1)
+        assert not await reserve(1)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_the_last_ticket_goes_to_exactly_one_of_many_buyers(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'last_ticket.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(booking_service, "AsyncSessionLocal", session_maker)
+    buyers = 10
+    seen = []
+    all_seen = asyncio.Event()
+
+    async def reserve_after_everyone_looked(session, event_id, quantity):
+        # Every buyer has read one ticket left before any of them takes it.
+        seen.append(await get_tickets_available(session, event_id))
+        if len(seen) == buyers:
+            all_seen.set()
+        await all_seen.wait()
+        return await reserve_tickets(session, event_id, quantity)
+
+    monkeypatch.setattr(booking_service, "reserve_tickets", reserve_after_everyone_looked)
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="fan"))
+                session.add(Event(
+                    name="last ticket",
+                    description="inventory",
+                    date_time=datetime(2030, 1, 1),
+                    tickets_total=100,
+                    tickets_available=1,
+                ))
+
+        results = await asyncio.gather(*(
+            create_reservation(Reservation(user_id=1, event_id=1, tickets_reserved=1))
+            for _ in range(buyers)
+        ))
+        assert seen == [1] * buyers
+        assert sorted(message for _, message in results) == (
+            ["Only 0 tickets available, requested 1."] * (buyers - 1)
+            + ["Reservation created successfully"]
+        )
+        async with session_maker() as session:
+            assert await get_tickets_available(session, 1) == 0
+            count = await session.execute(select(func.count()).select_from(Reservation))
+            assert count.scalar_one() == 1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,78 @@
+import json
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from config.settings import settings
+from app.main import app
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service, event_service, user_service
+from app.services.single_flight import service_reads
+
+
+@pytest.mark.asyncio
+async def test_fast_list_responses_match_the_validated_ones(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'list_responses.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (booking_service, event_service, user_service):
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_maker)
+        monkeypatch.setattr(module, "ReadSessionLocal", session_maker)
+    paths = [
+        "/events/",
+        "/events/?limit=2",
+        "/events/?name_prefix=Jazz&date_from=2030-01-01T00:00:00",
+        "/users/?limit=10",
+        "/reservations/?limit=2",
+        "/reservations/?event_id=2",
+        "/users/1/reservations?limit=10",
+    ]
+
+    async def responses(fast):
+        monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", fast)
+        service_reads.clear()
+        event_service.event_cache.clear()
+        return [
+            (response.status_code, response.headers.get("X-Next-Cursor"), response.content)
+            for response in [await client.get(path) for path in paths]
+        ]
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add_all([User(name="ann"), User(name="bob")])
+                session.add_all(
+                    Event(
+                        name=name,
+                        description="Dinner & a show, \"live\" ☕",
+                        date_time=datetime(2030, 1, day, 19, 30, 15),
+                        tickets_total=100,
+                        tickets_available=100 - day,
+                    )
+                    for day, name in enumerate(["Jazz night", "Rock night", "Jazz brunch"], start=1)
+                )
+                await session.flush()
+                session.add_all(
+                    Reservation(user_id=user_id, event_id=event_id, tickets_reserved=event_id)
+                    for user_id, event_id in [(1, 1), (2, 2), (1, 2), (1, 3)]
+                )
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            validated = await responses(False)
+            fast = await responses(True)
+        assert all(status_code == 200 for status_code, _, _ in validated)
+        assert fast == validated
+        # Byte for byte, and nothing the response models exclude leaks out of the rows.
+        assert set(json.loads(validated[0][2])[0]) == {
+            "id", "name", "description", "date_time", "tickets_total", "tickets_available",
+            "inventory_slots",
+        }
+    finally:
+        service_reads.clear()
+        event_service.event_cache.clear()
+        await engine.dispose()
@@ -0,0 +1,113 @@
+import pytest
+from pathlib import Path
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+import app.main  # noqa: F401  registers every table model
+from app.migrations import MIGRATIONS, apply_migrations, current_version, v001_initial_schema
+from app.migrations.operations import create_index, drop_index
+
+
+BASELINE_SCRIPT = Path(__file__).parent.parent / "sql_scripts" / "01_create_tables.sql"
+
+
+def _schema(connection) -> dict:
+    inspector = inspect(connection)
+    return {
+        table: (
+            {column["name"] for column in inspector.get_columns(table)},
+            {index["name"]: tuple(index["column_names"]) for index in inspector.get_indexes(table)},
+        )
+        for table in inspector.get_table_names()
+        if table != "schema_version"
+    }
+
+
+@pytest.mark.asyncio
+async def test_migrations_build_the_model_schema_and_adopt_existing_databases(tmp_path):
+    assert [migration.VERSION for migration in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
+    latest = MIGRATIONS[-1].VERSION
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("migrated", "adopted", "models")
+    }
+
+    try:
+        async with engines["migrated"].begin() as conn:
+            assert await conn.run_sync(apply_migrations) == list(range(1, latest + 1))
+            assert await conn.run_sync(apply_migrations) == []
+            assert await conn.run_sync(current_version) == latest
+            migrated = await conn.run_sync(_schema)
+
+        async with engines["adopted"].begin() as conn:
+            await conn.run_sync(v001_initial_schema.upgrade)
+            assert await conn.run_sync(apply_migrations) == list(range(2, latest + 1))
+            adopted = await conn.run_sync(_schema)
+
+        async with engines["models"].begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            models = await conn.run_sync(_schema)
+
+        assert migrated == adopted == models
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_a_database_created_by_the_baseline_script_upgrades_to_the_models(tmp_path):
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("baseline", "models")
+    }
+    # The script is written for MySQL; SQLite only lacks AUTO_INCREMENT.
+    script = BASELINE_SCRIPT.read_text().replace("AUTO_INCREMENT ", "")
+
+    try:
+        async with engines["baseline"].begin() as conn:
+            for statement in script.split(";"):
+                if statement.strip():
+                    await conn.exec_driver_sql(statement)
+            await conn.execute(text(
+                "INSERT INTO event (name, description, date_time, tickets_total, tickets_available)"
+                " VALUES ('Wine festival', 'baseline', '2030-01-01 14:00:00', 10, 7)"
+            ))
+
+        async with engines["baseline"].begin() as conn:
+            assert await conn.run_sync(apply_migrations) == [
+                migration.VERSION for migration in MIGRATIONS[1:]
+            ]
+            upgraded = await conn.run_sync(_schema)
+            row = (await conn.execute(text(
+                "SELECT tickets_available, inventory_slots FROM event"
+            ))).one()
+            assert tuple(row) == (7, 0)
+
+        async with engines["models"].begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+            models = await conn.run_sync(_schema)
+
+        assert upgraded == models
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_index_operations_can_be_rerun(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'indexes.db'}")
+
+    def indexes(connection):
+        return {index["name"] for index in inspect(connection).get_indexes("event")}
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(v001_initial_schema.upgrade)
+            for _ in range(2):
+                await conn.run_sync(create_index, "event", "ix_event_tickets", "tickets_total")
+            assert "ix_event_tickets" in await conn.run_sync(indexes)
+            for _ in range(2):
+                await conn.run_sync(drop_index, "event", "ix_event_tickets")
+            assert "ix_event_tickets" not in await conn.run_sync(indexes)
+    finally:
+        await engine.dispose()
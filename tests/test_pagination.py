@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from app.main import app
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service, event_service
+from app.services.single_flight import service_reads
+
+
+async def _pages(client, path, **params):
+    # Follows X-Next-Cursor until a short page, returning the IDs of every page.
+    pages = []
+    while True:
+        response = await client.get(path, params=params)
+        if response.status_code == 404:
+            return pages
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        assert int(cursor) == pages[-1][-1]
+        params["after"] = cursor
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_filtered_row_once(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pagination.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (booking_service, event_service):
+        monkeypatch.setattr(module, "AsyncSessionLocal", session_maker)
+        monkeypatch.setattr(module, "ReadSessionLocal", session_maker)
+    service_reads.clear()
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="fan"))
+                # Jazz and rock alternate, one day apart, so every filter skips rows between matches.
+                session.add_all(
+                    Event(
+                        name=f"{'Jazz' if number % 2 else 'Rock'} night {number}",
+                        description="pagination",
+                        date_time=datetime(2030, 1, number),
+                        tickets_total=10,
+                        tickets_available=10,
+                    )
+                    for number in range(1, 21)
+                )
+                await session.flush()
+                session.add_all(
+                    Reservation(user_id=1, event_id=event_id, tickets_reserved=1)
+                    for event_id in [1, 2, 3] * 5
+                )
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            assert await _pages(client, "/events/", limit=3, name_prefix="Jazz") == [
+                [1, 3, 5], [7, 9, 11], [13, 15, 17], [19],
+            ]
+            assert await _pages(
+                client,
+                "/events/",
+                limit=2,
+                name_prefix="Rock",
+                date_from="2030-01-05T00:00:00",
+                date_to="2030-01-12T00:00:00",
+            ) == [[6, 8], [10, 12]]
+            assert await _pages(client, "/events/", limit=5, name_prefix="Blues") == []
+
+            # Reservations 2, 5, 8, ... are for event 2.
+            assert await _pages(client, "/reservations/", limit=2, event_id=2) == [
+                [2, 5], [8, 11], [14],
+            ]
+            assert await _pages(client, "/reservations/", limit=5) == [
+                [1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15],
+            ]
+    finally:
+        service_reads.clear()
+        await engine.dispose()
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.models.event import Event
+from app.services.pagination import next_cursor, paginate
+from app.services.rows import EventRow, fetch_records, projection, record_dicts, select_records
+
+
+@pytest.mark.asyncio
+async def test_records_match_instances_and_page_like_them(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rows.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add_all([
+                    Event(
+                        name=f"event {index}",
+                        description="rows",
+                        date_time=datetime(2030, 1, index + 1),
+                        tickets_total=10,
+                        tickets_available=10 - index,
+                    )
+                    for index in range(3)
+                ])
+
+            async with session.begin():
+                result = await session.execute(paginate(select_records(EventRow), Event.id, 2, None))
+                records = fetch_records(result, EventRow)
+                events = (await session.execute(paginate(select(Event), Event.id, 2, None))).scalars().all()
+
+                availability = projection(Event, "id", "tickets_available")
+                result = await session.execute(select_records(availability).order_by(Event.id))
+                partial = fetch_records(result, availability)
+
+        assert record_dicts(records) == [event.model_dump() for event in events]
+        assert records[1].tickets_available == 9
+        assert next_cursor(records, 2) == next_cursor(events, 2) == events[1].id
+        assert [tuple(record) for record in partial] == [(1, 10), (2, 9), (3, 8)]
+        with pytest.raises(AttributeError):
+            records[0].tickets_available = 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,78 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from app.models.event import Event
+from app.models.event_sales import EventSales
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import sales_rollups
+from app.services.sales_rollups import (
+    get_event_sales,
+    get_sell_through,
+    get_top_buyers,
+    rebuild_sales_rollups,
+    refresh_sales_rollups,
+    sales_deltas,
+)
+
+
+@pytest.mark.asyncio
+async def test_refresh_folds_deltas_into_rollups_and_matches_rebuild(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(sales_rollups, "AsyncSessionLocal", session_maker)
+    monkeypatch.setattr(sales_rollups, "ReadSessionLocal", session_maker)
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add_all([User(name="a"), User(name="b")])
+                session.add_all([
+                    Event(
+                        name=f"event {index}",
+                        description="rollups",
+                        date_time=datetime(2030, 1, 1, 10 + index),
+                        tickets_total=10,
+                        tickets_available=10,
+                    )
+                    for index in range(2)
+                ])
+                reservations = [
+                    Reservation(user_id=1, event_id=1, tickets_reserved=2),
+                    Reservation(user_id=1, event_id=1, tickets_reserved=1),
+                    Reservation(user_id=2, event_id=1, tickets_reserved=4),
+                    Reservation(user_id=2, event_id=2, tickets_reserved=1),
+                ]
+                session.add_all(reservations)
+                session.add_all(sales_deltas(reservations))
+
+        assert await refresh_sales_rollups(batch_size=2) == 3
+        summary, _ = await get_event_sales(1)
+        assert (summary.tickets_sold, summary.sell_through) == (7, 0.7)
+        assert summary.refreshed_at is not None
+        buyers, _ = await get_top_buyers(limit=1)
+        assert [(buyer.user_id, buyer.tickets_sold) for buyer in buyers] == [(2, 5)]
+        buckets, _ = await get_sell_through(datetime(2030, 1, 1), datetime(2030, 1, 2))
+        assert [(bucket.events, bucket.tickets_sold) for bucket in buckets] == [(2, 8)]
+
+        async with session_maker() as session:
+            async with session.begin():
+                await session.delete(await session.get(Reservation, 4))
+                session.add_all(sales_deltas([reservations[3]], -1))
+
+        await refresh_sales_rollups(batch_size=2)
+        async with session_maker() as session:
+            assert await session.get(EventSales, 2) is None
+            refreshed = (await session.execute(select(EventSales))).scalars().all()
+
+        counts, _ = await rebuild_sales_rollups()
+        assert counts == {"events": 1, "users": 2}
+        async with session_maker() as session:
+            rebuilt = (await session.execute(select(EventSales))).scalars().all()
+        assert [row.model_dump() for row in rebuilt] == [row.model_dump() for row in refreshed]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import SessionRouter, primary_pinned
+
+
+async def _database(path, name: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE node (name TEXT)"))
+        await conn.execute(text("INSERT INTO node VALUES (:name)"), {"name": name})
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _node(router: SessionRouter) -> str:
+    async with router.read() as session:
+        return (await session.execute(text("SELECT name FROM node"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_over_replicas_unless_pinned(tmp_path):
+    databases = [
+        await _database(tmp_path / f"{name}.db", name)
+        for name in ("primary", "replica1", "replica2")
+    ]
+    router = SessionRouter(databases[0][1], [maker for _, maker in databases[1:]])
+
+    try:
+        assert [await _node(router) for _ in range(3)] == ["replica1", "replica2", "replica1"]
+
+        token = primary_pinned.set(True)
+        try:
+            assert await _node(router) == "primary"
+        finally:
+            primary_pinned.reset(token)
+
+        assert await _node(SessionRouter(databases[0][1], [])) == "primary"
+    finally:
+        for engine, _ in databases:
+            await engine.dispose()
@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from app.database import primary_pinned
+from app.models.event import Event
+from app.models.reservation import Reservation
+from app.models.user import User
+from app.services import booking_service, event_service
+from app.services.single_flight import SingleFlight, service_reads
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_run_one_query(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'single_flight.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(booking_service, "ReadSessionLocal", session_maker)
+    monkeypatch.setattr(event_service, "AsyncSessionLocal", session_maker)
+    event_service.event_cache.clear()
+
+    queries = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: queries.append(statement),
+    )
+
+    try:
+        async with session_maker() as session:
+            async with session.begin():
+                session.add(User(name="fan"))
+                session.add(Event(
+                    name="show",
+                    description="single flight",
+                    date_time=datetime(2030, 1, 1),
+                    tickets_total=10,
+                    tickets_available=8,
+                ))
+                await session.flush()
+                session.add(Reservation(user_id=1, event_id=1, tickets_reserved=2))
+        queries.clear()
+
+        results = await asyncio.gather(*(
+            booking_service.get_reservations_by_user(1, limit=10) for _ in range(1000)
+        ))
+        assert len(queries) == 1
+        assert all(result is results[0] for result in results)
+        assert [reservation.tickets_reserved for reservation in results[0][0]] == [2]
+
+        # Positional and keyword calls binding the same arguments are identical.
+        queries.clear()
+        results = await asyncio.gather(
+            event_service.get_all_events(),
+            *(event_service.get_all_events(limit=None) for _ in range(999)),
+        )
+        assert len(queries) == 1
+        assert {len(events) for events, _ in results} == {1}
+
+        # Reads pinned to the primary after a write are not coalesced.
+        queries.clear()
+        token = primary_pinned.set(True)
+        try:
+            await asyncio.gather(*(
+                booking_service.get_reservations_by_user(1, limit=10) for _ in range(3)
+            ))
+        finally:
+            primary_pinned.reset(token)
+        assert len(queries) == 3
+        assert service_reads.stats()["in_flight"] == 0
+    finally:
+        event_service.event_cache.clear()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_shared_call_survives_cancelled_caller_and_retains_results():
+    flight = SingleFlight(ttl=60, maxsize=10)
+    started = []
+    release = asyncio.Event()
+
+    async def read(value):
+        started.append(value)
+        await release.wait()
+        if value == "bad":
+            raise ValueError("read failed")
+        return value
+
+    first = asyncio.create_task(flight.do("key", lambda: read("value")))
+    second = asyncio.create_task(flight.do("key", lambda: read("value")))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "value"
+    assert first.cancelled()
+
+    # Retained for the TTL, so a later call does not read again.
+    assert await flight.do("key", lambda: read("value")) == "value"
+    assert started == ["value"]
+
+    # Failures reach every caller and are not retained.
+    failures = await asyncio.gather(
+        *(flight.do("other", lambda: read("bad")) for _ in range(2)), return_exceptions=True
+    )
+    assert [str(failure) for failure in failures] == ["read failed", "read failed"]
+    assert started == ["value", "bad"]
+    assert flight.stats() == {"calls": 2, "shared": 2, "in_flight": 0, "retained": 1}
@@ -0,0 +1,33 @@
+import pytest
+from app.services.waiting_room import InMemoryWaitingRoom
+
+
+@pytest.mark.asyncio
+async def test_waiting_room_admits_in_order_and_sheds_overflow():
+    room = InMemoryWaitingRoom(concurrency=2, max_queue=1, poll_interval=1, token_ttl=30)
+
+    tickets = [(await room.join(1))[0] for _ in range(3)]
+    assert [ticket.admitted for ticket in tickets] == [True, True, False]
+
+    overflow, message = await room.join(1)
+    assert overflow is None
+    assert message == "Waiting room for event 1 is full"
+
+    other_event, _ = await room.join(2)
+    assert other_event.admitted
+
+    await room.leave(tickets[0].token)
+    ticket, _ = await room.status(tickets[2].token)
+    assert ticket.position == 1
+    assert ticket.admitted
+
+
+@pytest.mark.asyncio
+async def test_waiting_room_expires_abandoned_tokens():
+    room = InMemoryWaitingRoom(concurrency=1, max_queue=1, poll_interval=1, token_ttl=0)
+
+    ticket, _ = await room.join(1)
+    waiting, _ = await room.join(1)
+
+    assert (await room.status(ticket.token))[0] is None
+    assert (await room.status(waiting.token))[0] is None
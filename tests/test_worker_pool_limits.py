@@ -0,0 +1,84 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import database
+from app.database import InstrumentedQueuePool, PoolWaitStats, worker_pool_limits
+from app.main import app
+from config.settings import settings
+
+
+def test_pools_split_the_connection_budget_between_workers(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 20)
+    monkeypatch.setattr(settings, "WEB_WORKERS", 4)
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", None)
+    assert worker_pool_limits() == (10, 20)
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 100)
+    assert worker_pool_limits() == (10, 15)
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 20)
+    assert worker_pool_limits() == (5, 0)
+
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 4)
+    assert worker_pool_limits() == (1, 0)
+
+    # A budget smaller than the worker count cannot be honoured.
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 2)
+    with pytest.raises(ValueError, match="DB_MAX_CONNECTIONS=2"):
+        worker_pool_limits()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint_reports_checkouts_overflow_and_timeouts(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "MAX_OVERFLOW", 1)
+    monkeypatch.setattr(database, "pool_wait_stats", PoolWaitStats())
+    connections = []
+
+    async def pool_stats():
+        response = await client.get("/metrics/pool")
+        assert response.status_code == 200
+        return response.json()
+
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            for _ in range(3):
+                connections.append(await engine.connect())
+                await connections[-1].execute(text("SELECT 1"))
+            stats = await pool_stats()
+            assert {key: stats[key] for key in (
+                "pool_size", "max_overflow", "checked_out", "idle", "overflow", "checkouts",
+                "checkout_timeouts",
+            )} == {
+                "pool_size": 2, "max_overflow": 1, "checked_out": 3, "idle": 0, "overflow": 1,
+                "checkouts": 3, "checkout_timeouts": 0,
+            }
+
+            # Pool and overflow are both in use, so the next checkout waits and gives up.
+            with pytest.raises(TimeoutError):
+                await engine.connect()
+            stats = await pool_stats()
+            assert (stats["checkout_timeouts"], stats["checkouts"]) == (1, 3)
+            assert stats["wait_max_s"] >= 0.05
+            assert stats["wait_total_s"] >= stats["wait_max_s"] > stats["wait_avg_s"] >= 0
+
+            for connection in connections:
+                await connection.close()
+            connections.clear()
+            stats = await pool_stats()
+            assert (stats["checked_out"], stats["idle"], stats["overflow"]) == (0, 2, 0)
+    finally:
+        for connection in connections:
+            await connection.close()
+        await engine.dispose()